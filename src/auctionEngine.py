@@ -0,0 +1,170 @@
+'''
+Auction Engine Class
+
+A headless driver which bids a complete auction for a given deal.
+It reuses the card table and the bridge players, but it never touches
+the GUI, never sleeps between bids and never rotates the log file.
+A deal is a dictionary mapping each TablePosition to a BridgeHand.
+'''
+
+import os
+from infoLog import Log
+from enums import Suit, TablePosition
+from utils import *
+from cardTable import CardTable
+from dealNumber import getDealHands, getDealNumberFromHands
+from decisionCache import DecisionCache
+from openBidTable import checkOpenBidTable
+
+# Safety limit on the number of calls in a single auction
+MAX_AUCTION_BIDS = 100
+
+class AuctionResult:
+
+    def __init__(self, dealer):
+        self.dealer = dealer
+        self.bidsList = []
+        # List of (bidder, bidNotif) tuples, in the order the bids were made
+        self.bidNotifs = []
+        # Description of the exception which stopped the auction, if any
+        self.error = None
+
+    def getAuctionStr(self):
+        bidStrs = []
+        for bid in self.bidsList:
+            bidStrs.append(getBidStr(bid[0], bid[1]))
+        return '-'.join(bidStrs)
+
+
+class EngineTable(CardTable):
+    '''
+    A card table which records the auction instead of driving the GUI
+    '''
+
+    def __init__(self, bidTree=None):
+        super(EngineTable, self).__init__(enableGui=False, humanPlaying=False, bidTree=bidTree)
+        self.result = None
+
+    # The Auction driving this table asks for the next bid itself, so a
+    # bid never leads straight into the next one
+    def bidResponse(self, bidder, bidNotif):
+        self.result.bidNotifs.append((bidder, bidNotif))
+        self.recordBid(bidder, bidNotif)
+
+    def processHandDone(self):
+        # Capture the auction before the table variables are reset
+        self.result.bidsList = self.bidsList.copy()
+        self.reset()
+        for pos in TablePosition:
+            if pos == TablePosition.CONTROL or pos == TablePosition.CENTER:
+                continue
+            self.players[pos].teamState.__init__()
+
+
+class Auction:
+    '''
+    A single auction, bid one call at a time.
+    Each call to step() makes the next call of the auction, so callers
+    can single-step an auction, pause it by not stepping it, or take
+    turns between the auctions of several tables on one thread. An
+    auction which runs past maxCalls calls is stopped with an error.
+    The auction owns its table until it is done.
+    '''
+
+    def __init__(self, table, deal, dealer=TablePosition.NORTH, maxCalls=MAX_AUCTION_BIDS, auctionId=None):
+        self.table = table
+        self.maxCalls = maxCalls
+        self.numCalls = 0
+        self.result = AuctionResult(dealer)
+        self.done = False
+        table.result = self.result
+        table.reset()
+
+        # Seat the hands and start the hand for each player
+        table.leadPos = dealer
+        table.currentPos = dealer
+        table.roundNum = 1
+        table.handDone = False
+        for pos, hand in deal.items():
+            table.players[pos].hand = hand
+        for pos in deal.keys():
+            table.players[pos].startHand(dealer)
+        if table.trace is not None:
+            table.trace.startAuction(auctionId, dealer, getDealNumberFromHands(deal))
+
+    '''
+    Make the next call of the auction.
+    Returns:
+        True if the auction has more calls to make
+    '''
+    def step(self):
+        if self.done:
+            return False
+        table = self.table
+        try:
+            if self.numCalls >= self.maxCalls:
+                raise RuntimeError("auction did not complete in %d bids" % self.maxCalls)
+            self.numCalls += 1
+            player = table.players[table.currentPos]
+            player.computerBidRequest(table, table.hasOpener, player.teamState.competition, table.roundNum, table.bidsList, False, player.hand)
+        except Exception as e:
+            # The bidding code is still under development. Record the
+            # failure so a batch run can carry on with the next deal.
+            self.result.error = "%s: %s" % (type(e).__name__, e)
+            Log.warning("AuctionEngine: auction stopped by %s\n", self.result.error)
+            table.processHandDone()
+        self.done = table.handDone
+        if self.done and table.trace is not None:
+            table.trace.endAuction(self.result.bidsList, self.result.error)
+        return not self.done
+
+    # Make the remaining calls of the auction
+    def run(self):
+        while self.step():
+            pass
+        return self.result
+
+
+class AuctionEngine:
+
+    def __init__(self, logPath=os.devnull, bidTree=None, decisionCacheSize=0, logLevel=None, trace=None):
+        self.table = EngineTable(bidTree)
+        # Optional AuctionTrace of every auction bid by the engine
+        self.table.trace = trace
+        self.numAuctions = 0
+        # Reuse handler decisions across deals if a cache size is given
+        if decisionCacheSize > 0:
+            self.table.decisionCache = DecisionCache(decisionCacheSize)
+        # The bidding code logs unconditionally, so make sure a log is open
+        if Log.log_fp is None or Log.log_fp.closed:
+            Log.open(logPath)
+        # Batch runs can turn off the debug records of the bidding code
+        if logLevel is not None:
+            Log.setLevel(logLevel)
+        # Load, build or check the opening bid table now rather than in
+        # the first auction
+        checkOpenBidTable()
+
+    '''
+    Bid a complete auction.
+    Inputs:
+        deal - dictionary of TablePosition to BridgeHand
+        dealer - position of the first bidder
+        auctionId - identifies the auction in the trace. Default=count
+                    of auctions started by the engine
+    Returns:
+        an AuctionResult holding the bids and the bid notifications
+    '''
+    def run(self, deal, dealer=TablePosition.NORTH, auctionId=None):
+        return self.startAuction(deal, dealer, auctionId).run()
+
+    # Seat a deal at the engine's table, ready to be bid with Auction.step
+    def startAuction(self, deal, dealer=TablePosition.NORTH, auctionId=None):
+        if auctionId is None:
+            auctionId = self.numAuctions
+        self.numAuctions += 1
+        return Auction(self.table, deal, dealer, auctionId=auctionId)
+
+    # Bid the auction of a deal number, as given by the dealNumber module
+    def runDealNumber(self, dealNum, dealer=TablePosition.NORTH):
+        return self.run(getDealHands(dealNum), dealer)
@@ -0,0 +1,187 @@
+'''
+Auction Trace
+
+A structured record of how each auction was bid, written as JSON lines.
+Unlike the info log, a trace belongs to a table rather than to the
+process, so any number of tables can trace at once. Each line is one
+event of one auction:
+ - start: the dealer and the deal number
+ - handler: a bid handler call, with the bid node it was fetched for,
+   the team state before and after the call and the BidNotif it made
+ - bid: the BidNotif a player submits to the table
+ - end: the auction and the error which stopped it, if any
+
+Recording an event only takes a cheap snapshot: the team state is
+packed into bytes and the BidNotif fields are copied. The snapshots
+are turned into JSON and written to the file by a background writer
+thread, so the bidding is not held up by the file. A writer can be
+shared by all the tables of a process. Workers of a multiprocessing
+pool should each have their own file.
+'''
+
+import json
+import queue
+import threading
+
+from utils import *
+from teamState import TeamState
+
+# Number of events written to the file at once, at most
+WRITE_BATCH_SIZE = 1000
+
+
+# Return a bid as a string, e.g. "1S" or "Pass"
+def getTraceBidStr(bid):
+    return getBidStr(bid[0], bid[1])
+
+
+# Turn a TeamState packed by TeamState.pack into a dictionary for JSON
+def getTeamStateDict(packedState):
+    if packedState is None:
+        return None
+    teamState = TeamState()
+    teamState.unpack(packedState)
+    stateDict = {}
+    for name, value in teamState.__dict__.items():
+        if name == 'bidSeq':
+            value = [getTraceBidStr(bid) for bid in value]
+        elif name == 'suitState':
+            value = {suit.name: fit.name for suit, fit in value.items()}
+        elif hasattr(value, 'name'):
+            value = value.name
+        stateDict[name] = value
+    return stateDict
+
+
+# Copy the fields of a BidNotif, which players may change later
+def getNotifSnapshot(bidNotif):
+    if bidNotif is None:
+        return None
+    snapshot = bidNotif.__dict__.copy()
+    snapshot['suitState'] = bidNotif.suitState.copy()
+    return snapshot
+
+
+# Turn a BidNotif snapshot into a dictionary for JSON
+def getNotifDict(snapshot):
+    if snapshot is None:
+        return None
+    notifDict = {}
+    for name, value in snapshot.items():
+        if name == 'bid':
+            value = getTraceBidStr(value)
+        elif name == 'suitState':
+            value = {suit.name: fit.name for suit, fit in value.items()}
+        elif hasattr(value, 'name'):
+            value = value.name
+        notifDict[name] = value
+    return notifDict
+
+
+# Turn an event, as queued by AuctionTrace, into a line of JSON
+def getEventLine(event):
+    if 'before' in event:
+        event['before'] = getTeamStateDict(event['before'])
+        event['after'] = getTeamStateDict(event['after'])
+    if 'notif' in event:
+        event['notif'] = getNotifDict(event['notif'])
+    return json.dumps(event) + "\n"
+
+
+class TraceWriter:
+    '''
+    Writes the events of any number of traces to one JSON lines file,
+    on its own thread
+    '''
+
+    def __init__(self, path):
+        self.fp = open(path, 'w')
+        # Queue of events. None stops the writer.
+        self.events = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="TraceWriter", daemon=True)
+        self.thread.start()
+
+    def write(self, event):
+        self.events.put(event)
+
+    # Wait until every event queued so far is in the file
+    def flush(self):
+        self.events.join()
+
+    def close(self):
+        self.events.put(None)
+        self.thread.join()
+        self.fp.close()
+
+    def run(self):
+        while True:
+            batch = [self.events.get()]
+            # Take whatever else is waiting, so it is written in one go
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            stop = False
+            for event in batch:
+                if event is None:
+                    stop = True
+                    continue
+                try:
+                    lines.append(getEventLine(event))
+                except Exception as e:
+                    # Keep the writer alive for the events which follow
+                    print("TraceWriter: could not write event: %s" % e)
+            self.fp.write(''.join(lines))
+            self.fp.flush()
+            for event in batch:
+                self.events.task_done()
+            if stop:
+                break
+
+
+class AuctionTrace:
+    '''
+    The trace of the auctions bid at one table
+    '''
+
+    def __init__(self, writer, tableId=0):
+        self.writer = writer
+        self.tableId = tableId
+        # Identifies the auction the events belong to
+        self.auctionId = None
+
+    def startAuction(self, auctionId, dealer, dealNumber=None):
+        self.auctionId = auctionId
+        self.writer.write({"event": "start", "table": self.tableId, "auction": auctionId,
+                           "dealer": dealer.name, "dealNumber": dealNumber})
+
+    '''
+    Record a bid handler call.
+    Inputs:
+        player - the player whose handler was called
+        handlerName - name of the handler
+        bidNode - bid node the handler was called for
+        stateBefore, stateAfter - the packed team state around the call
+        bidNotif - the BidNotif returned by the handler
+    '''
+    def handlerCall(self, table, player, handlerName, bidNode, stateBefore, stateAfter, bidNotif):
+        # Nodes only have a bid sequence if their bidNode.json gives one
+        bidSeq = getattr(bidNode, 'bidSeq', None)
+        self.writer.write({"event": "handler", "table": self.tableId, "auction": self.auctionId,
+                           "round": table.roundNum, "pos": player.pos.name, "role": player.playerRole.name,
+                           "handler": handlerName, "bidNode": bidSeq,
+                           "before": stateBefore, "after": stateAfter,
+                           "notif": getNotifSnapshot(bidNotif)})
+
+    # Record the bid a player submits to the table
+    def bid(self, table, player, bidNotif):
+        self.writer.write({"event": "bid", "table": self.tableId, "auction": self.auctionId,
+                           "round": table.roundNum, "pos": player.pos.name,
+                           "notif": getNotifSnapshot(bidNotif)})
+
+    def endAuction(self, bidsList, error=None):
+        self.writer.write({"event": "end", "table": self.tableId, "auction": self.auctionId,
+                           "bids": '-'.join(getTraceBidStr(bid) for bid in bidsList),
+                           "error": error})
@@ -0,0 +1,391 @@
+#!/home/richawil/Applications/anaconda3/bin/python
+'''
+Benchmark Runner
+
+Times the bidding engine on a fixed set of deals, made from a seeded
+random generator so every run bids the same hands. It measures:
+ - auctions per second through the headless AuctionEngine
+ - BridgeHand.evalHand and evalSuitCategory per call, both on a hand
+   whose profile must be built and on one whose profile is cached
+ - fetchBidTreeNode: the time to load the bidding tree, then the time
+   per fetch on the first pass over every node (cold) and on later
+   passes (warm)
+ - Deck.shuffle per call, and CardTable.dealNewHands per deal
+Each timing is taken several times. Every sample runs the code enough
+times in a row to take at least MIN_SAMPLE_TIME, so that timings of
+well under a microsecond are not lost in the timer and scheduler noise.
+The best sample is the result, and the samples are saved with it.
+
+The results are written as JSON, with the machine, the Python version
+and the git commit they were measured on. A digest of the auctions is
+saved too, so a comparison shows whether a change altered the bidding
+as well as its speed.
+
+Compare mode reads two result files and flags each measurement which
+got worse by more than a threshold plus the spread of its samples in
+both runs. The spread is how far the worst sample is from the best, so
+a change no bigger than the noise measured across the repeats is not
+flagged. More repeats give a better measure of the noise.
+    benchmark.py -o before.json
+    benchmark.py -o after.json
+    benchmark.py -c before.json after.json
+'''
+
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import platform
+import datetime
+import subprocess
+
+from infoLog import Log
+from enums import Suit, DistMethod
+from utils import *
+import bidNode
+from bidNode import BidTree, PASS_BID_KEY
+from auctionEngine import AuctionEngine, EngineTable
+from dealNumber import getHandsFromSeats, DEAL_POSITIONS, NUM_CARDS_IN_DECK
+from openBidTable import checkOpenBidTable
+
+BENCHMARK_VERSION = 2
+DEFAULT_NUM_DEALS = 1000
+DEFAULT_SEED = 1
+DEFAULT_REPEATS = 5
+# A measurement which is worse by more than this fraction, plus the
+# spread of its samples, is a regression
+DEFAULT_THRESHOLD = 0.10
+# Shortest time of one sample, in seconds
+MIN_SAMPLE_TIME = 0.2
+BRIDGE_SUIT_LIST = [Suit.SPADE, Suit.HEART, Suit.DIAMOND, Suit.CLUB]
+
+
+# Return the deal set of a seed, as lists of 52 seat indexes
+def getBenchmarkDeals(numDeals, seed):
+    rng = random.Random(seed)
+    seats = [index % 4 for index in range(0, NUM_CARDS_IN_DECK)]
+    deals = []
+    for dealIdx in range(0, numDeals):
+        rng.shuffle(seats)
+        deals.append(seats.copy())
+    return deals
+
+
+'''
+Time a function.
+Inputs:
+    func - function to time
+    repeats - number of samples
+    minTime - shortest time of a sample. The function is called as many
+              times in a row as it takes to fill it.
+Returns:
+    list of the time of one call in each sample
+'''
+def getTimes(func, repeats, minTime=MIN_SAMPLE_TIME):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    numCalls = 1
+    if elapsed < minTime:
+        numCalls = int(minTime / max(elapsed, 1e-9)) + 1
+    times = []
+    for repeat in range(0, repeats):
+        start = time.perf_counter()
+        for call in range(0, numCalls):
+            func()
+        times.append((time.perf_counter() - start) / numCalls)
+    return times
+
+
+# Return a measurement for the results file. The value is the best of the samples.
+def makeResult(samples, unit, higherIsBetter=False):
+    if higherIsBetter:
+        value = max(samples)
+    else:
+        value = min(samples)
+    return {"value": value, "samples": samples, "unit": unit, "higherIsBetter": higherIsBetter}
+
+
+# Return a list of timings scaled, e.g. to microseconds per call
+def scaleTimes(times, scale):
+    return [scale * elapsed for elapsed in times]
+
+
+'''
+Bid every deal with the headless engine.
+Returns:
+    tuple of results dictionary and the auction digest
+'''
+def benchAuctions(deals, repeats):
+    engine = AuctionEngine(logLevel="OFF")
+    hands = [getHandsFromSeats(seats) for seats in deals]
+    auctions = []
+
+    def bidDeals():
+        del auctions[:]
+        for dealIdx, deal in enumerate(hands):
+            result = engine.run(deal, DEAL_POSITIONS[dealIdx % 4])
+            auctions.append("%s %s" % (result.getAuctionStr(), result.error))
+
+    times = getTimes(bidDeals, repeats)
+    digest = hashlib.sha256('\n'.join(auctions).encode()).hexdigest()
+    numErrors = sum(1 for auction in auctions if not auction.endswith(" None"))
+    results = {"auctionsPerSecond": makeResult([len(deals) / elapsed for elapsed in times], "auctions/s", True),
+               "auctionErrors": makeResult([numErrors], "auctions")}
+    return (results, digest)
+
+
+def benchHandEval(deals, repeats):
+    hands = []
+    for seats in deals:
+        hands.extend(getHandsFromSeats(seats).values())
+    numCalls = len(hands)
+
+    def evalBuilt():
+        for hand in hands:
+            hand.invalidateProfile()
+            hand.evalHand(DistMethod.HCP_LONG)
+
+    def evalCached():
+        for hand in hands:
+            hand.evalHand(DistMethod.HCP_LONG)
+
+    def suitCategoryBuilt():
+        for hand in hands:
+            hand.invalidateProfile()
+            hand.evalSuitCategory(Suit.SPADE)
+
+    def suitCategoryCached():
+        for hand in hands:
+            for suit in BRIDGE_SUIT_LIST:
+                hand.evalSuitCategory(suit)
+
+    return {"evalHandBuild": makeResult(scaleTimes(getTimes(evalBuilt, repeats), 1e6 / numCalls), "us/call"),
+            "evalHandCached": makeResult(scaleTimes(getTimes(evalCached, repeats), 1e6 / numCalls), "us/call"),
+            "evalSuitCategoryBuild": makeResult(scaleTimes(getTimes(suitCategoryBuilt, repeats), 1e6 / numCalls), "us/call"),
+            "evalSuitCategoryCached": makeResult(scaleTimes(getTimes(suitCategoryCached, repeats), 1e6 / (4 * numCalls)), "us/call")}
+
+
+# Return the bid sequence of every node in a tree
+def getTreeBidSeqs(tree):
+    bidSeqs = []
+    entries = [(tree.root, [])]
+    while entries:
+        (entry, bidSeq) = entries.pop()
+        if entry.bidNode is not None:
+            bidSeqs.append(bidSeq)
+        for bidKey, child in entry.children.items():
+            if bidKey == PASS_BID_KEY:
+                bid = (0, Suit.ALL)
+            else:
+                bid = bidKey
+            entries.append((child, bidSeq + [bid]))
+    # The tree skips an opening pass unless it is the only bid
+    return [bidSeq for bidSeq in bidSeqs if len(bidSeq) > 0 and not (len(bidSeq) > 1 and bidSeq[0][0] == 0)]
+
+
+def benchTreeFetch(repeats):
+    loadTimes = []
+    coldTimes = []
+    # Each sample loads a new tree, whose first pass finds nothing in
+    # the CPU caches
+    for repeat in range(0, repeats):
+        start = time.perf_counter()
+        tree = BidTree(bidNode.bidTreeBaseDir)
+        loadTimes.append(time.perf_counter() - start)
+        bidSeqs = getTreeBidSeqs(tree)
+        start = time.perf_counter()
+        for bidSeq in bidSeqs:
+            tree.fetch(bidSeq)
+        coldTimes.append(time.perf_counter() - start)
+
+    def fetchAll():
+        for bidSeq in bidSeqs:
+            tree.fetch(bidSeq)
+
+    warmTimes = getTimes(fetchAll, repeats)
+    return {"treeLoad": makeResult(scaleTimes(loadTimes, 1e3), "ms"),
+            "fetchCold": makeResult(scaleTimes(coldTimes, 1e6 / len(bidSeqs)), "us/fetch"),
+            "fetchWarm": makeResult(scaleTimes(warmTimes, 1e6 / len(bidSeqs)), "us/fetch")}
+
+
+def benchDealing(numDeals, seed, repeats):
+    table = EngineTable()
+    fullDeck = table.deck.cards.copy()
+    rng = random.Random(seed)
+    table.rng = random.Random(seed)
+
+    def shuffleDeck():
+        table.deck.cards = fullDeck.copy()
+        for dealIdx in range(0, numDeals):
+            table.deck.shuffle(rng)
+
+    def dealHands():
+        for dealIdx in range(0, numDeals):
+            # Put the whole deck back, as nextHand does at the table
+            table.deck.cards = fullDeck.copy()
+            table.dealNewHands()
+
+    return {"deckShuffle": makeResult(scaleTimes(getTimes(shuffleDeck, repeats), 1e6 / numDeals), "us/call"),
+            "dealNewHands": makeResult(scaleTimes(getTimes(dealHands, repeats), 1e6 / numDeals), "us/deal")}
+
+
+# Return the commit of the source tree, if it is a git checkout
+def getGitCommit():
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if output.returncode != 0:
+        return None
+    return output.stdout.strip()
+
+
+def getMachineMetadata():
+    return {"timestamp": datetime.datetime.now().isoformat(timespec='seconds'),
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpuCount": os.cpu_count(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "gitCommit": getGitCommit()}
+
+
+'''
+Run every benchmark.
+Inputs:
+    numDeals - size of the deal set
+    seed - seed of the deal set
+    repeats - number of samples of each timing, of which the best is kept
+Returns:
+    dictionary to be saved as JSON
+'''
+def runBenchmarks(numDeals=DEFAULT_NUM_DEALS, seed=DEFAULT_SEED, repeats=DEFAULT_REPEATS):
+    deals = getBenchmarkDeals(numDeals, seed)
+    # Build the opening bid table if it is out of date, and check it
+    # against calcOpenBid, before anything is timed
+    checkOpenBidTable()
+    results = {}
+    # Load the tree first, so its time is not counted in the auctions
+    results.update(benchTreeFetch(repeats))
+    # The bidding code prints, so keep that out of the report
+    saveStdout = sys.stdout
+    sys.stdout = Log
+    try:
+        (auctionResults, digest) = benchAuctions(deals, repeats)
+    finally:
+        sys.stdout = saveStdout
+    results.update(auctionResults)
+    results.update(benchHandEval(deals, repeats))
+    results.update(benchDealing(numDeals, seed, repeats))
+    return {"version": BENCHMARK_VERSION,
+            "numDeals": numDeals,
+            "seed": seed,
+            "repeats": repeats,
+            "metadata": getMachineMetadata(),
+            "auctionDigest": digest,
+            "results": results}
+
+
+# Return the spread of the samples of a measurement, as a fraction of
+# its value. Version 1 results have no samples.
+def getSpread(result):
+    samples = result.get("samples", [result["value"]])
+    if result["value"] == 0:
+        return 0.0
+    return (max(samples) - min(samples)) / abs(result["value"])
+
+
+'''
+Compare two benchmark runs.
+Returns:
+    list of (name, base value, new value, change, isRegression). The
+    change is the fraction by which the measurement got worse. It is a
+    regression if it is over the threshold plus the spread of both runs.
+'''
+def compareResults(base, new, threshold=DEFAULT_THRESHOLD):
+    comparisons = []
+    for name, baseResult in base["results"].items():
+        newResult = new["results"].get(name)
+        if newResult is None:
+            continue
+        (baseValue, newValue) = (baseResult["value"], newResult["value"])
+        if baseValue == 0:
+            change = 0.0 if newValue == 0 else float('inf')
+        elif baseResult["higherIsBetter"]:
+            change = (baseValue - newValue) / baseValue
+        else:
+            change = (newValue - baseValue) / baseValue
+        allowed = threshold + getSpread(baseResult) + getSpread(newResult)
+        comparisons.append((name, baseValue, newValue, change, change > allowed))
+    return comparisons
+
+
+def showResults(run):
+    metadata = run["metadata"]
+    print("Benchmark of %d deals, seed %d, on %s, Python %s, commit %s" %
+          (run["numDeals"], run["seed"], metadata["host"], metadata["python"], metadata["gitCommit"]))
+    for name, result in run["results"].items():
+        print("  %-24s %12.2f %s" % (name, result["value"], result["unit"]))
+
+
+# Print the comparison of two runs. Returns True if any measurement regressed.
+def showComparison(base, new, threshold):
+    if base["numDeals"] != new["numDeals"] or base["seed"] != new["seed"]:
+        print("Warning: the runs bid different deal sets")
+    if base["metadata"]["host"] != new["metadata"]["host"]:
+        print("Warning: the runs were made on different machines")
+    if base["auctionDigest"] != new["auctionDigest"] and base["seed"] == new["seed"]:
+        print("Note: the auctions changed between the runs")
+    hasRegression = False
+    print("  %-24s %12s %12s %9s" % ("Measurement", "Base", "New", "Change"))
+    for (name, baseValue, newValue, change, isRegression) in compareResults(base, new, threshold):
+        flag = ""
+        if isRegression:
+            flag = "REGRESSION"
+            hasRegression = True
+        print("  %-24s %12.2f %12.2f %+8.1f%% %s" % (name, baseValue, newValue, -100.0 * change, flag))
+    return hasRegression
+
+
+def readResults(path):
+    fh = open(path, 'r')
+    run = json.load(fh)
+    fh.close()
+    return run
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Benchmark the bidding engine, or compare two benchmark runs')
+    parser.add_argument('-n', '--deals', type=int, default=DEFAULT_NUM_DEALS, help='Number of deals. Default=%d' % DEFAULT_NUM_DEALS, required=False)
+    parser.add_argument('-s', '--seed', type=int, default=DEFAULT_SEED, help='Seed of the deal set. Default=%d' % DEFAULT_SEED, required=False)
+    parser.add_argument('-r', '--repeats', type=int, default=DEFAULT_REPEATS, help='Samples of each timing, the best is kept. Default=%d' % DEFAULT_REPEATS, required=False)
+    parser.add_argument('-o', '--output', help='JSON file for the results', required=False)
+    parser.add_argument('-c', '--compare', nargs=2, metavar=('BASE', 'NEW'), help='Compare two result files instead of running', required=False)
+    parser.add_argument('-t', '--threshold', type=float, default=100 * DEFAULT_THRESHOLD, help='Percent by which a measurement may get worse before it is flagged. Default=%d' % (100 * DEFAULT_THRESHOLD), required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    if args['compare']:
+        (basePath, newPath) = args['compare']
+        if showComparison(readResults(basePath), readResults(newPath), args['threshold'] / 100):
+            sys.exit(1)
+        return
+
+    # The bidding code logs unconditionally, so open a log it can write to
+    Log.open(os.devnull, "OFF")
+    run = runBenchmarks(args['deals'], args['seed'], args['repeats'])
+    showResults(run)
+    if args['output']:
+        fh = open(args['output'], 'w')
+        json.dump(run, fh, indent=2)
+        fh.write("\n")
+        fh.close()
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -8,36 +8,102 @@ for both players. In contrast, each player has its own instance of the
 teamState, and is that player's view.
 '''
 
+import os
+import sys
 import json
+import pickle
+import hashlib
+import argparse
+from types import MappingProxyType
 from infoLog import Log
 from enums import *
 from bidUtils import *
+from bidTreeSource import *
+from openBid import OpenerRegistry
+from responderBid import ResponderRegistry
+from openerRebid import OpenerRebidRegistry
 
-bidTreeBaseDir = "/home/richawil/Documents/Programming/Apps/BridgeBid/bidding_trees"
+# The default bidding tree lives next to the source directory. It can be
+# moved with the BRIDGEBID_TREE_DIR environment variable.
+bidTreeBaseDir = os.environ.get("BRIDGEBID_TREE_DIR",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "bidding_trees"))
+PASS_BID_KEY = (0, Suit.ALL)
+BID_TREE_ARTIFACT_VERSION = 2
+
+# The bidding tree used by fetchBidTreeNode
+defaultBidTree = None
+# Registries whose handlers are bound to the bid nodes when a tree loads
+handlerRegistries = None
 
 # Return a bidNode instance from the bidding tree
 def fetchBidTreeNode(bidSeq):
-    # Build a pathname to the bid
-    # If the first bid is a Pass, we need to strip it
-    path = bidTreeBaseDir
-    for i, bid in enumerate(bidSeq):
-        if i == 0 and bid[0] == 0:
-            # First bid was a Pass. Strip it unless it is the only bid.
-            if len(bidSeq) > 1:
-                # print("First bid was a Pass - ignoring")
-                continue
-            else:
-                bidStr = "Pass"
-        else:
-            bidStr = getBidStr(bid[0], bid[1])
-        path = path + '/' + bidStr
-    path = path + '/' + 'bidNode.json'
-    Log.write("fetchBidTreeNode %s\n" % path)
-    
-    # Open the file
-    fh = open(path, 'r')
-    bidDescriptor = json.load(fh)
+    return getBidTree().fetch(bidSeq)
+
+
+# Return the bidding tree, loading it on first use
+def getBidTree():
+    global defaultBidTree
+    if defaultBidTree is None or defaultBidTree.source.name != os.path.normpath(bidTreeBaseDir):
+        defaultBidTree = BidTree(DirectoryTreeSource(bidTreeBaseDir))
+    return defaultBidTree
+
+
+# The handler functions keep no state in their registry, so one
+# instance of each registry is shared by every tree and table.
+# The registries are listed in the order used by getNodeRegistry.
+def getHandlerRegistries():
+    global handlerRegistries
+    if handlerRegistries is None:
+        handlerRegistries = [OpenerRegistry(), ResponderRegistry(), OpenerRebidRegistry()]
+    return handlerRegistries
+
+
+'''
+Return the registry whose handlers are called at a bid node.
+The player due to bid at a node is the opener at the root, the responder
+after one bid, and the opener rebidding after that, as in bidRound1 and
+bidRound2. A node's handler name is only looked up in that player's
+registry, so a name defined by two registries cannot be bound to the
+wrong one.
+Inputs:
+    registries - opener, responder and opener rebid registries
+    depth - number of bids leading to the node
+'''
+def getNodeRegistry(registries, depth):
+    (openerRegistry, responderRegistry, openerRebidRegistry) = registries
+    if depth == 0:
+        return openerRegistry
+    if depth == 1:
+        return responderRegistry
+    return openerRebidRegistry
 
+
+# Stand-in for a handler named by a bid node but not registered.
+# It fails the same way the jump table lookup used to.
+def makeMissingHandler(handlerName):
+    def missingHandler(table, player):
+        raise KeyError(handlerName)
+    return missingHandler
+
+
+# Convert a bid into the key used by the bidding tree
+# All passes share the same key
+def getBidKey(bid):
+    if bid[0] == 0:
+        return PASS_BID_KEY
+    return (bid[0], bid[1])
+
+
+# Convert a bidding tree directory name (e.g. 1C, 2N or Pass) into a bid key
+def parseBidStr(bidStr):
+    if bidStr == "Pass":
+        return PASS_BID_KEY
+    suitMap = {'C': Suit.CLUB, 'D': Suit.DIAMOND, 'H': Suit.HEART, 'S': Suit.SPADE, 'N': Suit.NOTRUMP}
+    return (int(bidStr[:-1]), suitMap[bidStr[-1]])
+
+
+# Create a bidNode instance from the contents of a bidNode.json file
+def parseBidNode(bidDescriptor):
     # Create an empty bid node
     bidNode = BidNode()
     for key in bidDescriptor.keys():
@@ -83,7 +149,147 @@ def fetchBidTreeNode(bidSeq):
             bidNode.bidHints.append(bidDescriptor['hints']['hint0'])
             bidNode.bidHints.append(bidDescriptor['hints']['hint1'])
             bidNode.bidHints.append(bidDescriptor['hints']['hint2'])                
+    bidNode.freeze()
     return bidNode
+
+
+class BidTreeEntry:
+
+    def __init__(self):
+        self.bidNode = None
+        # Exception raised while loading this node, reported when fetched
+        self.error = None
+        self.children = {}
+
+
+class BidTree:
+    '''
+    The complete bidding tree of one bidding system, loaded once into
+    memory from a tree source (see bidTreeSource.py).
+    The tree is a trie keyed by bid tuples. Each entry holds the parsed
+    bid node for the bid sequence leading to it. Bid nodes are shared by
+    all players and tables, so they are frozen after parsing.
+    Each node's handler name is resolved to a bound handler function
+    once, when the tree is loaded, and stored on the node. It is looked
+    up in the registry of the player who bids at the node.
+    A tree read from a directory is cached in a compiled artifact next
+    to the directory. It is rebuilt whenever a bidNode.json file is newer.
+    '''
+
+    def __init__(self, source, useArtifact=True, registries=None):
+        if isinstance(source, str):
+            source = DirectoryTreeSource(source)
+        self.source = source
+        self.root = BidTreeEntry()
+        self.numNodes = 0
+        self.contentHash = None
+        # Optional TreeCoverage counting the nodes fetched
+        self.coverage = None
+        if self.source.getArtifactPath() is None:
+            useArtifact = False
+        if useArtifact and self.source.isArtifactFresh(self.source.getArtifactPath()):
+            self.loadArtifact()
+        else:
+            self.load()
+            if useArtifact:
+                self.saveArtifact()
+        if registries is None:
+            registries = getHandlerRegistries()
+        self.resolveHandlers(registries)
+
+    # Parse every bid node supplied by the tree source
+    def load(self):
+        hasher = hashlib.sha256()
+        for (bidStrs, contents) in self.source.walkNodes():
+            entry = self.root
+            for bidStr in bidStrs:
+                bidKey = parseBidStr(bidStr)
+                if bidKey not in entry.children:
+                    entry.children[bidKey] = BidTreeEntry()
+                entry = entry.children[bidKey]
+            hasher.update('/'.join(bidStrs).encode())
+            hasher.update(contents)
+            try:
+                entry.bidNode = parseBidNode(json.loads(contents))
+            except Exception as e:
+                # Keep loading. The error is raised if the node is fetched.
+                entry.error = e
+            self.numNodes += 1
+        self.contentHash = hasher.hexdigest()
+
+    # Load the whole tree with a single read of the compiled artifact
+    def loadArtifact(self):
+        fh = open(self.source.getArtifactPath(), 'rb')
+        try:
+            artifact = pickle.loads(fh.read())
+        except Exception as e:
+            print("BidTree: rebuilding unreadable artifact: %s" % e)
+            artifact = {"version": None}
+        fh.close()
+        if artifact["version"] != BID_TREE_ARTIFACT_VERSION:
+            self.load()
+            self.saveArtifact()
+            return
+        self.root = artifact["root"]
+        self.numNodes = artifact["numNodes"]
+        self.contentHash = artifact["contentHash"]
+
+    def saveArtifact(self):
+        artifact = {"version": BID_TREE_ARTIFACT_VERSION,
+                    "contentHash": self.contentHash,
+                    "numNodes": self.numNodes,
+                    "root": self.root}
+        artifactPath = self.source.getArtifactPath()
+        # Write to a temporary file first. Worker processes may race to
+        # rebuild the artifact, and readers must never see a partial file.
+        tmpPath = "%s.%d" % (artifactPath, os.getpid())
+        try:
+            fh = open(tmpPath, 'wb')
+            fh.write(pickle.dumps(artifact, pickle.HIGHEST_PROTOCOL))
+            fh.close()
+            os.replace(tmpPath, artifactPath)
+        except OSError as e:
+            print("BidTree: could not save %s: %s" % (artifactPath, e))
+
+    # Bind the handler of every bid node, from the registry of the player who bids there
+    def resolveHandlers(self, registries):
+        entries = [(self.root, 0)]
+        while entries:
+            (entry, depth) = entries.pop()
+            entries.extend((child, depth + 1) for child in entry.children.values())
+            if entry.bidNode is None:
+                continue
+            jumpTable = getNodeRegistry(registries, depth).jump_table
+            handlerFunc = jumpTable.get(entry.bidNode.handler)
+            if handlerFunc is None:
+                handlerFunc = makeMissingHandler(entry.bidNode.handler)
+            entry.bidNode.bindHandler(handlerFunc)
+
+    # Return the shared bidNode instance for a sequence of bids
+    def fetch(self, bidSeq):
+        entry = self.root
+        bidStrs = []
+        for i, bid in enumerate(bidSeq):
+            if i == 0 and bid[0] == 0 and len(bidSeq) > 1:
+                # First bid was a Pass. Strip it unless it is the only bid.
+                continue
+            bidStrs.append(getBidStr(bid[0], bid[1]))
+            entry = entry.children.get(getBidKey(bid))
+            if entry is None:
+                if self.coverage is not None:
+                    self.coverage.pathMissing(bidStrs)
+                raise KeyError("no bid tree node for %s" % '/'.join(bidStrs))
+        if Log.debugOn:
+            Log.debug("fetchBidTreeNode %s\n", '/'.join(bidStrs))
+        if entry.bidNode is None:
+            if self.coverage is not None:
+                self.coverage.pathMissing(bidStrs)
+            if entry.error is not None:
+                raise entry.error
+            raise KeyError("no bid tree node for %s" % '/'.join(bidStrs))
+        if self.coverage is not None:
+            self.coverage.nodeReached(entry.bidNode)
+        return entry.bidNode
         
         
 class BidNode:
@@ -104,9 +310,40 @@ class BidNode:
         self.force = Force.NONE
         self.nextBidder = PlayerRole.UNKNOWN
         self.handler = ""
+        # Handler function bound when the bidding tree is loaded
+        self.handlerFunc = None
         self.interpret = ""
         self.bidHints = []
-        
+        self.frozen = False
+
+    # Bid nodes fetched from the bidding tree are shared. Make them read-only.
+    def freeze(self):
+        self.suitState = MappingProxyType(self.suitState)
+        self.bidHints = tuple(self.bidHints)
+        self.frozen = True
+
+    # The handler is bound by the tree after loading, even on a frozen node
+    def bindHandler(self, handlerFunc):
+        object.__setattr__(self, 'handlerFunc', handlerFunc)
+
+    # A read-only mapping cannot be pickled, so store the suit states as a dict.
+    # Bound handlers are not stored; they are resolved again after loading.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['suitState'] = dict(self.suitState)
+        state['handlerFunc'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.frozen:
+            self.__dict__['suitState'] = MappingProxyType(self.suitState)
+
+    def __setattr__(self, name, value):
+        if getattr(self, 'frozen', False):
+            raise AttributeError("bid node is read-only: cannot set %s" % name)
+        object.__setattr__(self, name, value)
+
     def show(self):
         print("Team role = %s" % self.teamRole.name)
         print("Fit suit = %s" % self.fitSuit.name)
@@ -128,3 +365,20 @@ class BidNode:
         print("Hint 1 = %s" % self.bidHints[0])
         print("Hint 2 = %s" % self.bidHints[1])
         print("Hint 3 = %s" % self.bidHints[2])
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Compile the bidding tree into a single artifact')
+    parser.add_argument('-d', '--dir', default=bidTreeBaseDir, help='Bidding tree directory', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    # Build through the imported module, so the pickled classes are found
+    # by their bidNode module name rather than __main__
+    import bidNode
+    bidTree = bidNode.BidTree(DirectoryTreeSource(args['dir']), useArtifact=False)
+    bidTree.saveArtifact()
+    print("Compiled %d bid nodes into %s" % (bidTree.numNodes, bidTree.source.getArtifactPath()))
+    print("Content hash %s" % bidTree.contentHash)
+
+if __name__ == '__main__':
+    main(sys.argv)
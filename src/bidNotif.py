@@ -56,14 +56,14 @@ class BidNotif:
         proposedBidStr = getBidStr(bidLevel, bidSuit)
         if maxLevel > bidLevel:
             # Competitors already bid higher than my bid. Return pass
-            Log.write("createBid: my bid of %s was squashed by %s\n" % (proposedBidStr, maxBidStr))
+            Log.debug("createBid: my bid of %s was squashed by %s\n", proposedBidStr, maxBidStr)
             self.bid = (0, Suit.ALL)
             self.convention = Conv.NATURAL
             self.force = Force.NONE
             return
         elif maxLevel == bidLevel:
             if maxSuit.value <= bidSuit.value:
-                Log.write("createBid: my bid of %s was squashed by %s\n" % (proposedBidStr, maxBidStr))
+                Log.debug("createBid: my bid of %s was squashed by %s\n", proposedBidStr, maxBidStr)
                 player.role = PlayerRole.NONE
                 self.bid = (0, Suit.ALL)
                 self.convention = Conv.NATURAL
@@ -83,7 +83,7 @@ class BidNotif:
             self.maxPoints = bidNode.openerMaxPoints
         else:
             print("updateWithBidnode: invalid player role")
-            Log.write("updateWithBidnode: invalid player role\n")
+            Log.debug("updateWithBidnode: invalid player role\n")
         self.convention = bidNode.convention
         self.force = bidNode.force
         self.suitState = bidNode.suitState.copy()
@@ -96,8 +96,8 @@ class BidNotif:
 
         
     def show(self):
-        bidStr = getBidStr(self.bid[0], self.bid[1])
-        Log.write("bidNotif: show: bid={} conv={} force={} state={}\n".format(bidStr, self.convention.name, self.force.name, self.gameState.name))
+        if Log.debugOn:
+            Log.debug("bidNotif: show: bid=%s conv=%s force=%s state=%s\n", getBidStr(self.bid[0], self.bid[1]), self.convention.name, self.force.name, self.gameState.name)
         # print("notif suit state {}".format(self.suitState))
         
     def processStaymanResponse(self, player, teamState):
@@ -117,10 +117,10 @@ class BidNotif:
                 teamState.fitSuit = Suit.SPADE
         
     def processJacobyResponse(self, player):
-        Log.write("processJacobyResponse: no action taken")
+        Log.debug("processJacobyResponse: no action taken\n")
      
     def processMajorLimit(self, ts):
-        Log.write("processing Major Limit notification")
+        Log.debug("processing Major Limit notification\n")
         # Responder has support for bid major and 11-12 points
         openingSuit = getOpeningBid(ts.bidSeq)[1]
         ts.suitState[openingSuit] = FitState.SUPPORT
@@ -128,7 +128,7 @@ class BidNotif:
         ts.partnerMaxPoints = 12
     
     def processJacoby2NT(self, ts):
-        Log.write("processing Jacoby 2NT notification")
+        Log.debug("processing Jacoby 2NT notification\n")
         # Responder has 4+ card support for bid major and 13+ points
         openingSuit = getOpeningBid(ts.bidSeq)[1]
         ts.suitState[openingSuit] = FitState.SUPPORT
@@ -137,7 +137,7 @@ class BidNotif:
         ts.convention = self.convention
     
     def processBlackwoodResponse(self, ts):
-        Log.write("processing Blackwood response\n")
+        Log.debug("processing Blackwood response\n")
         if self.bid[0] == 5:
             if self.bid[1] == Suit.CLUB:
                 ts.partnerNumAces = 4
@@ -178,10 +178,10 @@ class BidNotif:
                 ts.partnerNumKings = 3
 
     def processCuebidResponse(self):
-        Log.write("processCuebidResponse: no action taken")
+        Log.debug("processCuebidResponse: no action taken\n")
 
     def processSplinterResponse(self, ts):
-        Log.write("processing Splinter notification\n")
+        Log.debug("processing Splinter notification\n")
         # Responder has 4+ card support for bid major and 13+ points
         openingSuit = getOpeningBid(ts.bidSeq)[1]
         ts.suitState[openingSuit] = FitState.SUPPORT
@@ -215,11 +215,12 @@ class BidNotif:
             # print("First bid was a pass")
             numBids -= 1
             
-        bidSeqStr = ''        
-        for bid in teamState.bidSeq:
-            bidStr = getBidStr(bid[0], bid[1])
-            bidSeqStr += bidStr + "-"
-        Log.write("notifHandler: %s processing notif for bid seq %s\n" % (player.pos.name, bidSeqStr))
+        if Log.debugOn:
+            bidSeqStr = ''        
+            for bid in teamState.bidSeq:
+                bidStr = getBidStr(bid[0], bid[1])
+                bidSeqStr += bidStr + "-"
+            Log.debug("notifHandler: %s processing notif for bid seq %s\n", player.pos.name, bidSeqStr)
         
         # Merge this notification into a team state
         # Update fit suit
@@ -360,7 +361,7 @@ class BidNotif:
                 teamState.gameState = GameState.SMALL_SLAM
             else:
                 teamState.gameState = GameState.LARGE_SLAM
-            Log.write("%s set game state to %s\n" % (player.pos.name, teamState.gameState.name))    
+            Log.debug("%s set game state to %s\n", player.pos.name, teamState.gameState.name)    
                         
     
 
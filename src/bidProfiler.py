@@ -0,0 +1,336 @@
+#!/home/richawil/Applications/anaconda3/bin/python
+'''
+Bid Profiler
+
+Opt-in timing of the bidding code. While profiling is enabled these are
+wrapped with a timer:
+ - every function registered through MethodRegistry.register
+ - fetchBidTreeNode and BidTree.fetch
+ - nonNodeBidHandler, captainBidHandler, describerBidHandler,
+   blackwoodReqHandler and gerberReqHandler
+ - BidNotif.notifHandler
+For each function the profiler counts the calls and keeps the time of
+every call, for the total and the percentiles. It also totals the calls
+and time by the bid sequence of the player's team which led to them.
+Registered handlers which were never called are listed, so unreachable
+bid sequences show up too.
+
+Nested calls are tracked on a stack, and the time spent in each stack
+of calls, less the time spent in its callees, is kept as a folded
+stack. The folded stacks can be written to a file for flamegraph.pl.
+The stack is not thread safe, so profile one thread at a time.
+
+When profiling is disabled the original functions are put back, and
+nothing is left in the path of the bidding code.
+'''
+
+import sys
+import time
+import types
+import random
+import argparse
+from array import array
+
+from infoLog import Log
+from utils import *
+from methodRegistry import MethodRegistry
+import bidNode
+import nonNodeBid
+from bidNode import BidTree
+from bidNotif import BidNotif
+
+# Module functions wrapped by the profiler, as (module, function name)
+PROFILED_FUNCTIONS = [(bidNode, "fetchBidTreeNode"),
+                      (nonNodeBid, "nonNodeBidHandler"),
+                      (nonNodeBid, "captainBidHandler"),
+                      (nonNodeBid, "describerBidHandler"),
+                      (nonNodeBid, "blackwoodReqHandler"),
+                      (nonNodeBid, "gerberReqHandler")]
+# Methods wrapped by the profiler, as (class, method name)
+PROFILED_METHODS = [(BidTree, "fetch"),
+                    (BidNotif, "notifHandler")]
+PERCENTILES = (50, 90, 99)
+
+# The profiler wrapped into the bidding code, and what its wrappers replaced
+activeProfiler = None
+# List of (setter, original) to undo the wrapping
+replacedFunctions = []
+
+
+# Return the bid sequence string of the player or bid list in a call's arguments
+def getCallBidSeq(args):
+    for arg in args:
+        teamState = getattr(arg, 'teamState', None)
+        if teamState is not None:
+            return getBidSeqStr(teamState.bidSeq)
+    for arg in args:
+        if isinstance(arg, list):
+            return getBidSeqStr(arg)
+    return ''
+
+
+def getBidSeqStr(bidSeq):
+    return '-'.join(getBidStr(bid[0], bid[1]) for bid in bidSeq)
+
+
+# Return every subclass of a class, at any depth
+def getAllSubclasses(cls):
+    subclasses = []
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(getAllSubclasses(subclass))
+    return subclasses
+
+
+# Return the percentile of a sorted list of times
+def getPercentile(sortedTimes, percentile):
+    if not sortedTimes:
+        return 0.0
+    index = min(len(sortedTimes) - 1, int(len(sortedTimes) * percentile / 100))
+    return sortedTimes[index]
+
+
+class FunctionStats:
+    '''
+    Calls of one profiled function
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.numCalls = 0
+        self.totalTime = 0.0
+        # Time of each call, in seconds
+        self.times = array('d')
+        # Bid sequence string to [number of calls, total time]
+        self.bidSeqs = {}
+
+    def addCall(self, bidSeq, elapsed):
+        self.numCalls += 1
+        self.totalTime += elapsed
+        self.times.append(elapsed)
+        seqStats = self.bidSeqs.get(bidSeq)
+        if seqStats is None:
+            seqStats = [0, 0.0]
+            self.bidSeqs[bidSeq] = seqStats
+        seqStats[0] += 1
+        seqStats[1] += elapsed
+
+    def getPercentiles(self):
+        sortedTimes = sorted(self.times)
+        return [getPercentile(sortedTimes, percentile) for percentile in PERCENTILES]
+
+
+class BidProfiler:
+
+    def __init__(self):
+        # Function name to FunctionStats
+        self.stats = {}
+        # Names of the registered handlers, called or not
+        self.handlerNames = set()
+        # Names of the calls in progress, outermost first
+        self.stack = []
+        # Time spent in the callees of each call in progress
+        self.childTimes = []
+        # Folded stack string to time spent in its last function
+        self.foldedStacks = {}
+
+    def clear(self):
+        self.stats = {}
+        self.stack = []
+        self.childTimes = []
+        self.foldedStacks = {}
+
+    # Return a wrapper which times the calls of a function
+    def wrap(self, name, func):
+        profiler = self
+        stats = self.stats
+
+        def profiledCall(*args, **kwargs):
+            profiler.stack.append(name)
+            profiler.childTimes.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                childTime = profiler.childTimes.pop()
+                stackStr = ';'.join(profiler.stack)
+                profiler.stack.pop()
+                if profiler.childTimes:
+                    profiler.childTimes[-1] += elapsed
+                profiler.foldedStacks[stackStr] = profiler.foldedStacks.get(stackStr, 0.0) + elapsed - childTime
+                funcStats = stats.get(name)
+                if funcStats is None:
+                    funcStats = FunctionStats(name)
+                    stats[name] = funcStats
+                funcStats.addCall(getCallBidSeq(args), elapsed)
+
+        profiledCall.__name__ = getattr(func, '__name__', name)
+        profiledCall.__doc__ = getattr(func, '__doc__', None)
+        profiledCall.profiledFunc = func
+        return profiledCall
+
+    # Return the names of the registered handlers which were never called
+    def getUnreachedHandlers(self):
+        return sorted(name for name in self.handlerNames if name not in self.stats)
+
+    '''
+    Return the results as a text table, most expensive function first.
+    Inputs:
+        numBidSeqs - number of the most expensive bid sequences to list
+                     under each function
+    '''
+    def getReport(self, numBidSeqs=3):
+        lines = []
+        lines.append("%-32s %8s %10s %10s %10s %10s %10s" %
+                     ("Function", "Calls", "Total ms", "Mean us", "p50 us", "p90 us", "p99 us"))
+        for funcStats in sorted(self.stats.values(), key=lambda stats: stats.totalTime, reverse=True):
+            percentiles = funcStats.getPercentiles()
+            lines.append("%-32s %8d %10.1f %10.1f %10.1f %10.1f %10.1f" %
+                         (funcStats.name, funcStats.numCalls, 1e3 * funcStats.totalTime,
+                          1e6 * funcStats.totalTime / funcStats.numCalls,
+                          1e6 * percentiles[0], 1e6 * percentiles[1], 1e6 * percentiles[2]))
+            bidSeqs = sorted(funcStats.bidSeqs.items(), key=lambda item: item[1][1], reverse=True)
+            for (bidSeq, (numCalls, totalTime)) in bidSeqs[:numBidSeqs]:
+                lines.append("    %-28s %8d %10.1f" % (bidSeq or "(none)", numCalls, 1e3 * totalTime))
+        unreached = self.getUnreachedHandlers()
+        lines.append("%d of %d registered handlers were never called" % (len(unreached), len(self.handlerNames)))
+        for name in unreached:
+            lines.append("    %s" % name)
+        return '\n'.join(lines)
+
+    def show(self, numBidSeqs=3):
+        print(self.getReport(numBidSeqs))
+
+    # Return the folded stacks, one per line, weighted in microseconds
+    def getFoldedStacks(self):
+        lines = []
+        for stackStr, elapsed in sorted(self.foldedStacks.items()):
+            lines.append("%s %d" % (stackStr, round(1e6 * elapsed)))
+        return '\n'.join(lines) + '\n'
+
+    def writeFoldedStacks(self, path):
+        fh = open(path, 'w')
+        fh.write(self.getFoldedStacks())
+        fh.close()
+
+
+# Replace an entry of a dictionary, remembering the original
+def replaceEntry(table, key, value):
+    replacedFunctions.append((lambda original: table.__setitem__(key, original), table[key]))
+    table[key] = value
+
+
+# Replace an attribute of an object, remembering the original
+def replaceAttribute(owner, name, value):
+    replacedFunctions.append((lambda original: setattr(owner, name, original), owner.__dict__[name]))
+    setattr(owner, name, value)
+
+
+# Bind the handlers of the shared registries and of the trees again.
+# getFunc maps each handler function to the one to bind in its place.
+def rebindHandlers(getFunc, trees):
+    if bidNode.handlerRegistries is not None:
+        for registry in bidNode.handlerRegistries:
+            for name, boundFunc in list(registry.jump_table.items()):
+                func = getFunc(boundFunc.__func__)
+                if func is not boundFunc.__func__:
+                    registry.jump_table[name] = types.MethodType(func, boundFunc.__self__)
+    if bidNode.defaultBidTree is not None and bidNode.defaultBidTree not in trees:
+        trees = list(trees) + [bidNode.defaultBidTree]
+    for tree in trees:
+        tree.resolveHandlers(bidNode.getHandlerRegistries())
+
+
+'''
+Wrap the profiler's timers around the bidding code.
+Inputs:
+    profiler - the BidProfiler to record the calls
+    trees - BidTrees, other than the default tree, whose handlers
+            should be profiled. Trees loaded after this call are
+            always profiled.
+'''
+def enableProfiling(profiler, trees=()):
+    global activeProfiler
+    if activeProfiler is not None:
+        raise RuntimeError("profiling is already enabled")
+    activeProfiler = profiler
+    # Original function to wrapper
+    wrappers = {}
+    for registryClass in getAllSubclasses(MethodRegistry):
+        for name, func in list(registryClass.jump_table.items()):
+            profiler.handlerNames.add(name)
+            wrappers[func] = profiler.wrap(name, func)
+            replaceEntry(registryClass.jump_table, name, wrappers[func])
+    for (module, name) in PROFILED_FUNCTIONS:
+        func = getattr(module, name)
+        wrapper = profiler.wrap(name, func)
+        # Also replace the copies made by "from module import *"
+        for otherModule in list(sys.modules.values()):
+            if getattr(otherModule, name, None) is func:
+                replaceAttribute(otherModule, name, wrapper)
+    for (cls, name) in PROFILED_METHODS:
+        replaceAttribute(cls, name, profiler.wrap("%s.%s" % (cls.__name__, name), cls.__dict__[name]))
+    rebindHandlers(lambda func: wrappers.get(func, func), trees)
+    # Keep the trees so their handlers can be put back
+    profiler.trees = list(trees)
+
+
+# Put back the functions replaced by enableProfiling
+def disableProfiling():
+    global activeProfiler
+    if activeProfiler is None:
+        return
+    trees = activeProfiler.trees
+    while replacedFunctions:
+        (setter, original) = replacedFunctions.pop()
+        setter(original)
+    activeProfiler = None
+    # Registries made while profiling was enabled hold wrappers too
+    rebindHandlers(lambda func: getattr(func, 'profiledFunc', func), trees)
+
+
+'''
+Profile the auctions of random deals.
+Inputs:
+    numDeals - number of deals to bid
+    rng - random number generator for the deals
+Returns:
+    the BidProfiler holding the results
+'''
+def profileRandomDeals(numDeals, rng):
+    # The engine sits above the bidding code, so import it here
+    from auctionEngine import AuctionEngine
+    from dealNumber import getHandsFromSeats, DEAL_POSITIONS, NUM_CARDS_IN_DECK
+    engine = AuctionEngine(logLevel="OFF")
+    profiler = BidProfiler()
+    seats = [index % 4 for index in range(0, NUM_CARDS_IN_DECK)]
+    enableProfiling(profiler, [engine.table.bidTree])
+    # Keep the bidding code's prints out of the report
+    saveStdout = sys.stdout
+    sys.stdout = Log
+    try:
+        for dealIdx in range(0, numDeals):
+            rng.shuffle(seats)
+            engine.run(getHandsFromSeats(seats), DEAL_POSITIONS[dealIdx % 4])
+    finally:
+        sys.stdout = saveStdout
+        disableProfiling()
+    return profiler
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Profile the bidding code on random deals')
+    parser.add_argument('-n', '--deals', type=int, default=1000, help='Number of deals. Default=1000', required=False)
+    parser.add_argument('-s', '--seed', type=int, default=1, help='Random seed. Default=1', required=False)
+    parser.add_argument('-b', '--bidseqs', type=int, default=3, help='Bid sequences listed per function. Default=3', required=False)
+    parser.add_argument('-f', '--folded', help='File for the folded stacks, for flamegraph.pl', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    profiler = profileRandomDeals(args['deals'], random.Random(args['seed']))
+    profiler.show(args['bidseqs'])
+    if args['folded']:
+        profiler.writeFoldedStacks(args['folded'])
+
+if __name__ == '__main__':
+    main(sys.argv)
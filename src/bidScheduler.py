@@ -0,0 +1,65 @@
+'''
+Bid Scheduler Class
+
+Makes the computer players' bids as soon as the table asks for them.
+The card table puts a request on a queue whenever a computer player is
+due to bid, and a worker thread waiting on the queue makes the bid
+straight away. Nothing runs while the table is waiting for the human,
+and a computer bid takes only as long as the bidding code needs.
+
+Making a bid calls back into the table, which asks for the next bid,
+so a whole run of computer bids is made one after the other by the
+worker thread without any polling. The next request is queued before
+the current one is done, so waitUntilIdle returns only once the run
+of computer bids has stopped: the hand is over or it is the human's
+turn.
+'''
+
+import queue
+import threading
+
+
+class BidScheduler:
+
+    def __init__(self, table):
+        self.table = table
+        # Queue of TablePositions due to bid. None stops the worker.
+        self.requests = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="BidScheduler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.requests.put(None)
+
+    # Wait until there are no more computer bids to make
+    def waitUntilIdle(self):
+        self.requests.join()
+
+    # Called by the table when a computer player is due to bid
+    def requestBid(self, pos):
+        self.requests.put(pos)
+
+    def run(self):
+        while True:
+            pos = self.requests.get()
+            if pos is None:
+                self.requests.task_done()
+                break
+            try:
+                self.makeBid(pos)
+            finally:
+                self.requests.task_done()
+
+    def makeBid(self, pos):
+        table = self.table
+        # Drop requests overtaken by a new hand
+        if table.handDone or not table.outstandingBidReq or table.currentPos != pos:
+            return
+        player = table.players[pos]
+        try:
+            player.computerBidRequest(table, table.hasOpener, player.teamState.competition, table.roundNum, table.bidsList, player.isHuman, player.hand)
+        except Exception as e:
+            # Keep the worker alive for the next hand
+            print("BidScheduler: %s could not bid: %s" % (pos.name, e))
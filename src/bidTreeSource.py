@@ -0,0 +1,106 @@
+'''
+Bidding Tree Sources
+
+A bidding tree source supplies the raw contents of the bidNode.json
+files of one bidding system. The BidTree class parses them into a trie.
+Three kinds of source are supported:
+ - a directory of bidNode.json files on disk
+ - a directory shipped as a package resource
+ - an in-memory dictionary, keyed by bid path (e.g. "1C/1H")
+
+Each source yields (bidStrs, contents) pairs, where bidStrs is the list
+of bid strings leading to the node and contents are the raw json bytes.
+'''
+
+import os
+import json
+from importlib import resources
+
+BID_NODE_FILE = "bidNode.json"
+BID_TREE_ARTIFACT_SUFFIX = ".pickle"
+
+
+class DirectoryTreeSource:
+
+    def __init__(self, baseDir):
+        self.baseDir = os.path.normpath(baseDir)
+        self.name = self.baseDir
+
+    def walkNodes(self):
+        for dirPath, dirNames, fileNames in os.walk(self.baseDir):
+            # Walk in a fixed order so the content hash is repeatable
+            dirNames.sort()
+            if BID_NODE_FILE not in fileNames:
+                continue
+            relPath = os.path.relpath(dirPath, self.baseDir)
+            if relPath == os.curdir:
+                bidStrs = []
+            else:
+                bidStrs = relPath.split(os.sep)
+            fh = open(os.path.join(dirPath, BID_NODE_FILE), 'rb')
+            contents = fh.read()
+            fh.close()
+            yield (bidStrs, contents)
+
+    # The compiled tree is cached next to the tree directory
+    def getArtifactPath(self):
+        return self.baseDir + BID_TREE_ARTIFACT_SUFFIX
+
+    # The artifact is stale if any node file or directory is newer than it
+    def isArtifactFresh(self, artifactPath):
+        if not os.path.exists(artifactPath):
+            return False
+        artifactTime = os.stat(artifactPath).st_mtime
+        for dirPath, dirNames, fileNames in os.walk(self.baseDir):
+            if os.stat(dirPath).st_mtime > artifactTime:
+                return False
+            if BID_NODE_FILE in fileNames:
+                if os.stat(os.path.join(dirPath, BID_NODE_FILE)).st_mtime > artifactTime:
+                    return False
+        return True
+
+
+class ResourceTreeSource:
+
+    def __init__(self, package, subDir="bidding_trees"):
+        self.package = package
+        self.subDir = subDir
+        self.name = "%s:%s" % (package, subDir)
+
+    def walkNodes(self):
+        top = resources.files(self.package).joinpath(self.subDir)
+        yield from self.walkResource(top, [])
+
+    def walkResource(self, resource, bidStrs):
+        nodeFile = resource.joinpath(BID_NODE_FILE)
+        if nodeFile.is_file():
+            yield (bidStrs, nodeFile.read_bytes())
+        children = [child for child in resource.iterdir() if child.is_dir()]
+        children.sort(key=lambda child: child.name)
+        for child in children:
+            yield from self.walkResource(child, bidStrs + [child.name])
+
+    # Package resources may be read-only, so they are never cached
+    def getArtifactPath(self):
+        return None
+
+
+class DictTreeSource:
+
+    def __init__(self, nodes, name="memory"):
+        # Dictionary of bid path to bid node descriptor
+        # The root node has an empty path
+        self.nodes = nodes
+        self.name = name
+
+    def walkNodes(self):
+        for path in sorted(self.nodes.keys()):
+            if path == "":
+                bidStrs = []
+            else:
+                bidStrs = path.split('/')
+            contents = json.dumps(self.nodes[path], sort_keys=True).encode()
+            yield (bidStrs, contents)
+
+    def getArtifactPath(self):
+        return None
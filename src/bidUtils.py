@@ -210,8 +210,8 @@ def stubBid(table, bidsList):
             nextBidSuit = Suit.HEART
         elif lastBidSuit == Suit.CLUB:
             nextBidSuit = Suit.DIAMOND
-    bidStr = getBidStr(nextBidLevel, nextBidSuit)
-    Log.write("stubBid: %s in round %d by %s\n" % (bidStr, table.roundNum, table.currentPos.name))
+    if Log.debugOn:
+        Log.debug("stubBid: %s in round %d by %s\n", getBidStr(nextBidLevel, nextBidSuit), table.roundNum, table.currentPos.name)
     return (nextBidLevel, nextBidSuit)
 
 
@@ -255,11 +255,11 @@ def getMyPlayerRole(table, player):
             if partnerBid > 0:
                 # My partner opened
                 if table.roundNum == 1:
-                    Log.write("bidUtils: getMyPlayerRole: partner opened\n")
+                    Log.debug("bidUtils: getMyPlayerRole: partner opened\n")
                 return PlayerRole.RESPONDER
             else:
                 # My partner passed
-                Log.write("bidUtils: getMyPlayerRole: partner passed\n")
+                Log.debug("bidUtils: getMyPlayerRole: partner passed\n")
         else:
             iCanOpen = canIOpen(player.hand, competition, seat) 
             if iCanOpen:
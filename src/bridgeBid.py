@@ -2,16 +2,16 @@
 
 import os
 import sys
-import threading
 import argparse
 
-from time import sleep
 from infoLog import Log
 from enums import Suit, Level, PileOrder, TablePosition
 from card import Card
 from cardPile import CardPile
 from deck import Deck
 from cardTable import CardTable
+from bidScheduler import BidScheduler
+from openBidTable import checkOpenBidTable
 # GUI Support
 import tkinter as tk
 from PIL import Image, ImageTk
@@ -63,60 +63,66 @@ class Application(tk.Frame):
         northTableFrame = TableFrame(self, sharedFrame, TablePosition.NORTH, tk.BOTTOM)
         cardTable.setFrameByPosition(TablePosition.NORTH, northTableFrame)
 
-def thread_function(name, table):
-    while not table.programDone:
-        while not table.handDone:
-            curPos = table.currentPos
-            player = table.players[curPos]
-            if not player.isHuman and table.outstandingBidReq:
-                player.computerBidRequest(table, table.hasOpener, player.teamState.competition, table.roundNum, table.bidsList, player.isHuman, player.hand)
-            sleep(1)
-    sys.exit(0)
-
-
 def main(argv):
     # Initialize environment variables
     enableGui = True
     humanPlaying = True
-    replayHand = False
+    dealNum = None
 
     parser = argparse.ArgumentParser(description='Practice bridge bidding')
     parser.add_argument('-g', '--gui', action='store_true', help='Enable GUI. Default=True', required=False)
-    parser.add_argument('-r', '--replay', action='store_true',  help='Replay last hand', required=False)
+    parser.add_argument('-d', '--deal', type=int, help='Deal number of the first hand. Default=random deal', required=False)
+    parser.add_argument('-s', '--seed', type=int, help='Random seed for dealing. Default=unseeded', required=False)
     args = vars(parser.parse_args())
     if args['gui']:
         enableGui = True
-    if args['replay']:
-        replayHand = True
+    if args['deal'] is not None:
+        dealNum = args['deal']
+
+    # Without the GUI nobody can enter the human's bids, so the computer bids every seat
+    if not enableGui:
+        humanPlaying = False
+
+    # Load, build or check the opening bid table before the first hand,
+    # so it is not built in the middle of an auction
+    checkOpenBidTable()
 
     # Create a card table. This is the top level logic for a card game.
-    table = CardTable(enableGui, humanPlaying, replayHand)
-    
+    table = CardTable(enableGui, humanPlaying, dealNum, seed=args['seed'])
+    # The computer players bid on a worker thread as soon as it is their turn
+    bidScheduler = BidScheduler(table)
+    table.setBidScheduler(bidScheduler)
+
     if enableGui:
         # Create the root widget, which is the application window
         rootFrame = tk.Tk()
         # Set the size of the main window
         rootFrame.geometry("1200x700")
         app = Application(table, rootFrame, 1200, 700)
-        # Create a thread which simulate events from the computer
-        thread = threading.Thread(target=thread_function, args=('Dealer', table))
-        thread.start()
+        # Start bidding once tk is running, so the first computer bids
+        # can hand their updates to it
+        app.after(0, bidScheduler.start)
         app.mainloop()
     else:
-        table.dealCards()
-        table.findNextBidder()
-        table.bidRequest()
-        
+        # Bid one hand. The bids are made on the scheduler's thread,
+        # so wait for the auction to finish before stopping it.
+        bidScheduler.start()
+        table.startHand()
+        bidScheduler.waitUntilIdle()
+
+    table.programDone = True
+    bidScheduler.stop()
     print("Program Done")
 
 def showUsage():
     print("Usage:")
     print("\t./bridgeBid.py <options>")
     print("\t\t-g --gui\tEnable GUI. Default True")
-    print("\t\t-r --replay\tReplay last hand. Default False")
+    print("\t\t-d --deal\tDeal number of the first hand. Default random")
+    print("\t\t-s --seed\tRandom seed for dealing. Default unseeded")
     print("\t\t-h --help\tShow this help")
     print("\tExample")
-    print("\t\t./bridgeBid.py -r True")
+    print("\t\t./bridgeBid.py -d 123456789")
     
 if __name__ == '__main__':
     main(sys.argv)
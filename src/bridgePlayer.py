@@ -73,8 +73,8 @@ class BridgePlayer(Player):
         bid - the actual bid; a tuple of level and suit
     '''    
     def computerBidRequest(self, table, hasOpener, competition, roundNum, bidsList, isHuman, hand):
-        if self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH:
-            Log.write("BidReq: pos={} hasOpener={} compet={} roundNum={}\n".format(self.pos.name, hasOpener, competition, roundNum))
+        if Log.debugOn and (self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH):
+            Log.debug("BidReq: pos=%s hasOpener=%s compet=%s roundNum=%s\n", self.pos.name, hasOpener, competition, roundNum)
         if roundNum == 1:
             bidNotif = self.bidRound1(table)
 
@@ -86,13 +86,14 @@ class BridgePlayer(Player):
         
         # Store this bid
         self.lastNotif = bidNotif
-        bidStr = getBidStr(bidNotif.bid[0], bidNotif.bid[1])
+        if table.trace is not None:
+            table.trace.bid(table, self, bidNotif)
         if not isHuman:
             # Only submit the bid if the computer is this player
             self.table.bidResponse(self.pos, bidNotif)
         else:
             # This is the bid the computer thinks the human should make
-            Log.write("BidRsp: Computer thinks human should bid %s\n" % bidStr)
+            Log.info("BidRsp: Computer thinks human should bid %s\n", getBidStr(bidNotif.bid[0], bidNotif.bid[1]))
 
         # Debug
         #if bidNotif.bid[0] != 0 or self.teamState.bidSeq[-1][0] != 0:    
@@ -107,27 +108,24 @@ class BridgePlayer(Player):
         bidSeq = self.teamState.bidSeq
         
         # Fetch the bid node from the bidding tree for this bid sequence
-        self.bidNode = fetchBidTreeNode(bidSeq)
+        self.bidNode = table.bidTree.fetch(bidSeq)
   
         # Merge the bid tree node info into the team state
         self.teamState.mergeTreeNode(self, self.bidNode, self.playerRole)
 
         # FIX ME - debugging
-        if self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH:
-            Log.write("Show team state for %s, prior to round 1 bid\n" % self.pos.name)
+        if Log.debugOn and (self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH):
+            Log.debug("Show team state for %s, prior to round 1 bid\n", self.pos.name)
             self.teamState.show()
         
-        if self.playerRole == PlayerRole.RESPONDER:
-            # Call the handler function for the current team state
-            bidNotif = table.responderRegistry.jump_table[self.bidNode.handler](table, self)
-        else:
-            # Call the handler function for the current team state
-            bidNotif = table.openerRegistry.jump_table[self.bidNode.handler](table, self)
+        # Call the handler function for the current team state.
+        # The tree bound it to the node when it was loaded.
+        bidNotif = self.callBidHandler(table, self.bidNode.handler, self.bidNode.handlerFunc)
 
         # Update the bid notification using the bid node information
         newBidSeq = self.teamState.bidSeq.copy()
         newBidSeq.append(bidNotif.bid)
-        nextBidNode = fetchBidTreeNode(newBidSeq)
+        nextBidNode = table.bidTree.fetch(newBidSeq)
         bidNotif.updateWithBidnode(self, nextBidNode)
         return bidNotif
 
@@ -146,24 +144,24 @@ class BridgePlayer(Player):
             self.playerRole = getMyPlayerRole(table, self)
 
         if self.playerRole == PlayerRole.NONE:
-            Log.write("bidRound2: player {} passes because role is NONE\n".format(self.pos))
+            Log.debug("bidRound2: player %s passes because role is NONE\n", self.pos)
             bidNotif = BidNotif(self, 0, Suit.ALL)
             return bidNotif
 
         # FIX ME - debugging
-        if self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH:
-            Log.write("Show team state for %s, prior to round 2 bid\n" % self.pos.name)
+        if Log.debugOn and (self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH):
+            Log.debug("Show team state for %s, prior to round 2 bid\n", self.pos.name)
             self.teamState.show()
             
         if self.playerRole == PlayerRole.OPENER:
             # Fetch the bid node from the bidding tree for this bid sequence
-            self.bidNode = fetchBidTreeNode(bidSeq)
+            self.bidNode = table.bidTree.fetch(bidSeq)
         
             # Merge the bid tree node info into the team state
             self.teamState.mergeTreeNode(self, self.bidNode, self.playerRole)
             
             # Call the handler function for the current team state
-            bidNotif = table.openerRebidRegistry.jump_table[self.bidNode.handler](table, self)
+            bidNotif = self.callBidHandler(table, self.bidNode.handler, self.bidNode.handlerFunc)
 
             # No bid node exists after a round 2 opener rebid
 
@@ -171,17 +169,17 @@ class BridgePlayer(Player):
             # Update the team state if a bid node exists for the current bid
             if numBids < 3:
                 # Fetch the bid node from the bidding tree for this bid sequence
-                self.bidNode = fetchBidTreeNode(bidSeq)
+                self.bidNode = table.bidTree.fetch(bidSeq)
                 # Merge the bid tree node info into the team state
                 self.teamState.mergeTreeNode(self, self.bidNode, self.playerRole)                
                 # Call the handler function for the current team state
-                bidNotif = table.responderRegistry.jump_table[self.bidNode.handler](table, self)
+                bidNotif = self.callBidHandler(table, self.bidNode.handler, self.bidNode.handlerFunc)
                 numBids += 1
                 if numBids < 3:
                     # Update the bid notification using the bid node information
                     newBidSeq = self.teamState.bidSeq.copy()
                     newBidSeq.append(bidNotif.bid)
-                    nextBidNode = fetchBidTreeNode(newBidSeq)
+                    nextBidNode = table.bidTree.fetch(newBidSeq)
                     bidNotif.updateWithBidnode(self, nextBidNode)
             else:
                 # We don't have a bid node for the third bid
@@ -191,8 +189,8 @@ class BridgePlayer(Player):
                     twoBidSeq = bidSeq[1:]
                 else:
                     twoBidSeq = bidSeq[:-1]
-                self.bidNode = fetchBidTreeNode(twoBidSeq)
-                bidNotif = nonNodeBidHandler(table, self)
+                self.bidNode = table.bidTree.fetch(twoBidSeq)
+                bidNotif = self.callBidHandler(table, "nonNodeBidHandler", nonNodeBidHandler)
                 
         else:
             print("bridgePlayer: bidRound2: Player %s has invalid role %d" % (self.pos.name, self.playerRole.value))
@@ -205,8 +203,8 @@ class BridgePlayer(Player):
             return bidNotif
         
         # FIX ME - debugging
-        if self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH:
-            Log.write("Show team state for %s, prior to round %d bid\n" % (self.pos.name, table.roundNum))
+        if Log.debugOn and (self.pos == TablePosition.NORTH or self.pos == TablePosition.SOUTH):
+            Log.debug("Show team state for %s, prior to round %d bid\n", self.pos.name, table.roundNum)
             self.teamState.show()
 
         # We don't have a bid node for any round 3 bid
@@ -217,22 +215,35 @@ class BridgePlayer(Player):
             twoBidSeq = bidSeq[1:3]
         else:
             twoBidSeq = bidSeq[:2]
-        self.bidNode = fetchBidTreeNode(twoBidSeq)
+        self.bidNode = table.bidTree.fetch(twoBidSeq)
                 
-        bidNotif = nonNodeBidHandler(table, self)
+        bidNotif = self.callBidHandler(table, "nonNodeBidHandler", nonNodeBidHandler)
         return bidNotif
 
     
+    # Call a bid handler, through the table's decision cache if it has one
+    def callBidHandler(self, table, handlerName, handlerFunc):
+        if table.coverage is not None:
+            table.coverage.handlerCall(handlerName, self.bidNode)
+        if table.trace is not None:
+            stateBefore = self.teamState.pack()
+        if table.decisionCache is None:
+            bidNotif = handlerFunc(table, self)
+        else:
+            bidNotif = table.decisionCache.call(handlerName, handlerFunc, table, self)
+        if table.trace is not None:
+            table.trace.handlerCall(table, self, handlerName, self.bidNode, stateBefore, self.teamState.pack(), bidNotif)
+        return bidNotif
+
     # Bid notification handler for a player
     def bidNotification(self, table, bidder, bidNotif):
-        (bidLevel, bidSuit) = (bidNotif.bid[0], bidNotif.bid[1])
-        bidStr = getBidStr(bidLevel, bidSuit)
-        Log.write("bidNotif: bidder={} bid={} me={}\n".format(bidder.name, bidStr, self.pos.name))
+        if Log.debugOn:
+            Log.debug("bidNotif: bidder=%s bid=%s me=%s\n", bidder.name, getBidStr(bidNotif.bid[0], bidNotif.bid[1]), self.pos.name)
 
         # Need to figure out who the bidder is?
         myPartner = whosMyPartner(self.pos)
         if bidder == myPartner:
-            Log.write("bidNotification: {} is my partner\n".format(bidder.name))
+            Log.debug("bidNotification: %s is my partner\n", bidder.name)
             # Partner made this bid. Update the team state bid sequence
             self.teamState.bidSeq.append(bidNotif.bid)
             bidSeq = self.teamState.bidSeq
@@ -257,7 +268,7 @@ class BridgePlayer(Player):
             # We want to update the fit state for a suit bid by opposition
             bidSuitValue = bidNotif.bid[1].value
             if bidSuitValue >= Suit.SPADE.value and bidSuitValue <= Suit.CLUB.value:
-                # Log.write("bidNotification: no fit for {} bid by opposition\n".format(bidNotif.bid[1].name))
+                # Log.debug("bidNotification: no fit for %s bid by opposition\n", bidNotif.bid[1].name)
                 self.teamState.suitState[bidNotif.bid[1]] = FitState.NO_SUPPORT
                 
     '''
@@ -285,3 +296,4 @@ class BridgePlayer(Player):
         # Return all the cards to the deck
         self.table.deck.cards.extend(self.hand.cards)
         del self.hand.cards[:]
+        self.hand.invalidateProfile()
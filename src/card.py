@@ -3,13 +3,40 @@ Card Class
 
 A class representing a playing card
 '''
+import os
 from enums import Suit, Level
 import tkinter as tk
-from PIL import Image, ImageTk
 
-cardImageDirectory = "/home/richawil/Documents/Programming/Apps/Cards/images/"
-cardBackPortrait = cardImageDirectory + "cardBack_p.png"
-cardBackLandscape = cardImageDirectory + "cardBack_l.png"
+# The card images live in the images directory next to the source
+# directory. They can be moved with the BRIDGEBID_CARD_IMAGES environment
+# variable or setCardImageDirectory.
+cardImageDirectory = os.environ.get("BRIDGEBID_CARD_IMAGES",
+                                    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "images"))
+cardBackPortrait = os.path.join(cardImageDirectory, "cardBack_p.png")
+cardBackLandscape = os.path.join(cardImageDirectory, "cardBack_l.png")
+
+# Images shared by all cards, keyed by (suit, level, rotation, faceUp).
+# Each PNG is decoded the first time it is shown. All the card backs
+# with the same rotation share one image, keyed with no suit or level.
+cardImageCache = {}
+
+# Point the card images at another directory
+def setCardImageDirectory(imageDir):
+    global cardImageDirectory, cardBackPortrait, cardBackLandscape
+    cardImageDirectory = imageDir
+    cardBackPortrait = os.path.join(cardImageDirectory, "cardBack_p.png")
+    cardBackLandscape = os.path.join(cardImageDirectory, "cardBack_l.png")
+    cardImageCache.clear()
+
+# Return the shared image for a key, loading the file if needed
+def getCachedImage(key, fileName):
+    image = cardImageCache.get(key)
+    if image is None:
+        # Only the GUI needs PIL, so it is not imported until a card is drawn
+        from PIL import Image, ImageTk
+        image = ImageTk.PhotoImage(Image.open(fileName))
+        cardImageCache[key] = image
+    return image
 
 class Card():
 
@@ -18,7 +45,6 @@ class Card():
         self.level = level
         self.position = None
         # GUI variables
-        self.portraitFile, self.landscapeFile = self.getCardFileNames()
         self.faceUp = False
         self.anchor = [0, 0]
         self.canvas = None
@@ -53,7 +79,7 @@ class Card():
         return cardBackImageFile
 
     def getCardFileNames(self):
-        fileName = cardImageDirectory
+        fileName = ""
         if self.level.value == 1 or self.level.value == 14:
             fileName += "ace_of_"
         elif self.level.value > 1 and self.level.value < 11:
@@ -77,30 +103,39 @@ class Card():
             fileName += 'clubs'
         else:
             fileName += 'Unknown_suit'
-        portraitName = fileName + '_p.png'
-        landscapeName = fileName + '_l.png'
+        portraitName = os.path.join(cardImageDirectory, fileName + '_p.png')
+        landscapeName = os.path.join(cardImageDirectory, fileName + '_l.png')
         return portraitName, landscapeName
 
     
+    # The file names are only needed by the GUI, so work them out on demand
+    @property
+    def portraitFile(self):
+        return self.getCardFileNames()[0]
+
+    @property
+    def landscapeFile(self):
+        return self.getCardFileNames()[1]
+
     # Rotation is in degrees in the counterclockwise direction
     def getCardImage(self, rotation):
         #print("Getting image for card {}".format(card.toStr()))
-        # Open the card image file
+        if rotation != 0 and rotation != 90:
+            print("Unsupported rotation value of {}".format(rotation))
+            return self.image
         if self.faceUp:
+            key = (self.suit, self.level, rotation, True)
             if rotation == 0:
-                card_img = Image.open(self.portraitFile)
-            elif rotation == 90:
-                card_img = Image.open(self.landscapeFile)
+                fileName = self.portraitFile
             else:
-                print("Unsupported rotation value of {}".format(rotation))
+                fileName = self.landscapeFile
         else:
+            key = (None, None, rotation, False)
             if rotation == 0:
-                card_img = Image.open(cardBackPortrait)
-            elif rotation == 90:
-                card_img = Image.open(cardBackLandscape)
+                fileName = cardBackPortrait
             else:
-                print("Unsupported rotation value of {}".format(rotation))
-        self.image = ImageTk.PhotoImage(card_img)
+                fileName = cardBackLandscape
+        self.image = getCachedImage(key, fileName)
         return self.image
 
     '''      
@@ -6,7 +6,7 @@ This class is dependent of the type of card game, but leaves the
 display functions to the CardTableGui class.
 '''
 import os
-import json
+import random
 from time import sleep
 from constants import *
 from infoLog import Log
@@ -17,21 +17,37 @@ from cardPile import CardPile
 from deck import Deck
 from bridgePlayer import BridgePlayer
 from bridgeHand import BridgeHand
-from openBid import OpenerRegistry
-from responderBid import ResponderRegistry
-from openerRebid import OpenerRebidRegistry
+from bidNode import getBidTree
+from handBits import getCardIndex
+from dealNumber import DEAL_POSITIONS, getDealSeats, getDealNumber, getDealNumberFromHands
+from constrainedDealer import ConstrainedDealer
 
 class CardTable():
 
-    def __init__(self, enableGui=False, humanPlaying=False, replayHand=False):
+    def __init__(self, enableGui=False, humanPlaying=False, dealNum=None, bidTree=None, seed=None):
         self.guiEnabled = enableGui
         self.humanPlayer = humanPlaying
-        self.replayHand = replayHand
+        # Deal number of the next hand to deal. A random deal is dealt if None.
+        self.nextDealNum = dealNum
+        # Deal number of the current hand
+        self.dealNum = None
+        # Deals hands to order for practice. Random deals are dealt if None.
+        self.constrainedDealer = None
         self.deck = Deck()
         self.players = {}
-        self.openerRegistry = OpenerRegistry()
-        self.responderRegistry = ResponderRegistry()
-        self.openerRebidRegistry = OpenerRebidRegistry()
+        # Each table can bid with its own bidding system
+        if bidTree is None:
+            bidTree = getBidTree()
+        self.bidTree = bidTree
+        # Each table shuffles with its own generator, so a seeded table
+        # deals the same hands no matter what other tables are doing
+        self.rng = random.Random(seed)
+        # Optional DecisionCache in front of the bid handlers
+        self.decisionCache = None
+        # Optional AuctionTrace recording how each auction is bid
+        self.trace = None
+        # Optional TreeCoverage counting the handlers called
+        self.coverage = None
         self.bidsList = []
         self.highestBid = (0, Suit.ALL)
         self.roundNum = 0
@@ -40,6 +56,8 @@ class CardTable():
         self.leadPos = TablePosition.CONTROL
         self.outstandingBidReq = False
         self.guiTable = None
+        # Makes the computer players' bids when they are requested
+        self.bidScheduler = None
         self.handDone = True
         self.programDone = False
         self.log_fp = None
@@ -57,14 +75,29 @@ class CardTable():
         self.outstandingBidReq = False
         self.handDone = True
 
+    '''
+    Deal hands which meet per-seat constraints instead of random hands.
+    Inputs:
+        constraints - dictionary of TablePosition to SeatConstraint, or
+                      None to go back to random deals
+    '''
+    def setDealConstraints(self, constraints):
+        if constraints is None:
+            self.constrainedDealer = None
+        else:
+            self.constrainedDealer = ConstrainedDealer(constraints, self.rng)
+
     def setGuiTable(self, guiTable):
         self.guiTable = guiTable
 
+    def setBidScheduler(self, bidScheduler):
+        self.bidScheduler = bidScheduler
+
     def startHand(self):
         # Open a file for information logging
         Log.open()
         if self.guiEnabled:
-            Log.write("Start of a new hand\n")
+            Log.info("Start of a new hand\n")
         self.handDone = False
         self.dealCards()
         self.hasOpener = False
@@ -81,47 +114,33 @@ class CardTable():
         self.bidRequest()
         
 
-    def dealLastHands(self):
-        # Open the file containing the previous hands
-        hand_fp = open("../logs/lastHands.json", 'r')
-        Log.write("Loading the previous hand\n")
-        handsJson = hand_fp.read()
-        handsDict = json.loads(handsJson)
-        
-        for pos in TablePosition:
-            if pos == TablePosition.CONTROL or pos == TablePosition.CENTER:
-                continue
-                    
-            player = self.players[pos]
-            cardTupleList = handsDict[pos.name]
-            for cardTuple in cardTupleList:
-                # Find the card in the deck
-                card = self.deck.deleteCard(Suit(cardTuple[1]), Level(cardTuple[0]))
-                card.position = pos
-                # FIX ME: for debugging, turn all cards up
-                #if pos == TablePosition.SOUTH:
-                if True:
-                    card.faceUp = True
-                player.hand.cards.append(card)
-                
-            if self.guiEnabled:
-                self.guiTable.cardDealt(pos, player.hand)
+    # Deal the hands of a deal number, as given by the dealNumber module
+    def dealNumberedHands(self, dealNum):
+        self.dealSeatedHands(getDealSeats(dealNum), dealNum)
+
+    # Deal the cards of the deck to the seat indexes given for each card
+    def dealSeatedHands(self, seats, dealNum=None):
+        if dealNum is None:
+            dealNum = getDealNumber(seats)
+        cardLists = [[], [], [], []]
+        for card in self.deck.cards:
+            seat = seats[getCardIndex(card.suit, card.level)]
+            card.position = DEAL_POSITIONS[seat]
+            cardLists[seat].append(card)
+        del self.deck.cards[:]
+
+        for seat, pos in enumerate(DEAL_POSITIONS):
+            self.players[pos].hand.cards = cardLists[seat]
+        self.finishDeal(dealNum)
 
                 
     def dealNewHands(self):
-        self.deck.shuffle()
-        
-        # Create 4 empty card piles
+        # Deal the cards from the deck into 4 piles
         cardPiles = []
-        for index in range(0, 4):
-            cardPiles.append(BridgeHand(TablePosition.CENTER))
-
-        # Deal cards from the deck into the 4 piles    
-        for numCards in range(0, NUM_CARDS_IN_HAND):
-            for index in range(0, 4):
-                # Get the next card from the deck
-                card = self.deck.selectCard()
-                cardPiles[index].addCard(card)
+        for cards in self.deck.dealHands(self.rng):
+            pile = BridgeHand(TablePosition.CENTER)
+            pile.cards = cards
+            cardPiles.append(pile)
 
         # Calculate points for each pile
         # Find the 2 piles with the highest points
@@ -162,23 +181,20 @@ class CardTable():
                 self.players[TablePosition.EAST].hand = cardPiles[index]
                 eastHasHand = True
             
-        # Sort the cards in each hand
-        handsDict = {}
-        for pos in TablePosition:
-            if pos == TablePosition.CONTROL or pos == TablePosition.CENTER:
-                continue
-                    
-            player = self.players[pos]
-            hand = player.hand
+        # Number this deal so it can be dealt again
+        deal = {}
+        for pos in DEAL_POSITIONS:
+            deal[pos] = self.players[pos].hand
+        self.finishDeal(getDealNumberFromHands(deal))
+
+    def finishDeal(self, dealNum):
+        self.dealNum = dealNum
+        Log.info("Deal number %d\n", dealNum)
+        for pos in DEAL_POSITIONS:
+            hand = self.players[pos].hand
+            # Sort the cards in each hand
             hand.sort()
 
-            # Store this hand in a dictionary
-            cardList = []
-            for card in hand.cards:
-                cardTuple = (card.level.value, card.suit.value)                
-                cardList.append(cardTuple)
-            handsDict[pos.name] = cardList
-            
             # FIX ME: for debugging, turn all cards up
             #if pos == TablePosition.SOUTH:
             if True:
@@ -187,16 +203,15 @@ class CardTable():
                     card.faceUp = True
             if self.guiEnabled:
                 self.guiTable.cardDealt(pos, hand)
-                
-        # Write the hand dictionary out to a file
-        hand_fp = open("../logs/lastHands.json", 'w')
-        hand_fp.write(json.dumps(handsDict))
 
-        
     def dealCards(self):
-        # Do we want a new hand or to replay the previous hand?
-        if self.replayHand:
-            self.dealLastHands()
+        # Do we want a new hand or a particular deal?
+        if self.nextDealNum is not None:
+            dealNum = self.nextDealNum
+            self.nextDealNum = None
+            self.dealNumberedHands(dealNum)
+        elif self.constrainedDealer is not None:
+            self.dealSeatedHands(self.constrainedDealer.dealSeats())
         else:
             self.dealNewHands()
 
@@ -214,17 +229,30 @@ class CardTable():
         player = self.players[self.currentPos]
         self.outstandingBidReq = True
         player.bidRequest(self, self.bidsList)
+        if not player.isHuman and self.bidScheduler is not None:
+            self.bidScheduler.requestBid(self.currentPos)
 
         
     def bidResponse(self, bidder, bidNotif):
-        (bidLevel, bidSuit) = (bidNotif.bid[0], bidNotif.bid[1])        
+        if self.recordBid(bidder, bidNotif):
+            self.bidRequest()
+
+    '''
+    Record a bid and tell the other players about it.
+    Moves the table on to the next bidder, or finishes the hand if the
+    auction is over.
+    Returns:
+        True if another bid is due
+    '''
+    def recordBid(self, bidder, bidNotif):
+        (bidLevel, bidSuit) = (bidNotif.bid[0], bidNotif.bid[1])
         bidStr = getBidStr(bidLevel, bidSuit)
 
         player = self.players[bidder]
         if bidder == TablePosition.NORTH or bidder == TablePosition.SOUTH:
-            Log.write("BidRsp: %s as %s bids %s\n" % (bidder.name, player.playerRole.name, bidStr))
+            Log.info("BidRsp: %s as %s bids %s\n", bidder.name, player.playerRole.name, bidStr)
         else:
-            Log.write("BidRsp: %s bids %s\n" % (bidder.name, bidStr))
+            Log.info("BidRsp: %s bids %s\n", bidder.name, bidStr)
         
         self.outstandingBidReq = False
         if bidLevel > 0 and self.hasOpener == False:
@@ -267,7 +295,7 @@ class CardTable():
         # Provide a development hook to bail out of bidding loop
         if bidLevel > 7:
             self.processHandDone()
-            return
+            return False
         
         # Check if bidding is complete
         if len(self.bidsList) >= 4:
@@ -275,14 +303,13 @@ class CardTable():
                self.bidsList[-2][0] == 0 and \
                self.bidsList[-3][0] == 0:
                 self.processHandDone()
-                return
+                return False
             
         (nextPos, newRound) = getNextPosition(self.currentPos, self.leadPos)
         self.currentPos = nextPos
         if newRound:
             self.roundNum += 1
-            
-        self.bidRequest()
+        return True
 
             
     def processHandDone(self):
@@ -301,7 +328,7 @@ class CardTable():
 
         # Close the logging file
         print("Hand completed")
-        Log.write("Hand completed\n")
+        Log.info("Hand completed\n")
         Log.close()
 
         # Rotate the info log to the save log
@@ -7,8 +7,8 @@ It is mostly a GUI helper, setting up frames for each player and a
 center frame for showing played cards.
 '''
 
+import threading
 import tkinter as tk
-from time import sleep
 from enums import TablePosition
 from cardPile import CardPile
 from card import Card
@@ -28,6 +28,14 @@ class CardTableGui():
     def getFrameByPosition(self, tablePosition):
         return self.tableFrames[tablePosition]
 
+    # The table may report bids from the bid scheduler's thread, but tk
+    # must only be used from its own thread. Hand such updates to it.
+    def runOnGuiThread(self, func, *args):
+        if threading.current_thread() is threading.main_thread():
+            func(*args)
+        else:
+            self.app.after(0, func, *args)
+
     def startHand(self, leadPos):
         frame = self.getFrameByPosition(TablePosition.CONTROL)
         frame.createBidBoard(leadPos)
@@ -39,10 +47,16 @@ class CardTableGui():
         #sleep(1)
         
     def updateBids(self, pos, level, suit):
+        self.runOnGuiThread(self.drawBid, pos, level, suit)
+
+    def drawBid(self, pos, level, suit):
         controlFrame = self.getFrameByPosition(TablePosition.CONTROL)
         controlFrame.updateBids(self.app.table, pos, level, suit)
 
     def processHandDone(self):
+        self.runOnGuiThread(self.drawHands)
+
+    def drawHands(self):
         for pos in TablePosition:
             if pos == TablePosition.CONTROL or pos == TablePosition.CENTER:
                 continue
@@ -0,0 +1,383 @@
+'''
+Constrained Dealer
+
+Deals hands which meet per-seat constraints on high card points, suit
+lengths and balance, without dealing random hands and throwing away the
+ones that do not qualify.
+
+A constrained seat is dealt from the cards still in the deck:
+ 1. List the suit length patterns allowed by the constraint.
+ 2. Weight each pattern by the number of hands with that pattern and an
+    allowed point count. The count for each suit is a polynomial in HCP,
+    held as a Python int with one 64 bit digit per point, so multiplying
+    the four suit counts together adds up the points.
+ 3. Pick a pattern, then a point count, then the points held in each
+    suit, then the honors and the spot cards of each suit.
+Each step is weighted by the number of hands it leaves, so the hand is
+drawn uniformly from all qualifying hands of the remaining cards.
+Constrained seats are dealt first, in North, East, South, West order,
+and the unconstrained seats share the rest of the deck at random. With
+one constrained seat the deal is uniform over all qualifying deals. With
+several, each seat is uniform given the seats dealt before it.
+
+A constraint can also carry a predicate on the HandProfile of the hand.
+Only the seat's own hand is redrawn when the predicate fails.
+
+A deal is returned as 52 seat indexes, as used by the dealNumber module.
+'''
+
+import random
+from math import comb
+
+from handBits import HandBits, BRIDGE_SUITS, SUIT_SHIFT, NUM_CARDS_IN_SUIT
+from handProfile import HandProfile
+from dealNumber import DEAL_POSITIONS, NUM_CARDS_IN_DECK, getHandsFromSeats
+
+MAX_HCP = 37
+DIGIT_BITS = 64
+DIGIT_MASK = (1 << DIGIT_BITS) - 1
+# Bits of the Jack to the Ace within a suit mask
+HONOR_BITS = [9, 10, 11, 12]
+
+# All the suit length patterns in spade, heart, diamond, club order
+ALL_SHAPES = []
+for numSpades in range(0, NUM_CARDS_IN_SUIT + 1):
+    for numHearts in range(0, NUM_CARDS_IN_SUIT + 1 - numSpades):
+        for numDiamonds in range(0, NUM_CARDS_IN_SUIT + 1 - numSpades - numHearts):
+            ALL_SHAPES.append((numSpades, numHearts, numDiamonds,
+                               NUM_CARDS_IN_SUIT - numSpades - numHearts - numDiamonds))
+
+
+# Same rule as BridgeHand.isHandBalanced
+def isShapeBalanced(shape):
+    numDoubletons = 0
+    for numCardsInSuit in shape:
+        if numCardsInSuit < 2:
+            return False
+        if numCardsInSuit == 2:
+            numDoubletons += 1
+    return numDoubletons < 2
+
+
+def getDigit(poly, index):
+    return (poly >> (DIGIT_BITS * index)) & DIGIT_MASK
+
+
+# Pick an index from a list of integer weights
+def pickWeighted(rng, weights, totalWeight):
+    target = rng.randrange(totalWeight)
+    for index, weight in enumerate(weights):
+        if target < weight:
+            return index
+        target -= weight
+    raise ValueError("pickWeighted: weights do not add up to the total")
+
+
+class SeatConstraint:
+
+    '''
+    Inputs:
+        minHcp, maxHcp - range of high card points
+        suitLengths - dictionary of Suit to (minLength, maxLength)
+        balanced - True for a balanced hand, False for an unbalanced
+                   hand and None for either
+        predicate - function of a HandProfile returning True if the
+                    hand is acceptable
+    '''
+    def __init__(self, minHcp=0, maxHcp=MAX_HCP, suitLengths=None, balanced=None, predicate=None):
+        self.minHcp = minHcp
+        self.maxHcp = maxHcp
+        self.suitLengths = {}
+        if suitLengths is not None:
+            self.suitLengths = suitLengths
+        self.balanced = balanced
+        self.predicate = predicate
+
+    def isShapeAllowed(self, shape):
+        for index, suit in enumerate(BRIDGE_SUITS):
+            if suit in self.suitLengths:
+                (minLength, maxLength) = self.suitLengths[suit]
+                if shape[index] < minLength or shape[index] > maxLength:
+                    return False
+        if self.balanced is not None and isShapeBalanced(shape) != self.balanced:
+            return False
+        return True
+
+    '''
+    Narrow this constraint to the hands which also meet another one.
+    Raises ValueError if no hand can meet both.
+    '''
+    def restrict(self, other):
+        minHcp = max(self.minHcp, other.minHcp)
+        maxHcp = min(self.maxHcp, other.maxHcp)
+        if minHcp > maxHcp:
+            raise ValueError("HCP ranges %d-%d and %d-%d do not overlap" %
+                             (self.minHcp, self.maxHcp, other.minHcp, other.maxHcp))
+        suitLengths = dict(self.suitLengths)
+        for suit, (minLength, maxLength) in other.suitLengths.items():
+            if suit in suitLengths:
+                (ownMin, ownMax) = suitLengths[suit]
+                if max(ownMin, minLength) > min(ownMax, maxLength):
+                    raise ValueError("%s length ranges %d-%d and %d-%d do not overlap" %
+                                     (suit.name, ownMin, ownMax, minLength, maxLength))
+                (minLength, maxLength) = (max(ownMin, minLength), min(ownMax, maxLength))
+            suitLengths[suit] = (minLength, maxLength)
+        if other.balanced is not None and self.balanced is not None and other.balanced != self.balanced:
+            raise ValueError("a hand cannot be both balanced and unbalanced")
+        (self.minHcp, self.maxHcp) = (minHcp, maxHcp)
+        self.suitLengths = suitLengths
+        if other.balanced is not None:
+            self.balanced = other.balanced
+        if other.predicate is not None:
+            if self.predicate is None:
+                self.predicate = other.predicate
+            else:
+                (ownPredicate, otherPredicate) = (self.predicate, other.predicate)
+                self.predicate = lambda profile: ownPredicate(profile) and otherPredicate(profile)
+
+    # Check a hand against the whole constraint
+    def isSatisfiedBy(self, profile):
+        if profile.highCardPoints < self.minHcp or profile.highCardPoints > self.maxHcp:
+            return False
+        if not self.isShapeAllowed(profile.suitLengths):
+            return False
+        if self.predicate is not None and not self.predicate(profile):
+            return False
+        return True
+
+
+# The hands which calcOpenBid opens 1NT: balanced with 15 to 17 HCP.
+# A balanced hand has at most one 5 card suit, so it always has the
+# 14 total points needed to reach the 1NT check.
+def opens1NT():
+    return SeatConstraint(minHcp=15, maxHcp=17, balanced=True)
+
+
+'''
+Parse a constraint from a string of comma separated terms:
+    1NT          - opens 1NT
+    hcp:15-17    - high card points (either bound may be left out)
+    S:5-         - suit length, for the suit letters S, H, D and C
+    bal, unbal   - balanced or unbalanced
+Example: "hcp:6-9,S:3-"
+Every term narrows the constraint, so "1NT,hcp:16-" is a 1NT opener
+with 16 or 17 HCP. Raises ValueError if the terms contradict each other.
+'''
+def parseSeatConstraint(text):
+    constraint = SeatConstraint()
+    for term in text.split(','):
+        constraint.restrict(parseConstraintTerm(term.strip()))
+    return constraint
+
+
+# Return the SeatConstraint of one term of a constraint string
+def parseConstraintTerm(term):
+    if term == "1NT":
+        return opens1NT()
+    if term == "bal":
+        return SeatConstraint(balanced=True)
+    if term == "unbal":
+        return SeatConstraint(balanced=False)
+    if ':' in term:
+        (name, bounds) = term.split(':', 1)
+        (lowStr, highStr) = bounds.split('-', 1)
+        if name == "hcp":
+            return SeatConstraint(minHcp=int(lowStr) if lowStr else 0,
+                                  maxHcp=int(highStr) if highStr else MAX_HCP)
+        if name in "SHDC" and len(name) == 1:
+            suit = BRIDGE_SUITS["SHDC".index(name)]
+            return SeatConstraint(suitLengths={suit: (int(lowStr) if lowStr else 0,
+                                                      int(highStr) if highStr else NUM_CARDS_IN_SUIT)})
+    raise ValueError("unknown constraint term %s" % term)
+
+
+# Turn a list of "N=hcp:15-17,bal" style strings into seat constraints
+def parseConstraintSpecs(constraintSpecs):
+    constraints = {}
+    if constraintSpecs is None:
+        return constraints
+    for spec in constraintSpecs:
+        (posStr, text) = spec.split('=', 1)
+        pos = DEAL_POSITIONS["NESW".index(posStr.strip().upper())]
+        constraints[pos] = parseSeatConstraint(text)
+    return constraints
+
+
+class SuitChoices:
+    '''
+    The ways of taking cards from the unassigned cards of one suit
+    '''
+
+    def __init__(self, availBits):
+        self.spots = [bit for bit in availBits if bit not in HONOR_BITS]
+        honors = [bit for bit in availBits if bit in HONOR_BITS]
+        # Every subset of the honors, as (bits, hcp)
+        self.honorSets = [([], 0)]
+        for bit in honors:
+            self.honorSets += [(bits + [bit], hcp + bit - 8) for (bits, hcp) in self.honorSets]
+        self.numCards = len(availBits)
+
+        # polys[length] counts the holdings of a length by HCP
+        self.polys = []
+        numSpots = len(self.spots)
+        for length in range(0, self.numCards + 1):
+            poly = 0
+            for (bits, hcp) in self.honorSets:
+                numSpotsNeeded = length - len(bits)
+                if 0 <= numSpotsNeeded <= numSpots:
+                    poly += comb(numSpots, numSpotsNeeded) << (DIGIT_BITS * hcp)
+            self.polys.append(poly)
+
+    # Pick a holding of a given length and HCP. Returns a list of bits.
+    def pickHolding(self, rng, length, hcp):
+        weights = []
+        for (bits, setHcp) in self.honorSets:
+            numSpotsNeeded = length - len(bits)
+            if setHcp == hcp and 0 <= numSpotsNeeded <= len(self.spots):
+                weights.append(comb(len(self.spots), numSpotsNeeded))
+            else:
+                weights.append(0)
+        (bits, setHcp) = self.honorSets[pickWeighted(rng, weights, sum(weights))]
+        return bits + rng.sample(self.spots, length - len(bits))
+
+
+class ConstrainedDealer:
+
+    '''
+    Inputs:
+        constraints - dictionary of TablePosition to SeatConstraint
+        rng - random.Random instance
+        maxTries - number of attempts before giving up on a deal
+    '''
+    def __init__(self, constraints, rng=None, maxTries=1000):
+        if rng is None:
+            rng = random.Random()
+        self.rng = rng
+        self.maxTries = maxTries
+        self.constraints = []
+        for seat, pos in enumerate(DEAL_POSITIONS):
+            if pos in constraints:
+                constraint = constraints[pos]
+                shapes = [shape for shape in ALL_SHAPES if constraint.isShapeAllowed(shape)]
+                self.constraints.append((seat, constraint, shapes))
+        # The first constrained seat always sees a full deck, so its
+        # pattern weights are worked out only once
+        self.fullDeckWeights = {}
+
+    # Returns a list of 52 seat indexes
+    def dealSeats(self):
+        for tryNum in range(0, self.maxTries):
+            seats = self.tryDeal()
+            if seats is not None:
+                return seats
+        raise RuntimeError("ConstrainedDealer: no deal found in %d tries" % self.maxTries)
+
+    # Returns a dictionary of TablePosition to sorted BridgeHand
+    def dealHands(self):
+        return getHandsFromSeats(self.dealSeats())
+
+    def tryDeal(self):
+        seats = [None] * NUM_CARDS_IN_DECK
+        # Unassigned bits of each suit, in spade, heart, diamond, club order
+        avail = [list(range(0, NUM_CARDS_IN_SUIT)) for suit in BRIDGE_SUITS]
+        for (seat, constraint, shapes) in self.constraints:
+            holdings = self.dealSeat(constraint, shapes, avail)
+            if holdings is None:
+                return None
+            for index, suit in enumerate(BRIDGE_SUITS):
+                for bit in holdings[index]:
+                    seats[SUIT_SHIFT[suit] + bit] = seat
+                    avail[index].remove(bit)
+
+        # Share the rest of the deck between the unconstrained seats
+        constrainedSeats = [seat for (seat, constraint, shapes) in self.constraints]
+        rest = []
+        for index, suit in enumerate(BRIDGE_SUITS):
+            rest += [SUIT_SHIFT[suit] + bit for bit in avail[index]]
+        self.rng.shuffle(rest)
+        start = 0
+        for seat in range(0, 4):
+            if seat in constrainedSeats:
+                continue
+            for cardIndex in rest[start:start + NUM_CARDS_IN_SUIT]:
+                seats[cardIndex] = seat
+            start += NUM_CARDS_IN_SUIT
+        return seats
+
+    # Pick the holding in each suit for one seat. Returns None if no
+    # hand of the remaining cards meets the constraint.
+    def dealSeat(self, constraint, shapes, avail):
+        rng = self.rng
+        isFullDeck = sum(len(bits) for bits in avail) == NUM_CARDS_IN_DECK
+        if isFullDeck and id(constraint) in self.fullDeckWeights:
+            (shapes, weights, suitChoices) = self.fullDeckWeights[id(constraint)]
+        else:
+            suitChoices = [SuitChoices(bits) for bits in avail]
+            (shapes, weights) = self.getShapeWeights(constraint, shapes, suitChoices)
+            if isFullDeck:
+                self.fullDeckWeights[id(constraint)] = (shapes, weights, suitChoices)
+        totalWeight = sum(weights)
+        if totalWeight == 0:
+            return None
+
+        for tryNum in range(0, self.maxTries):
+            shape = shapes[pickWeighted(rng, weights, totalWeight)]
+            holdings = self.pickHoldings(constraint, shape, suitChoices)
+            if constraint.predicate is None:
+                return holdings
+            # Check the predicate against this hand only
+            bits = 0
+            for index, suit in enumerate(BRIDGE_SUITS):
+                for bit in holdings[index]:
+                    bits |= 1 << (SUIT_SHIFT[suit] + bit)
+            if constraint.predicate(HandProfile(HandBits(bits))):
+                return holdings
+        return None
+
+    # Count the qualifying hands of each allowed suit length pattern
+    def getShapeWeights(self, constraint, shapes, suitChoices):
+        allowedShapes = []
+        weights = []
+        for shape in shapes:
+            poly = 1
+            for index in range(0, 4):
+                if shape[index] > suitChoices[index].numCards:
+                    poly = 0
+                    break
+                poly *= suitChoices[index].polys[shape[index]]
+            if poly == 0:
+                continue
+            weight = 0
+            for hcp in range(constraint.minHcp, constraint.maxHcp + 1):
+                weight += getDigit(poly, hcp)
+            if weight > 0:
+                allowedShapes.append(shape)
+                weights.append(weight)
+        return (allowedShapes, weights)
+
+    # Pick the HCP and then the holding of each suit for a suit length pattern
+    def pickHoldings(self, constraint, shape, suitChoices):
+        rng = self.rng
+        suitPolys = [suitChoices[index].polys[shape[index]] for index in range(0, 4)]
+        # partials[i] counts the holdings of the first i suits by HCP
+        partials = [1]
+        for poly in suitPolys:
+            partials.append(partials[-1] * poly)
+
+        hcpRange = list(range(constraint.minHcp, constraint.maxHcp + 1))
+        weights = [getDigit(partials[4], hcp) for hcp in hcpRange]
+        hcpLeft = hcpRange[pickWeighted(rng, weights, sum(weights))]
+
+        # Split the points between the suits, last suit first
+        suitHcps = [0] * 4
+        for index in range(3, -1, -1):
+            weights = []
+            for hcp in range(0, hcpLeft + 1):
+                weights.append(getDigit(suitPolys[index], hcp) * getDigit(partials[index], hcpLeft - hcp))
+            suitHcps[index] = pickWeighted(rng, weights, sum(weights))
+            hcpLeft -= suitHcps[index]
+
+        holdings = []
+        for index in range(0, 4):
+            holdings.append(suitChoices[index].pickHolding(rng, shape[index], suitHcps[index]))
+        return holdings
@@ -0,0 +1,322 @@
+'''
+Deal Corpus
+
+An append-only binary file of deals. Each deal is stored as the owner of
+every card, 2 bits per card (0=North, 1=East, 2=South, 3=West), so a
+deal takes 13 bytes. The cards are in HandBits index order, four to a
+byte, with the lowest card index in the lowest 2 bits.
+
+The file starts with an 8 byte header: the magic string "BBDEAL", the
+format version and the record size. The records follow with no
+padding, so deal k starts at byte 8 + 13k and the number of deals is
+worked out from the file size.
+
+An optional index file (corpus path + ".idx") starts with a 16 byte
+header: the magic string "BBDIDX", the format version, the entry size
+and the number of deals in the corpus when it was built. It then holds a
+16 byte entry per deal: a 64 bit fingerprint of the deal and its record
+number, sorted by fingerprint. findDeal looks a deal up in it by binary
+search. Appending to a corpus deletes its index, and findDeal refuses an
+index whose deal count does not match the corpus, so a lookup never
+silently misses the new deals.
+
+The index is built in a NumPy array mapped onto the index file, so a
+corpus of any size can be indexed without holding its entries in memory.
+
+Deals are read and written as lists of 52 seat indexes, as used by the
+dealNumber and constrainedDealer modules.
+'''
+
+import os
+import sys
+import struct
+import random
+import hashlib
+import argparse
+
+from dealNumber import NUM_CARDS_IN_DECK
+from constrainedDealer import ConstrainedDealer, parseConstraintSpecs
+
+DEAL_CORPUS_MAGIC = b"BBDEAL"
+DEAL_CORPUS_VERSION = 1
+NUM_CARDS_IN_HAND = NUM_CARDS_IN_DECK // 4
+DEAL_RECORD_SIZE = NUM_CARDS_IN_DECK // 4
+HEADER_FORMAT = "<6sBB"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"BBDIDX"
+INDEX_VERSION = 1
+INDEX_HEADER_FORMAT = "<6sBBQ"
+INDEX_HEADER_SIZE = struct.calcsize(INDEX_HEADER_FORMAT)
+INDEX_ENTRY_FORMAT = "<QQ"
+INDEX_ENTRY_SIZE = struct.calcsize(INDEX_ENTRY_FORMAT)
+# Number of deals read from the file at a time
+READ_BLOCK_DEALS = 4096
+
+# The 4 seat indexes packed into each byte value
+BYTE_SEATS = []
+for byteValue in range(0, 256):
+    BYTE_SEATS.append((byteValue & 3, (byteValue >> 2) & 3, (byteValue >> 4) & 3, byteValue >> 6))
+
+
+def encodeDeal(seats):
+    if len(seats) != NUM_CARDS_IN_DECK:
+        raise ValueError("A deal has %d cards, not %d" % (len(seats), NUM_CARDS_IN_DECK))
+    for seat in range(0, 4):
+        numCards = seats.count(seat)
+        if numCards != NUM_CARDS_IN_HAND:
+            raise ValueError("Seat %d has %d cards, not %d" % (seat, numCards, NUM_CARDS_IN_HAND))
+    record = bytearray(DEAL_RECORD_SIZE)
+    for index in range(0, DEAL_RECORD_SIZE):
+        card = 4 * index
+        record[index] = seats[card] | (seats[card + 1] << 2) | (seats[card + 2] << 4) | (seats[card + 3] << 6)
+    return bytes(record)
+
+
+def decodeDeal(record):
+    seats = []
+    for byteValue in record:
+        seats.extend(BYTE_SEATS[byteValue])
+    return seats
+
+
+# 64 bit fingerprint of an encoded deal, used by the index
+def getDealFingerprint(record):
+    return int.from_bytes(hashlib.blake2b(record, digest_size=8).digest(), 'little')
+
+
+def readHeader(fp, path):
+    header = fp.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ValueError("%s: not a deal corpus, file is too short" % path)
+    (magic, version, recordSize) = struct.unpack(HEADER_FORMAT, header)
+    if magic != DEAL_CORPUS_MAGIC:
+        raise ValueError("%s: not a deal corpus" % path)
+    if version != DEAL_CORPUS_VERSION or recordSize != DEAL_RECORD_SIZE:
+        raise ValueError("%s: unsupported deal corpus version %d" % (path, version))
+
+
+def getNumDeals(path):
+    return (os.path.getsize(path) - HEADER_SIZE) // DEAL_RECORD_SIZE
+
+
+class DealCorpusWriter:
+    '''
+    Appends deals to a corpus, creating it if it does not exist.
+    The index of the corpus is deleted by the first append.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.isIndexStale = False
+        self.fp = open(path, 'ab')
+        if self.fp.tell() == 0:
+            self.fp.write(struct.pack(HEADER_FORMAT, DEAL_CORPUS_MAGIC, DEAL_CORPUS_VERSION, DEAL_RECORD_SIZE))
+        else:
+            fh = open(path, 'rb')
+            readHeader(fh, path)
+            fh.close()
+            # Drop a partial record left by an interrupted write
+            numBytes = self.fp.tell() - HEADER_SIZE
+            if numBytes % DEAL_RECORD_SIZE != 0:
+                self.fp.truncate(HEADER_SIZE + (numBytes // DEAL_RECORD_SIZE) * DEAL_RECORD_SIZE)
+        self.numDeals = (self.fp.tell() - HEADER_SIZE) // DEAL_RECORD_SIZE
+
+    def write(self, seats):
+        record = encodeDeal(seats)
+        if not self.isIndexStale:
+            removeIndex(self.path)
+            self.isIndexStale = True
+        self.fp.write(record)
+        self.numDeals += 1
+
+    def writeDeals(self, deals):
+        for seats in deals:
+            self.write(seats)
+
+    def close(self):
+        self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+# Stream a sequence of deals into a corpus. Returns the number written.
+def writeDeals(path, deals):
+    writer = DealCorpusWriter(path)
+    firstDeal = writer.numDeals
+    writer.writeDeals(deals)
+    writer.close()
+    return writer.numDeals - firstDeal
+
+
+'''
+Stream deals out of a corpus, a block at a time.
+Inputs:
+    path - corpus file
+    start - record number of the first deal
+    count - number of deals to read, or None to read to the end
+Yields:
+    a list of 52 seat indexes for each deal
+'''
+def readDeals(path, start=0, count=None):
+    fp = open(path, 'rb')
+    try:
+        readHeader(fp, path)
+        fp.seek(HEADER_SIZE + start * DEAL_RECORD_SIZE)
+        numLeft = count
+        while numLeft is None or numLeft > 0:
+            numToRead = READ_BLOCK_DEALS
+            if numLeft is not None:
+                numToRead = min(numToRead, numLeft)
+            block = fp.read(numToRead * DEAL_RECORD_SIZE)
+            numRead = len(block) // DEAL_RECORD_SIZE
+            for index in range(0, numRead):
+                yield decodeDeal(block[index * DEAL_RECORD_SIZE:(index + 1) * DEAL_RECORD_SIZE])
+            if numRead < numToRead:
+                break
+            if numLeft is not None:
+                numLeft -= numRead
+    finally:
+        fp.close()
+
+
+# Read a single deal by record number
+def readDeal(path, recordNum):
+    for seats in readDeals(path, recordNum, 1):
+        return seats
+    raise IndexError("%s has no deal %d" % (path, recordNum))
+
+
+# Delete the index of a corpus, if it has one
+def removeIndex(path):
+    try:
+        os.remove(path + INDEX_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+# Read the header of an index and return the number of deals it covers
+def readIndexHeader(fp, indexPath):
+    header = fp.read(INDEX_HEADER_SIZE)
+    if len(header) != INDEX_HEADER_SIZE:
+        raise ValueError("%s: not a deal index, file is too short" % indexPath)
+    (magic, version, entrySize, numDeals) = struct.unpack(INDEX_HEADER_FORMAT, header)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION or entrySize != INDEX_ENTRY_SIZE:
+        raise ValueError("%s: not a deal index of this version, rebuild it" % indexPath)
+    return numDeals
+
+
+# Write the fingerprint index of a corpus. Returns the number of deals indexed.
+def buildIndex(path):
+    # Only indexing needs NumPy, so it is not imported until an index is built
+    import numpy as np
+    numDeals = getNumDeals(path)
+    indexPath = path + INDEX_SUFFIX
+    tmpPath = indexPath + ".tmp"
+    fp = open(tmpPath, 'wb')
+    fp.write(struct.pack(INDEX_HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION, INDEX_ENTRY_SIZE, numDeals))
+    fp.close()
+    if numDeals == 0:
+        os.replace(tmpPath, indexPath)
+        return 0
+
+    # The entries are filled in and sorted in place in the file
+    entries = np.memmap(tmpPath, dtype=[('fingerprint', '<u8'), ('recordNum', '<u8')], mode='r+',
+                        offset=INDEX_HEADER_SIZE, shape=(numDeals,))
+    fp = open(path, 'rb')
+    readHeader(fp, path)
+    recordNum = 0
+    while recordNum < numDeals:
+        block = fp.read(min(READ_BLOCK_DEALS, numDeals - recordNum) * DEAL_RECORD_SIZE)
+        numRead = len(block) // DEAL_RECORD_SIZE
+        if numRead == 0:
+            break
+        fingerprints = [getDealFingerprint(block[offset:offset + DEAL_RECORD_SIZE])
+                        for offset in range(0, numRead * DEAL_RECORD_SIZE, DEAL_RECORD_SIZE)]
+        entries['fingerprint'][recordNum:recordNum + numRead] = fingerprints
+        entries['recordNum'][recordNum:recordNum + numRead] = np.arange(recordNum, recordNum + numRead, dtype=np.uint64)
+        recordNum += numRead
+    fp.close()
+    entries.sort(order=['fingerprint', 'recordNum'])
+    entries.flush()
+    del entries
+    os.replace(tmpPath, indexPath)
+    return numDeals
+
+
+# Return the record numbers at which a deal appears in an indexed corpus
+def findDeal(path, seats):
+    record = encodeDeal(seats)
+    fingerprint = getDealFingerprint(record)
+    indexPath = path + INDEX_SUFFIX
+    fp = open(indexPath, 'rb')
+    numEntries = readIndexHeader(fp, indexPath)
+    if numEntries != getNumDeals(path):
+        fp.close()
+        raise ValueError("%s: index covers %d deals but the corpus holds %d, rebuild it" %
+                         (indexPath, numEntries, getNumDeals(path)))
+
+    # Find the first entry with this fingerprint
+    low = 0
+    high = numEntries
+    while low < high:
+        middle = (low + high) // 2
+        fp.seek(INDEX_HEADER_SIZE + middle * INDEX_ENTRY_SIZE)
+        (entryPrint, recordNum) = struct.unpack(INDEX_ENTRY_FORMAT, fp.read(INDEX_ENTRY_SIZE))
+        if entryPrint < fingerprint:
+            low = middle + 1
+        else:
+            high = middle
+
+    # Fingerprints can collide, so check the deal itself
+    recordNums = []
+    fp.seek(INDEX_HEADER_SIZE + low * INDEX_ENTRY_SIZE)
+    corpusFp = open(path, 'rb')
+    while low < numEntries:
+        (entryPrint, recordNum) = struct.unpack(INDEX_ENTRY_FORMAT, fp.read(INDEX_ENTRY_SIZE))
+        if entryPrint != fingerprint:
+            break
+        corpusFp.seek(HEADER_SIZE + recordNum * DEAL_RECORD_SIZE)
+        if corpusFp.read(DEAL_RECORD_SIZE) == record:
+            recordNums.append(recordNum)
+        low += 1
+    corpusFp.close()
+    fp.close()
+    return sorted(recordNums)
+
+
+# Generate random deals, dealt by the constrained dealer if constraints are given
+def generateDeals(numDeals, rng, constrainedDealer=None):
+    seats = [seat for seat in range(0, 4) for card in range(0, NUM_CARDS_IN_DECK // 4)]
+    for dealNum in range(0, numDeals):
+        if constrainedDealer is not None:
+            yield constrainedDealer.dealSeats()
+        else:
+            rng.shuffle(seats)
+            yield list(seats)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Append random deals to a deal corpus')
+    parser.add_argument('corpus', help='Deal corpus file')
+    parser.add_argument('-n', '--deals', type=int, default=0, help='Number of deals to append. Default=0', required=False)
+    parser.add_argument('-s', '--seed', type=int, help='Random seed. Default=unseeded', required=False)
+    parser.add_argument('-C', '--constrain', action='append', help='Seat constraint, e.g. N=1NT. May be repeated', required=False)
+    parser.add_argument('-x', '--index', action='store_true', help='Rebuild the index afterwards', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    rng = random.Random(args['seed'])
+    constrainedDealer = None
+    if args['constrain']:
+        constrainedDealer = ConstrainedDealer(parseConstraintSpecs(args['constrain']), rng)
+    numWritten = writeDeals(args['corpus'], generateDeals(args['deals'], rng, constrainedDealer))
+    print("Appended %d deals, %s holds %d deals" % (numWritten, args['corpus'], getNumDeals(args['corpus'])))
+    if args['index']:
+        buildIndex(args['corpus'])
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,284 @@
+'''
+Deal Import
+
+Streams boards out of PBN and LIN files so the auction engine can bid
+existing deal libraries. Each board is read straight into the 52 seat
+indexes used by the dealNumber module, using a lookup table from the
+card characters to the card index, and then into a BridgeHand for each
+TablePosition.
+
+PBN boards are read from the [Board], [Dealer], [Deal] and [Auction]
+tags. LIN boards are read from the qx (board), md (dealer and hands)
+and mb (call) fields. The fourth hand of a LIN deal may be left out, in
+which case it gets the cards nobody else holds.
+
+The calls of the human auction are returned in the same format as
+AuctionResult.getAuctionStr, with X and XX for doubles.
+'''
+
+import os
+
+from enums import Suit, Level
+from handBits import getCardIndex, BRIDGE_SUITS
+from dealNumber import DEAL_POSITIONS, NUM_CARDS_IN_DECK, getHandsFromSeats
+
+NUM_CARDS_IN_HAND = 13
+
+# Card level of each rank character
+RANK_LEVELS = {'A': Level.Ace_HIGH, 'K': Level.King, 'Q': Level.Queen, 'J': Level.Jack, 'T': Level.Ten}
+for levelValue in range(2, 10):
+    RANK_LEVELS[str(levelValue)] = Level(levelValue)
+# Card index of each (suit, rank character) pair
+CARD_INDEXES = {}
+for suit in BRIDGE_SUITS:
+    for rankChar, level in RANK_LEVELS.items():
+        CARD_INDEXES[(suit, rankChar)] = getCardIndex(suit, level)
+        CARD_INDEXES[(suit, rankChar.lower())] = getCardIndex(suit, level)
+
+SEAT_OF_LETTER = {'N': 0, 'E': 1, 'S': 2, 'W': 3}
+SUIT_OF_LETTER = {'S': Suit.SPADE, 'H': Suit.HEART, 'D': Suit.DIAMOND, 'C': Suit.CLUB}
+# LIN lists the hands from South, and numbers the dealer 1=S, 2=W, 3=N, 4=E
+LIN_HAND_SEATS = [2, 3, 0, 1]
+LIN_DEALER_SEATS = {'1': 2, '2': 3, '3': 0, '4': 1}
+
+
+class ImportedBoard:
+
+    def __init__(self, board, dealer, seats, humanAuction):
+        # Board name from the file
+        self.board = board
+        # TablePosition of the dealer
+        self.dealer = dealer
+        # List of 52 seat indexes
+        self.seats = seats
+        # List of calls in the human auction
+        self.humanAuction = humanAuction
+
+    # Dictionary of TablePosition to sorted BridgeHand
+    def getDeal(self):
+        return getHandsFromSeats(self.seats)
+
+    def getHumanAuctionStr(self):
+        return '-'.join(self.humanAuction)
+
+
+# Put the call of a PBN or LIN auction in getBidStr format
+def normalizeCall(call):
+    call = call.strip().rstrip('!').upper()
+    if call in ("P", "PASS"):
+        return "Pass"
+    if call in ("X", "D", "DBL"):
+        return "X"
+    if call in ("XX", "R", "RDBL"):
+        return "XX"
+    if len(call) >= 2 and call[0] in "1234567":
+        if call[1:] in ("N", "NT"):
+            return call[0] + "N"
+        if call[1:] in ("C", "D", "H", "S"):
+            return call
+    return None
+
+
+# An auction ends after 3 passes following a bid, or 4 passes
+def isAuctionDone(calls):
+    if len(calls) < 4:
+        return False
+    return calls[-3:] == ["Pass", "Pass", "Pass"]
+
+
+# Add the calls of one auction token, expanding AP (all pass)
+def addCall(calls, token):
+    if token.upper() == "AP":
+        while not isAuctionDone(calls):
+            calls.append("Pass")
+        return
+    call = normalizeCall(token)
+    if call is not None:
+        calls.append(call)
+
+
+# Fill in the seats of one hand given as suit holdings in S, H, D, C order
+def setHandSeats(seats, seat, holdings):
+    for suit, holding in zip(BRIDGE_SUITS, holdings):
+        for rankChar in holding:
+            seats[CARD_INDEXES[(suit, rankChar)]] = seat
+
+
+# Give a missing hand every card that nobody else holds
+def fillMissingHand(seats):
+    missingSeats = set(range(0, 4)) - set(seats)
+    if seats.count(None) == NUM_CARDS_IN_HAND and len(missingSeats) == 1:
+        lastSeat = missingSeats.pop()
+        for index in range(0, NUM_CARDS_IN_DECK):
+            if seats[index] is None:
+                seats[index] = lastSeat
+
+
+def isDealComplete(seats):
+    if None in seats:
+        return False
+    for seat in range(0, 4):
+        if seats.count(seat) != NUM_CARDS_IN_HAND:
+            return False
+    return True
+
+
+'''
+Parse the value of a PBN Deal tag, e.g. "N:AKQ.JT9.876.5432 - ..."
+Returns a list of 52 seat indexes, or None if the deal is incomplete.
+'''
+def parsePbnDeal(dealStr):
+    seats = [None] * NUM_CARDS_IN_DECK
+    if ':' not in dealStr:
+        return None
+    (firstLetter, handsStr) = dealStr.strip().split(':', 1)
+    seat = SEAT_OF_LETTER.get(firstLetter.strip().upper())
+    if seat is None:
+        return None
+    for handStr in handsStr.split():
+        if handStr != '-':
+            try:
+                setHandSeats(seats, seat, handStr.split('.'))
+            except KeyError:
+                return None
+        seat = (seat + 1) % 4
+    fillMissingHand(seats)
+    if not isDealComplete(seats):
+        return None
+    return seats
+
+
+'''
+Parse the value of a LIN md field, e.g. "3SAKQHJT9D876C5432,S...,S...,"
+Returns the dealer seat and a list of 52 seat indexes, or None for the
+seats if the deal is incomplete.
+'''
+def parseLinDeal(mdStr):
+    dealer = LIN_DEALER_SEATS.get(mdStr[:1])
+    if dealer is not None:
+        mdStr = mdStr[1:]
+    seats = [None] * NUM_CARDS_IN_DECK
+    for seat, handStr in zip(LIN_HAND_SEATS, mdStr.split(',')):
+        suit = None
+        for char in handStr.strip():
+            if char.upper() in SUIT_OF_LETTER:
+                suit = SUIT_OF_LETTER[char.upper()]
+            elif suit is not None and (suit, char) in CARD_INDEXES:
+                seats[CARD_INDEXES[(suit, char)]] = seat
+            else:
+                return (dealer, None)
+    fillMissingHand(seats)
+    if not isDealComplete(seats):
+        return (dealer, None)
+    return (dealer, seats)
+
+
+def makeBoard(board, dealerSeat, seats, calls):
+    if dealerSeat is None:
+        dealerSeat = 0
+    return ImportedBoard(board, DEAL_POSITIONS[dealerSeat], seats, calls)
+
+
+# Yield an ImportedBoard for every complete deal of a PBN file
+def readPbnBoards(fp):
+    board = None
+    dealerSeat = None
+    seats = None
+    calls = []
+    inAuction = False
+    for line in fp:
+        line = line.strip()
+        if line.startswith('%'):
+            continue
+        if line.startswith('['):
+            inAuction = False
+            tagEnd = line.find(' ')
+            if tagEnd < 0:
+                continue
+            tag = line[1:tagEnd]
+            value = line[tagEnd:].strip().rstrip(']').strip().strip('"')
+            if tag == "Event" and seats is not None:
+                # The tags of the next game may follow with no blank line
+                yield makeBoard(board, dealerSeat, seats, calls)
+                (board, dealerSeat, seats, calls) = (None, None, None, [])
+            if tag == "Board":
+                board = value
+            elif tag == "Dealer":
+                dealerSeat = SEAT_OF_LETTER.get(value.upper()[:1])
+            elif tag == "Deal":
+                seats = parsePbnDeal(value)
+                if seats is None:
+                    print("dealImport: skipping incomplete deal %s" % value)
+            elif tag == "Auction":
+                inAuction = True
+        elif line == '':
+            if seats is not None:
+                yield makeBoard(board, dealerSeat, seats, calls)
+            (board, dealerSeat, seats, calls, inAuction) = (None, None, None, [], False)
+        elif inAuction:
+            for token in line.split():
+                # Skip note references, NAGs and the end of auction marker
+                if token.startswith('=') or token.startswith('$') or token in ('*', '-'):
+                    continue
+                addCall(calls, token)
+    if seats is not None:
+        yield makeBoard(board, dealerSeat, seats, calls)
+
+
+# Yield the (key, value) fields of a LIN file, reading it in blocks
+def readLinFields(fp):
+    pending = ''
+    while True:
+        block = fp.read(65536)
+        if block == '':
+            break
+        pending += block.replace('\n', '').replace('\r', '')
+        tokens = pending.split('|')
+        # Keep the last token and any unpaired key for the next block
+        numComplete = (len(tokens) - 1) // 2 * 2
+        for index in range(0, numComplete, 2):
+            yield (tokens[index].strip(), tokens[index + 1])
+        pending = '|'.join(tokens[numComplete:])
+    tokens = pending.split('|')
+    for index in range(0, len(tokens) - 1, 2):
+        yield (tokens[index].strip(), tokens[index + 1])
+
+
+# Yield an ImportedBoard for every complete deal of a LIN file
+def readLinBoards(fp):
+    board = None
+    dealerSeat = None
+    seats = None
+    calls = []
+    for (key, value) in readLinFields(fp):
+        if key == "qx" or (key == "md" and seats is not None):
+            if seats is not None:
+                yield makeBoard(board, dealerSeat, seats, calls)
+            (board, dealerSeat, seats, calls) = (None, None, None, [])
+        if key == "qx":
+            board = value.split(',')[0]
+        elif key == "ah" and board is None:
+            board = value
+        elif key == "md":
+            (dealerSeat, seats) = parseLinDeal(value)
+            if seats is None:
+                print("dealImport: skipping incomplete deal %s" % value)
+        elif key == "mb":
+            addCall(calls, value)
+    if seats is not None:
+        yield makeBoard(board, dealerSeat, seats, calls)
+
+
+# Yield the boards of a PBN or LIN file, chosen by the file extension
+def readBoards(path):
+    extension = os.path.splitext(path)[1].lower()
+    fp = open(path, 'r', errors='replace')
+    try:
+        if extension == ".lin":
+            yield from readLinBoards(fp)
+        elif extension == ".pbn":
+            yield from readPbnBoards(fp)
+        else:
+            raise ValueError("%s: unknown deal file type, expected .pbn or .lin" % path)
+    finally:
+        fp.close()
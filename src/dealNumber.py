@@ -0,0 +1,99 @@
+'''
+Deal Numbering
+
+Maps every possible deal to a unique number and back, in the style of
+the Pavlicek/Andrews deal numbering scheme. The cards are visited from
+the Ace of spades down to the Two of clubs. Each card splits the deals
+that remain into 4 blocks, one for each seat it could go to (North,
+East, South, West), sized by the number of ways the rest of the cards
+can be dealt.
+
+Deal numbers run from 0 to NUM_DEALS - 1. There are about 5.4 * 10^28
+deals, which needs 96 bits, so a deal number is a Python int rather
+than a fixed width integer.
+
+A deal is represented by a list of 52 seat indexes (0=North, 1=East,
+2=South, 3=West), indexed by the HandBits card index.
+'''
+
+from enums import TablePosition
+from handBits import getCardIndex, getCardFromIndex, NUM_CARDS_IN_SUIT
+from card import Card
+from bridgeHand import BridgeHand
+
+NUM_CARDS_IN_DECK = 52
+DEAL_POSITIONS = [TablePosition.NORTH, TablePosition.EAST, TablePosition.SOUTH, TablePosition.WEST]
+# 52! / (13!)^4
+NUM_DEALS = 53644737765488792839237440000
+
+
+# Return the deal number of a list of 52 seat indexes
+def getDealNumber(seats):
+    if len(seats) != NUM_CARDS_IN_DECK:
+        raise ValueError("a deal must have 52 cards, not %d" % len(seats))
+    # Number of cards each seat has still to receive
+    vacant = [NUM_CARDS_IN_SUIT] * 4
+    numDeals = NUM_DEALS
+    dealNum = 0
+    for numCardsLeft in range(NUM_CARDS_IN_DECK, 0, -1):
+        seat = seats[numCardsLeft - 1]
+        if vacant[seat] == 0:
+            raise ValueError("seat %d has more than 13 cards" % seat)
+        # Skip over the blocks of deals where this card goes to an earlier seat
+        for earlierSeat in range(0, seat):
+            dealNum += numDeals * vacant[earlierSeat] // numCardsLeft
+        numDeals = numDeals * vacant[seat] // numCardsLeft
+        vacant[seat] -= 1
+    return dealNum
+
+
+# Return the list of 52 seat indexes of a deal number
+def getDealSeats(dealNum):
+    if dealNum < 0 or dealNum >= NUM_DEALS:
+        raise ValueError("deal number must be between 0 and %d" % (NUM_DEALS - 1))
+    vacant = [NUM_CARDS_IN_SUIT] * 4
+    numDeals = NUM_DEALS
+    seats = [0] * NUM_CARDS_IN_DECK
+    for numCardsLeft in range(NUM_CARDS_IN_DECK, 0, -1):
+        # Find the block of deals holding this deal number
+        for seat in range(0, 4):
+            blockSize = numDeals * vacant[seat] // numCardsLeft
+            if dealNum < blockSize:
+                break
+            dealNum -= blockSize
+        seats[numCardsLeft - 1] = seat
+        numDeals = blockSize
+        vacant[seat] -= 1
+    return seats
+
+
+# Return the seat indexes of a deal held as a dictionary of position to hand
+def getDealSeatsFromHands(deal):
+    seats = [None] * NUM_CARDS_IN_DECK
+    for seat, pos in enumerate(DEAL_POSITIONS):
+        for card in deal[pos].cards:
+            seats[getCardIndex(card.suit, card.level)] = seat
+    return seats
+
+
+def getDealNumberFromHands(deal):
+    return getDealNumber(getDealSeatsFromHands(deal))
+
+
+# Build a dictionary of position to sorted BridgeHand from seat indexes
+def getHandsFromSeats(seats):
+    cardLists = [[], [], [], []]
+    for index in range(NUM_CARDS_IN_DECK - 1, -1, -1):
+        (suit, level) = getCardFromIndex(index)
+        cardLists[seats[index]].append(Card(suit, level))
+    deal = {}
+    for seat, pos in enumerate(DEAL_POSITIONS):
+        hand = BridgeHand(pos)
+        hand.cards = cardLists[seat]
+        deal[pos] = hand
+    return deal
+
+
+# Build a dictionary of position to sorted BridgeHand for a deal number
+def getDealHands(dealNum):
+    return getHandsFromSeats(getDealSeats(dealNum))
@@ -0,0 +1,100 @@
+'''
+Decision Cache
+
+An optional memo in front of the bid handlers. Many deals reach the same
+handler with hands that look the same to the bidding code, so the
+handler's decision can be reused instead of running its if-chains again.
+
+A decision is keyed by:
+ - the handler name
+ - the player's team state, which includes the partnership's bid sequence
+ - the player's role and seat
+ - the table's round number, whether it has an opener, and its highest bid
+ - the hand signature: the length and the A, K, Q, J held in each suit.
+   This fixes every value the handlers read from the hand profile.
+
+The cached decision holds the bid notification and the team state and
+player role the handler left behind, so a hit has the same effect as
+running the handler. It does not repeat the handler's log output.
+Handlers that raise are not cached.
+Entries are evicted least recently used first.
+'''
+
+from collections import OrderedDict
+from bidUtils import findLargestTableBid
+from bidNotif import BidNotif
+
+DEFAULT_DECISION_CACHE_SIZE = 100000
+
+
+class DecisionCache:
+
+    def __init__(self, maxSize=DEFAULT_DECISION_CACHE_SIZE):
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def makeKey(self, handlerName, table, player):
+        return (handlerName,
+                player.teamState.getStateKey(),
+                player.playerRole,
+                player.seat,
+                getattr(player, 'role', None),
+                table.roundNum,
+                table.hasOpener,
+                findLargestTableBid(table),
+                player.hand.getProfile().signature)
+
+    '''
+    Call a bid handler through the cache.
+    Inputs:
+        handlerName - name the decision is filed under
+        handlerFunc - function of (table, player) returning a BidNotif
+    Returns:
+        the BidNotif of the handler
+    '''
+    def call(self, handlerName, handlerFunc, table, player):
+        key = self.makeKey(handlerName, table, player)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            (notifState, teamState, playerRole, role) = entry
+            player.teamState.restoreState(teamState)
+            player.playerRole = playerRole
+            if role is not None:
+                player.role = role
+            # Some handlers fall through without a bid
+            if notifState is None:
+                return None
+            bidNotif = BidNotif.__new__(BidNotif)
+            bidNotif.__dict__.update(notifState)
+            bidNotif.suitState = notifState['suitState'].copy()
+            return bidNotif
+
+        self.misses += 1
+        bidNotif = handlerFunc(table, player)
+        notifState = None
+        if bidNotif is not None:
+            notifState = bidNotif.__dict__.copy()
+            notifState['suitState'] = bidNotif.suitState.copy()
+        self.entries[key] = (notifState, player.teamState.saveState(), player.playerRole, getattr(player, 'role', None))
+        if len(self.entries) > self.maxSize:
+            self.entries.popitem(last=False)
+        return bidNotif
+
+    def getHitRate(self):
+        numCalls = self.hits + self.misses
+        if numCalls == 0:
+            return 0.0
+        return self.hits / numCalls
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def show(self):
+        print("Decision cache: %d entries, %d hits, %d misses, hit rate %.1f%%" %
+              (len(self.entries), self.hits, self.misses, 100.0 * self.getHitRate()))
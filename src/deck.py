@@ -22,32 +22,39 @@ class Deck(CardPile):
                 self.addCard(card)
 
 
-    def shuffle(self):
-        # Create a temporary pile
-        tmpPile = CardPile(PileOrder.FIFO)
-
+    '''
+    Shuffle the deck in place with a Fisher-Yates shuffle.
+    Inputs:
+        rng - a random.Random instance. The module level generator is
+              used if none is given.
+    '''
+    def shuffle(self, rng=None):
+        if rng is None:
+            rng = random
         # Sanity check. Deck should have 52 cards
         numCards = len(self.cards)
         if numCards != 52:
             print("ERROR: shuffle: deck has {} cards".format(len(self.cards)))
         assert numCards == 52
-        
-        for i in range(0, 52):
-            # Randomly select a card from the deck
-            index = random.randint(0, 51 - i)
-            card = self.cards[index]
-            # print("Round {}: index {} card {}".format(i, index, card.toStr()))
-
-            # Transfer the card from the deck to the temporary file
-            self.removeCard(card)
-            tmpPile.addCard(card)
-
-        # Repeat in the opposite direction
-        for i in range(0, 52):
-            # Randomly select a card from the temporary pile
-            index = random.randint(0, 51 - i)
-            card = tmpPile.cards[index]
-
-            # Transfer the card from the temporary pile back to the deck
-            tmpPile.removeCard(card)
-            self.addCard(card)
+
+        cards = self.cards
+        for i in range(numCards - 1, 0, -1):
+            j = rng.randrange(i + 1)
+            cards[i], cards[j] = cards[j], cards[i]
+
+    '''
+    Shuffle the deck and deal it out into hands.
+    Inputs:
+        rng - a random.Random instance
+        numHands - number of hands to deal
+    Returns:
+        a list of numHands lists of cards. The cards are taken out of the
+        deck, dealt round robin as at the table.
+    '''
+    def dealHands(self, rng=None, numHands=4):
+        self.shuffle(rng)
+        hands = []
+        for index in range(0, numHands):
+            hands.append(self.cards[index::numHands])
+        del self.cards[:]
+        return hands
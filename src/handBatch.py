@@ -0,0 +1,90 @@
+'''
+Hand Batch Evaluation
+
+Evaluates large batches of hands with NumPy instead of one card object
+at a time. A batch is an (N, 52) boolean or uint8 array with one row per
+hand, using the same card index layout as HandBits: clubs are columns
+0-12, diamonds 13-25, hearts 26-38 and spades 39-51, and within a suit
+column 0 is the Two and column 12 is the Ace. Any non-zero entry means
+the hand holds the card.
+
+The results match BridgeHand.evalHand, isHandBalanced and hasStoppers.
+'''
+
+import numpy as np
+
+from handBits import NUM_CARDS_IN_SUIT
+
+NUM_CARDS_IN_DECK = 52
+NUM_HANDS_IN_DEAL = 4
+
+# High card points by position within a suit, Two to Ace
+HCP_WEIGHTS = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 3, 4], dtype=np.int8)
+QUEEN_COL = 10
+KING_COL = 11
+ACE_COL = 12
+
+
+class HandBatchProfile:
+    '''
+    Per-hand results of evaluating a batch. Every attribute is an array
+    with one entry per hand, and suitLengths has one column per suit in
+    spade, heart, diamond, club order.
+    '''
+
+    def __init__(self, hands):
+        hands = np.asarray(hands)
+        if hands.ndim != 2 or hands.shape[1] != NUM_CARDS_IN_DECK:
+            raise ValueError("hand batch must have shape (N, 52), not %s" % (hands.shape,))
+        # View the batch as (hand, suit, level) with spades first
+        cards = (hands != 0).reshape(-1, 4, NUM_CARDS_IN_SUIT)[:, ::-1, :]
+
+        self.suitLengths = cards.sum(axis=2, dtype=np.int8)
+        self.highCardPoints = (cards * HCP_WEIGHTS).sum(axis=(1, 2), dtype=np.int16)
+        self.longDistPoints = np.maximum(self.suitLengths - 4, 0).sum(axis=1, dtype=np.int16)
+        self.shortDistPoints = np.maximum(3 - self.suitLengths, 0).sum(axis=1, dtype=np.int16)
+
+        # No singletons or voids and at most one doubleton
+        self.balanced = (self.suitLengths >= 2).all(axis=1) & \
+                        ((self.suitLengths == 2).sum(axis=1) < 2)
+
+        # Same rules as BridgeHand.hasStoppers, applied to every suit:
+        # AK, AQ and KQ always stop, a lone A or K needs 2 cards and
+        # a lone Q needs 3 cards.
+        hasAce = cards[:, :, ACE_COL]
+        hasKing = cards[:, :, KING_COL]
+        hasQueen = cards[:, :, QUEEN_COL]
+        suitStopped = (hasAce & (hasKing | hasQueen)) | (hasKing & hasQueen) | \
+                      ((hasAce | hasKing) & (self.suitLengths >= 2)) | \
+                      (hasQueen & (self.suitLengths >= 3))
+        self.stoppers = suitStopped.all(axis=1)
+
+    def getNumHands(self):
+        return self.highCardPoints.shape[0]
+
+
+def evalHands(hands):
+    return HandBatchProfile(hands)
+
+
+'''
+Expand a batch of deals into a batch of hands.
+Input:
+    seats - an (N, 52) uint8 array giving the seat (0 to 3) holding each card
+Returns:
+    an (N * 4, 52) boolean hand array, with the 4 hands of deal k in
+    rows 4k to 4k+3, in seat order
+'''
+def dealsToHands(seats):
+    seats = np.asarray(seats)
+    if seats.ndim != 2 or seats.shape[1] != NUM_CARDS_IN_DECK:
+        raise ValueError("deal batch must have shape (N, 52), not %s" % (seats.shape,))
+    hands = seats[:, np.newaxis, :] == np.arange(NUM_HANDS_IN_DEAL, dtype=seats.dtype)[np.newaxis, :, np.newaxis]
+    return hands.reshape(-1, NUM_CARDS_IN_DECK)
+
+
+# Build a hand batch from a list of BridgeHand objects
+def bridgeHandsToArray(bridgeHands):
+    bits = np.array([hand.getHandBits().bits for hand in bridgeHands], dtype=np.uint64)
+    shifts = np.arange(NUM_CARDS_IN_DECK, dtype=np.uint64)
+    return ((bits[:, np.newaxis] >> shifts) & np.uint64(1)).astype(bool)
@@ -0,0 +1,134 @@
+'''
+Hand Bits Class
+
+A compact representation of a set of cards as a single 52 bit integer.
+Each suit owns a 13 bit mask: clubs are bits 0-12, diamonds 13-25,
+hearts 26-38 and spades 39-51. Within a suit, bit 0 is the Two and
+bit 12 is the Ace.
+Suit lengths, high card points and honor categories are answered from
+tables indexed by the 13 bit suit mask, so every query is O(1).
+'''
+
+from enums import Suit, Level, DistMethod, SuitCategory
+
+NUM_CARDS_IN_SUIT = 13
+SUIT_MASK = (1 << NUM_CARDS_IN_SUIT) - 1
+BRIDGE_SUITS = [Suit.SPADE, Suit.HEART, Suit.DIAMOND, Suit.CLUB]
+# No cards are ever held above bit 51, so NOTRUMP and ALL read as empty suits
+SUIT_SHIFT = {Suit.SPADE: 39, Suit.HEART: 26, Suit.DIAMOND: 13, Suit.CLUB: 0, Suit.NOTRUMP: 52, Suit.ALL: 52}
+
+ACE_BIT = 1 << (Level.Ace_HIGH.value - 2)
+KING_BIT = 1 << (Level.King.value - 2)
+QUEEN_BIT = 1 << (Level.Queen.value - 2)
+JACK_BIT = 1 << (Level.Jack.value - 2)
+
+
+# Return the bit index (0 to 51) of a card
+def getCardIndex(suit, level):
+    return SUIT_SHIFT[suit] + level.value - 2
+
+
+# Return the suit and level of a bit index
+def getCardFromIndex(index):
+    for suit in BRIDGE_SUITS:
+        if index >= SUIT_SHIFT[suit]:
+            return (suit, Level(index - SUIT_SHIFT[suit] + 2))
+
+
+def getSuitCategory(mask):
+    hasAce = mask & ACE_BIT
+    hasKing = mask & KING_BIT
+    hasQueen = mask & QUEEN_BIT
+    if hasAce:
+        if hasKing:
+            return SuitCategory.AKQ if hasQueen else SuitCategory.AKx
+        else:
+            return SuitCategory.AxQ if hasQueen else SuitCategory.Axx
+    else:
+        if hasKing:
+            return SuitCategory.xKQ if hasQueen else SuitCategory.xKx
+        else:
+            return SuitCategory.xxQ if hasQueen else SuitCategory.xxx
+
+
+# Lookup tables indexed by a 13 bit suit mask
+SUIT_LENGTH = []
+SUIT_HCP = []
+SUIT_HIGH_CARDS = []
+SUIT_CATEGORY = []
+for suitMask in range(1 << NUM_CARDS_IN_SUIT):
+    SUIT_LENGTH.append(bin(suitMask).count('1'))
+    SUIT_HCP.append(4 * bool(suitMask & ACE_BIT) + 3 * bool(suitMask & KING_BIT) +
+                    2 * bool(suitMask & QUEEN_BIT) + bool(suitMask & JACK_BIT))
+    SUIT_HIGH_CARDS.append(bool(suitMask & ACE_BIT) + bool(suitMask & KING_BIT) +
+                           bool(suitMask & QUEEN_BIT) + bool(suitMask & JACK_BIT))
+    SUIT_CATEGORY.append(getSuitCategory(suitMask))
+
+
+class HandBits:
+
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    @staticmethod
+    def fromCards(cards):
+        bits = 0
+        for card in cards:
+            bits |= 1 << (SUIT_SHIFT[card.suit] + card.level.value - 2)
+        return HandBits(bits)
+
+    def addCard(self, suit, level):
+        self.bits |= 1 << getCardIndex(suit, level)
+
+    def removeCard(self, suit, level):
+        self.bits &= ~(1 << getCardIndex(suit, level))
+
+    def hasCard(self, suit, level):
+        return (self.bits >> getCardIndex(suit, level)) & 1 == 1
+
+    def getSuitMask(self, suit):
+        return (self.bits >> SUIT_SHIFT[suit]) & SUIT_MASK
+
+    def getNumCards(self):
+        return bin(self.bits).count('1')
+
+    def getNumCardsInSuit(self, suit):
+        return SUIT_LENGTH[(self.bits >> SUIT_SHIFT[suit]) & SUIT_MASK]
+
+    # Return the lengths of the spade, heart, diamond and club suits
+    def getSuitLengths(self):
+        bits = self.bits
+        return (SUIT_LENGTH[(bits >> 39) & SUIT_MASK], SUIT_LENGTH[(bits >> 26) & SUIT_MASK],
+                SUIT_LENGTH[(bits >> 13) & SUIT_MASK], SUIT_LENGTH[bits & SUIT_MASK])
+
+    def getHighCardPoints(self):
+        bits = self.bits
+        return SUIT_HCP[(bits >> 39) & SUIT_MASK] + SUIT_HCP[(bits >> 26) & SUIT_MASK] + \
+               SUIT_HCP[(bits >> 13) & SUIT_MASK] + SUIT_HCP[bits & SUIT_MASK]
+
+    # Count the cards of a given level across all four suits
+    def getCountOfLevel(self, level):
+        bit = level.value - 2
+        if bit < 0 or bit >= NUM_CARDS_IN_SUIT:
+            return 0
+        levelBits = (1 << bit) | (1 << (bit + 13)) | (1 << (bit + 26)) | (1 << (bit + 39))
+        return bin(self.bits & levelBits).count('1')
+
+    # Returns high card and distribution points
+    def evalHand(self, distMethod):
+        distPoints = 0
+        for numCardsInSuit in self.getSuitLengths():
+            if distMethod == DistMethod.HCP_LONG:
+                if numCardsInSuit > 4:
+                    distPoints += numCardsInSuit - 4
+            elif distMethod == DistMethod.HCP_SHORT:
+                if numCardsInSuit < 3:
+                    distPoints += 3 - numCardsInSuit
+        return (self.getHighCardPoints(), distPoints)
+
+    # Ace, King, Queen, and Jack are considered high cards
+    def evalSuitCategory(self, suit):
+        mask = (self.bits >> SUIT_SHIFT[suit]) & SUIT_MASK
+        return (SUIT_CATEGORY[mask], SUIT_LENGTH[mask], SUIT_HIGH_CARDS[mask])
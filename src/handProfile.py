@@ -0,0 +1,109 @@
+'''
+Hand Profile Class
+
+A snapshot of everything the bidding code wants to know about a hand.
+The profile is computed once from the HandBits of a hand, and the hand
+throws it away whenever a card is added or removed. A hand does not
+change during an auction, so each profile is normally built once per deal.
+'''
+
+from enums import Suit, Level, DistMethod, SuitCategory
+from handBits import BRIDGE_SUITS
+
+# Shift of the Jack bit in a suit mask
+HONOR_SHIFT = Level.Jack.value - 2
+
+
+class HandProfile:
+
+    def __init__(self, handBits):
+        self.handBits = handBits
+
+        # Suit lengths in spade, heart, diamond, club order
+        self.suitLengths = handBits.getSuitLengths()
+        self.highCardPoints = handBits.getHighCardPoints()
+        self.longDistPoints = 0
+        self.shortDistPoints = 0
+        for numCardsInSuit in self.suitLengths:
+            if numCardsInSuit > 4:
+                self.longDistPoints += numCardsInSuit - 4
+            if numCardsInSuit < 3:
+                self.shortDistPoints += 3 - numCardsInSuit
+
+        # Dictionary of suit to (category, numCardsInSuit, highCardCount)
+        self.suitCategories = {}
+        for suit in Suit:
+            self.suitCategories[suit] = handBits.evalSuitCategory(suit)
+
+        self.numAces = handBits.getCountOfLevel(Level.Ace_HIGH)
+        self.numKings = handBits.getCountOfLevel(Level.King)
+        self.balanced = self.computeBalanced()
+        self.stoppers = self.computeStoppers()
+        self.longestSuit = self.computeLongestSuit()
+        self.twoLongestSuits = self.computeTwoLongestSuits()
+
+        # The length and the A, K, Q, J held in each suit. Hands with the
+        # same signature look the same to the bidding code.
+        self.signature = tuple((self.suitCategories[suit][1], handBits.getSuitMask(suit) >> HONOR_SHIFT)
+                               for suit in BRIDGE_SUITS)
+
+    def getNumCardsInSuit(self, suit):
+        return self.suitCategories[suit][1]
+
+    def getDistPoints(self, distMethod):
+        if distMethod == DistMethod.HCP_LONG:
+            return self.longDistPoints
+        elif distMethod == DistMethod.HCP_SHORT:
+            return self.shortDistPoints
+        return 0
+
+    def computeBalanced(self):
+        numDoubletons = 0
+        for numCardsInSuit in self.suitLengths:
+            if numCardsInSuit < 2:
+                return False
+            if numCardsInSuit == 2:
+                numDoubletons += 1
+                if numDoubletons == 2:
+                    return False
+        return True
+
+    # True if all 4 suits have stoppers
+    def computeStoppers(self):
+        for suit in BRIDGE_SUITS:
+            (category, numCardsInSuit, highCardCount) = self.suitCategories[suit]
+            if category == SuitCategory.xxx:
+                return False
+            elif category == SuitCategory.xxQ:
+                if numCardsInSuit < 3:
+                    return False
+            elif category == SuitCategory.xKx:
+                if numCardsInSuit < 2:
+                    return False
+            elif category == SuitCategory.Axx:
+                if numCardsInSuit < 2:
+                    return False
+            # All other categories have stoppers
+        return True
+
+    # Will return the higher of two tied suits
+    def computeLongestSuit(self):
+        maxVal = 0
+        maxSuit = Suit.ALL
+        for index, suit in enumerate(BRIDGE_SUITS):
+            if self.suitLengths[index] > maxVal:
+                maxVal = self.suitLengths[index]
+                maxSuit = suit
+        return (maxVal, maxSuit)
+
+    def computeTwoLongestSuits(self):
+        (maxVal1, maxSuit1) = self.longestSuit
+        maxVal2 = 0
+        maxSuit2 = Suit.ALL
+        for index, suit in enumerate(BRIDGE_SUITS):
+            if suit == maxSuit1:
+                continue
+            if self.suitLengths[index] > maxVal2:
+                maxVal2 = self.suitLengths[index]
+                maxSuit2 = suit
+        return (maxSuit1, maxVal1, maxSuit2, maxVal2)
@@ -1,22 +1,103 @@
 '''
 Logging Class
 
-This class will be imported by all files and give them access to a 
+This class will be imported by all files and give them access to a
 logging facility.
+
+Each log record has a level, and records below the level of the log
+are dropped. There is a flag per level, so that code on a hot path can
+skip a disabled record at the cost of one attribute check:
+    if Log.debugOn:
+        Log.debug("bid %s by %s\n", bidStr, pos.name)
+A record is formatted when it is written to the file, not when it is
+logged, so the arguments must not be changed after the call.
+
+Records are kept in memory and written to the file in batches. With a
+batch size of 0 the log is a ring buffer instead: only the last
+bufferSize records are kept, and they are written out when an error is
+logged or the log is flushed.
 '''
 import os
+from collections import deque
+
+# Log levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 50
+LOG_LEVELS = {"DEBUG": DEBUG, "INFO": INFO, "WARNING": WARNING, "ERROR": ERROR, "OFF": OFF}
+
+DEFAULT_BUFFER_SIZE = 100000
+DEFAULT_BATCH_SIZE = 1000
 
 class Log():
     log_fp = None
+    level = DEBUG
+    debugOn = True
+    infoOn = True
+    warningOn = True
+    errorOn = True
+    # Records waiting to be written, as (formatStr, args) tuples.
+    # args is None for text which is already formatted.
+    records = deque(maxlen=DEFAULT_BUFFER_SIZE)
+    batchSize = DEFAULT_BATCH_SIZE
+
+    @classmethod
+    def open(cls, path="../logs/info.log", level=None, bufferSize=DEFAULT_BUFFER_SIZE, batchSize=DEFAULT_BATCH_SIZE):
+        cls.log_fp = open(path, 'w')
+        cls.records = deque(maxlen=bufferSize)
+        cls.batchSize = batchSize
+        if level is not None:
+            cls.setLevel(level)
 
+    # Level is a level number or name, e.g. DEBUG or "DEBUG"
     @classmethod
-    def open(cls):
-        cls.log_fp = open("../logs/info.log", 'w')
-        
+    def setLevel(cls, level):
+        if isinstance(level, str):
+            level = LOG_LEVELS[level.upper()]
+        cls.level = level
+        cls.debugOn = level <= DEBUG
+        cls.infoOn = level <= INFO
+        cls.warningOn = level <= WARNING
+        cls.errorOn = level <= ERROR
+
+    @classmethod
+    def debug(cls, formatStr, *args):
+        if cls.debugOn:
+            cls.addRecord(formatStr, args)
+
+    @classmethod
+    def info(cls, formatStr, *args):
+        if cls.infoOn:
+            cls.addRecord(formatStr, args)
+
+    @classmethod
+    def warning(cls, formatStr, *args):
+        if cls.warningOn:
+            cls.addRecord(formatStr, args)
+
+    # An error also writes out the records which led up to it
+    @classmethod
+    def error(cls, formatStr, *args):
+        if cls.errorOn:
+            cls.addRecord(formatStr, args)
+            cls.flush()
+
+    # Log text which is already formatted, at the INFO level.
+    # This also lets the log stand in for sys.stdout.
     @classmethod
     def write(cls, formatStr):
-        cls.log_fp.write(formatStr)
-        
+        if cls.infoOn:
+            cls.addRecord(formatStr, None)
+
+    @classmethod
+    def addRecord(cls, formatStr, args):
+        records = cls.records
+        records.append((formatStr, args))
+        if cls.batchSize and len(records) >= cls.batchSize:
+            cls.flush()
+
     @classmethod
     def rotate(cls):
         # Delete the previously saved log file
@@ -24,12 +105,28 @@ class Log():
         # Rename the logging file
         os.rename("../logs/info.log", "../logs/save.log")
 
+    # Write out the records held in memory
     @classmethod
     def flush(cls):
+        if cls.log_fp is None or cls.log_fp.closed:
+            return
+        # Take the records off the front, so the bid scheduler's thread
+        # can keep adding records while they are written
+        records = cls.records
+        lines = []
+        for index in range(0, len(records)):
+            (formatStr, args) = records.popleft()
+            if args:
+                try:
+                    lines.append(formatStr % args)
+                except (TypeError, ValueError):
+                    lines.append("Log: cannot format %r with %r\n" % (formatStr, args))
+            else:
+                lines.append(formatStr)
+        cls.log_fp.write(''.join(lines))
         cls.log_fp.flush()
 
     @classmethod
     def close(cls):
+        cls.flush()
         cls.log_fp.close()
-
-              
@@ -5,6 +5,12 @@ from typing import Callable, Dict
 class MethodRegistry:
     jump_table: Dict[str, Callable] = {}
 
+    # Give every registry its own jump table, so the handlers of one
+    # registry never appear in another
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.jump_table = {}
+
     @classmethod
     def register(cls, command: str) -> Callable:
 
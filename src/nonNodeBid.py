@@ -5,7 +5,7 @@ from bidNotif import BidNotif
 
 # This function determines the bid for responding to a Blackwood request
 def blackwoodReqHandler(player):
-    Log.write("nonNodeBid: processing blackwood req by %s\n" % player.pos.name)
+    Log.debug("nonNodeBid: processing blackwood req by %s\n", player.pos.name)
     ts = player.teamState
     
     # What did my partner bid?
@@ -42,7 +42,7 @@ def blackwoodReqHandler(player):
 
 # This function determines the bid for responding to a Gerber request
 def gerberReqHandler(player):
-    Log.write("nonNodeBid: processing Gerber req by %s\n" % player.pos.name)
+    Log.debug("nonNodeBid: processing Gerber req by %s\n", player.pos.name)
     ts = player.teamState
     
     # What did my partner bid?
@@ -79,7 +79,7 @@ def gerberReqHandler(player):
 
 
 def nonNodeBidHandler(table, player):
-    Log.write("nonNodeBid by %s\n" % player.pos.name)
+    Log.debug("nonNodeBid by %s\n", player.pos.name)
     ts = player.teamState
     
     # Does the team state show an active convention?
@@ -135,7 +135,7 @@ def nonNodeBidHandler(table, player):
 
 
 def captainBidHandler(table, player):
-    Log.write("captainBidHandler by %s\n" % player.pos.name)
+    Log.debug("captainBidHandler by %s\n", player.pos.name)
     ts = player.teamState
     
     # What did the describer bid
@@ -151,8 +151,8 @@ def captainBidHandler(table, player):
         (minLevel, minGameState) = getBidLevelAndState(ts.teamMinPoints, ts.fitSuit)
         (maxLevel, maxGameState) = getBidLevelAndState(ts.teamMaxPoints, ts.fitSuit)
 
-        Log.write("capt cur: Min level=%d state=%s\n" % (minLevel, minGameState.name))
-        Log.write("capt cur: Max level=%d state=%s\n" % (maxLevel, maxGameState.name))
+        Log.debug("capt cur: Min level=%d state=%s\n", minLevel, minGameState.name)
+        Log.debug("capt cur: Max level=%d state=%s\n", maxLevel, maxGameState.name)
 
         lastTeamBid = findLargestTeamBid(player)
         bidGameState = getGameStateOfBid(lastTeamBid)
@@ -166,19 +166,19 @@ def captainBidHandler(table, player):
         if teamNumAces == 4:
             # Explore large slam by asking for kings
             if ts.fitSuit == Suit.NOTRUMP:
-                Log.write("nonNodeBid: gerber req for Kings by %s\n" % player.pos.name)
+                Log.debug("nonNodeBid: gerber req for Kings by %s\n", player.pos.name)
                 bidNotif = BidNotif(player, 5, Suit.CLUB, Conv.GERBER_REQ, Force.ONE_ROUND)
             else:
-                Log.write("nonNodeBid: blackwood req for Kings by %s\n" % player.pos.name)
+                Log.debug("nonNodeBid: blackwood req for Kings by %s\n", player.pos.name)
                 bidNotif = BidNotif(player, 6, Suit.NOTRUMP, Conv.BLACKWOOD_REQ, Force.ONE_ROUND)
             return bidNotif
         elif ts.partnerNumAces == -1:
             # Ask partner for number of aces
             if ts.fitSuit == Suit.NOTRUMP:
-                Log.write("nonNodeBid: gerber req for Aces by %s\n" % player.pos.name)
+                Log.debug("nonNodeBid: gerber req for Aces by %s\n", player.pos.name)
                 bidNotif = BidNotif(player, 4, Suit.CLUB, Conv.GERBER_REQ, Force.ONE_ROUND)
             else:
-                Log.write("nonNodeBid: blackwood req for Aces by %s\n" % player.pos.name)
+                Log.debug("nonNodeBid: blackwood req for Aces by %s\n", player.pos.name)
                 bidNotif = BidNotif(player, 4, Suit.NOTRUMP, Conv.BLACKWOOD_REQ, Force.ONE_ROUND)
             return bidNotif
     
@@ -187,14 +187,14 @@ def captainBidHandler(table, player):
     proposedBidLevel = proposedBid[0]
     proposedBidSuit = proposedBid[1]
     bidStr = getBidStr(proposedBidLevel, proposedBidSuit)
-    Log.write("capt: proposes bid %s\n" % bidStr)
+    Log.debug("capt: proposes bid %s\n", bidStr)
     
     # Get the recommended bid levels for the team's point range
     (minLevel, minGameState) = getBidLevelAndState(ts.teamMinPoints, proposedBidSuit)
     (maxLevel, maxGameState) = getBidLevelAndState(ts.teamMaxPoints, proposedBidSuit)
 
-    Log.write("capt proposed: Min level=%d state=%s\n" % (minLevel, minGameState.name))
-    Log.write("capt proposed: Max level=%d state=%s\n" % (maxLevel, maxGameState.name))
+    Log.debug("capt proposed: Min level=%d state=%s\n", minLevel, minGameState.name)
+    Log.debug("capt proposed: Max level=%d state=%s\n", maxLevel, maxGameState.name)
 
     bidGameState = getGameStateOfBid(proposedBid)
     if bidGameState.value < minGameState.value:
@@ -219,7 +219,7 @@ def captainBidHandler(table, player):
         force = Force.PASS
     elif bidGameState.value == minGameState.value and maxGameState.value > minGameState.value:
         force = Force.NONE
-    Log.write("capt: force=%s\n" % (force.name))
+    Log.debug("capt: force=%s\n", force.name)
 
     # Now determine where the proposedBidLevel lies wrt the min and maxLevel
     # With a strong hand, we will want to jump a level if we know our fit suit
@@ -236,7 +236,7 @@ def captainBidHandler(table, player):
     elif proposedBidLevel > maxLevel:
         actualBidLevel = 0
 
-    Log.write("capt: proposed level=%d actual level=%d force=%s\n" % (proposedBidLevel, actualBidLevel, force.name))
+    Log.debug("capt: proposed level=%d actual level=%d force=%s\n", proposedBidLevel, actualBidLevel, force.name)
     
     # Build the notification for a natural bid
     ts.convention = Conv.NATURAL
@@ -246,7 +246,7 @@ def captainBidHandler(table, player):
     return bidNotif
 
 def describerBidHandler(table, player):
-    Log.write("describerBidHandler by %s\n" % player.pos.name)
+    Log.debug("describerBidHandler by %s\n", player.pos.name)
     ts = player.teamState
     lastTeamBid = findLargestTeamBid(player)
     bidGameState = getGameStateOfBid(lastTeamBid)
@@ -315,7 +315,7 @@ def getProposedBid(table, ts, player):
     proposedBidLevel = getNextLowestBid(table, proposedBidSuit)
 
     bidStr = getBidStr(proposedBidLevel, proposedBidSuit)
-    Log.write("desc: proposed bid is %s\n" % bidStr)
+    Log.debug("desc: proposed bid is %s\n", bidStr)
     return (proposedBidLevel, proposedBidSuit)
 
 # This function is used to generate a suit which has not previously been bid
@@ -340,5 +340,5 @@ def getAlternateBid(table, teamState):
             return (alternateBidLevel, alternateBidSuit)
         
     bidStr = getBidStr(alternateBidLevel, alternateBidSuit)
-    Log.write("desc: alternate bid is %s" % bidStr)
+    Log.debug("desc: alternate bid is %s\n", bidStr)
     return (alternateBidLevel, alternateBidSuit)
@@ -21,9 +21,16 @@ class OpenerRegistry:
         self.jump_table = OpenerRegistry.OpenerFunctions.get_bound_jump_table(self)
 
     # Define functions
-    @OpenerFunctions.register(command="open")    
+    # The opening bid is looked up in a table built by running calcOpenBid
+    # for every kind of hand. The table module is imported here because
+    # it imports this one.
+    @OpenerFunctions.register(command="open")
+    def lookupOpenBid(self, table, player):
+        from openBidTable import lookupOpenBid
+        return lookupOpenBid(self, table, player)
+
     def calcOpenBid(self, table, player):
-        Log.write("calcOpenBid: %s\n" % player.pos.name)
+        Log.debug("calcOpenBid: %s\n", player.pos.name)
         hand = player.hand
         ts = player.teamState
         (hcPts, lenPts) = hand.evalHand(DistMethod.HCP_LONG)
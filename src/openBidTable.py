@@ -0,0 +1,465 @@
+'''
+Opening Bid Table
+
+A precomputed table of the opening bids made by calcOpenBid, so the
+opening bid of a hand is a single table lookup.
+
+calcOpenBid reads only a few facts about the hand:
+ - the suit lengths (the shape), which also give the length points,
+   the longest suits and whether the hand is balanced
+ - the high card points
+ - for each suit, whether it has 2 or more of the top 4 honors, and
+   whether its top 3 honors make 2 quick tricks (AK, AQ or KQ). A major
+   with the Ace and 2 or more honors also counts as a good suit.
+ - whether every suit has a stopper
+These facts index a dense table: 560 shapes x 38 point counts x 81
+combinations of suit classes x 2 stopper states. The table is built by
+running calcOpenBid itself once for every cell, on a stand-in hand with
+just those facts. Each cell holds the number of a decision: the bid, its
+convention, the point range stored in the team state and whether the
+player becomes the opener. Decision 0 means the handler must be run,
+which is used for any cell where calcOpenBid raises.
+
+The table is cached in a file next to this module, with the sha256 of
+every module its contents depend on (OPEN_BID_TABLE_SOURCES), and is
+rebuilt when any of them changes. If calcOpenBid starts reading another
+fact about the hand, getOpenBidIndex must be taught it, and a module
+calcOpenBid starts calling must be added to the sources.
+verifyOpenBidTable checks the table against calcOpenBid on the hands
+of random deals. checkOpenBidTable loads or builds the table and runs a
+short check of this kind. It is called when a program, AuctionEngine or
+TableScheduler starts, never in the middle of an auction. Until a table
+has been checked, and after a check finds a mismatch, lookupOpenBid
+runs calcOpenBid.
+'''
+
+import os
+import sys
+import pickle
+import random
+import hashlib
+import argparse
+from array import array
+
+from infoLog import Log, OFF
+from enums import Suit, Level, SuitCategory, PlayerRole, TablePosition, Conv, Force
+from handBits import BRIDGE_SUITS, SUIT_SHIFT, SUIT_CATEGORY, SUIT_HIGH_CARDS
+from handProfile import HandProfile
+from bridgeHand import BridgeHand
+from teamState import TeamState
+from bidNotif import BidNotif
+import bidUtils
+import handBits
+import handProfile
+import openBid
+
+OPEN_BID_TABLE_VERSION = 1
+OPEN_BID_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openBid.table.pickle")
+
+NUM_CARDS_IN_HAND = 13
+MAX_HCP = 37
+NUM_HCP = MAX_HCP + 1
+NUM_SUIT_CLASSES = 3
+NUM_CLASS_COMBOS = NUM_SUIT_CLASSES ** 4
+NUM_STOPPER_STATES = 2
+
+# Suit classes
+WEAK_SUIT = 0   # fewer than 2 of the top 4 honors
+HONOR_SUIT = 1  # 2 or more of the top 4 honors
+GOOD_SUIT = 2   # 2 quick tricks, or a major with the Ace and 2 honors
+
+QUICK_TRICK_CATEGORIES = (SuitCategory.AKQ, SuitCategory.AKx, SuitCategory.AxQ, SuitCategory.xKQ)
+MAJOR_SUITS = (Suit.SPADE, Suit.HEART)
+
+# Every shape in spade, heart, diamond, club order
+SHAPES = []
+for numSpades in range(0, NUM_CARDS_IN_HAND + 1):
+    for numHearts in range(0, NUM_CARDS_IN_HAND + 1 - numSpades):
+        for numDiamonds in range(0, NUM_CARDS_IN_HAND + 1 - numSpades - numHearts):
+            SHAPES.append((numSpades, numHearts, numDiamonds, NUM_CARDS_IN_HAND - numSpades - numHearts - numDiamonds))
+SHAPE_INDEXES = {shape: index for index, shape in enumerate(SHAPES)}
+
+# Suit category and high card count standing in for each suit class
+MAJOR_CLASS_SUITS = [(SuitCategory.xxx, 0), (SuitCategory.xKx, 2), (SuitCategory.Axx, 2)]
+MINOR_CLASS_SUITS = [(SuitCategory.xxx, 0), (SuitCategory.Axx, 2), (SuitCategory.AKQ, 3)]
+
+# Number of random deals checked by checkOpenBidTable
+OPEN_BID_CHECK_DEALS = 250
+
+# The cached table
+openBidTable = None
+
+
+def getSuitClass(suit, category, highCardCount):
+    if highCardCount < 2:
+        return WEAK_SUIT
+    if category in QUICK_TRICK_CATEGORIES:
+        return GOOD_SUIT
+    if category == SuitCategory.Axx and suit in MAJOR_SUITS:
+        return GOOD_SUIT
+    return HONOR_SUIT
+
+
+def makeTableIndex(shapeIndex, hcp, classCombo, stoppers):
+    return ((shapeIndex * NUM_HCP + hcp) * NUM_CLASS_COMBOS + classCombo) * NUM_STOPPER_STATES + stoppers
+
+
+# Suit class of the top 4 honors of a suit, indexed by the A, K, Q, J bits
+HONOR_SHIFT = Level.Jack.value - 2
+MAJOR_HONOR_CLASSES = []
+MINOR_HONOR_CLASSES = []
+for honorMask in range(0, 16):
+    suitMask = honorMask << HONOR_SHIFT
+    MAJOR_HONOR_CLASSES.append(getSuitClass(Suit.SPADE, SUIT_CATEGORY[suitMask], SUIT_HIGH_CARDS[suitMask]))
+    MINOR_HONOR_CLASSES.append(getSuitClass(Suit.CLUB, SUIT_CATEGORY[suitMask], SUIT_HIGH_CARDS[suitMask]))
+SPADE_HONOR_SHIFT = SUIT_SHIFT[Suit.SPADE] + HONOR_SHIFT
+HEART_HONOR_SHIFT = SUIT_SHIFT[Suit.HEART] + HONOR_SHIFT
+DIAMOND_HONOR_SHIFT = SUIT_SHIFT[Suit.DIAMOND] + HONOR_SHIFT
+CLUB_HONOR_SHIFT = SUIT_SHIFT[Suit.CLUB] + HONOR_SHIFT
+
+
+# Table index of the hand described by a HandProfile
+def getOpenBidIndex(profile):
+    bits = profile.handBits.bits
+    classCombo = MAJOR_HONOR_CLASSES[(bits >> SPADE_HONOR_SHIFT) & 15] * 27 + \
+                 MAJOR_HONOR_CLASSES[(bits >> HEART_HONOR_SHIFT) & 15] * 9 + \
+                 MINOR_HONOR_CLASSES[(bits >> DIAMOND_HONOR_SHIFT) & 15] * 3 + \
+                 MINOR_HONOR_CLASSES[(bits >> CLUB_HONOR_SHIFT) & 15]
+    return makeTableIndex(SHAPE_INDEXES[profile.suitLengths], profile.highCardPoints, classCombo, int(profile.stoppers))
+
+
+class StandInProfile(HandProfile):
+    '''
+    A profile holding just the facts calcOpenBid reads, for one shape.
+    It notes whether the handler asked about stoppers, so the cells
+    which differ only in stoppers can share one run of the handler.
+    '''
+
+    def __init__(self, shape):
+        self.handBits = None
+        self.suitLengths = shape
+        self.highCardPoints = 0
+        self.longDistPoints = sum(numCards - 4 for numCards in shape if numCards > 4)
+        self.shortDistPoints = sum(3 - numCards for numCards in shape if numCards < 3)
+        self.numAces = 0
+        self.numKings = 0
+        self.signature = None
+        # Dictionary of suit to (category, numCardsInSuit, highCardCount) for each class combination
+        self.comboCategories = []
+        for classCombo in range(0, NUM_CLASS_COMBOS):
+            self.comboCategories.append(self.makeSuitCategories(classCombo))
+        self.suitCategories = self.comboCategories[0]
+        self.balanced = self.computeBalanced()
+        self.longestSuit = self.computeLongestSuit()
+        self.twoLongestSuits = self.computeTwoLongestSuits()
+        self.hasStoppers = False
+        self.isStoppersRead = False
+
+    def makeSuitCategories(self, classCombo):
+        suitCategories = {Suit.NOTRUMP: (SuitCategory.xxx, 0, 0), Suit.ALL: (SuitCategory.xxx, 0, 0)}
+        for index in range(3, -1, -1):
+            suit = BRIDGE_SUITS[index]
+            suitClass = classCombo % NUM_SUIT_CLASSES
+            classCombo //= NUM_SUIT_CLASSES
+            if suit in MAJOR_SUITS:
+                (category, highCardCount) = MAJOR_CLASS_SUITS[suitClass]
+            else:
+                (category, highCardCount) = MINOR_CLASS_SUITS[suitClass]
+            suitCategories[suit] = (category, self.suitLengths[index], highCardCount)
+        return suitCategories
+
+    def setCell(self, hcp, classCombo, stoppers):
+        self.highCardPoints = hcp
+        self.suitCategories = self.comboCategories[classCombo]
+        self.hasStoppers = bool(stoppers)
+        self.isStoppersRead = False
+
+    @property
+    def stoppers(self):
+        self.isStoppersRead = True
+        return self.hasStoppers
+
+
+class StandInTable:
+    '''
+    A table with no bids, as seen by the first bidder
+    '''
+
+    def __init__(self):
+        self.bidsList = []
+        self.roundNum = 1
+        self.hasOpener = False
+
+
+class StandInPlayer:
+    '''
+    A player holding a stand-in hand, for running calcOpenBid
+    '''
+
+    def __init__(self):
+        self.pos = TablePosition.NORTH
+        self.table = StandInTable()
+        self.hand = BridgeHand(TablePosition.NORTH)
+        self.teamState = TeamState()
+        self.playerRole = PlayerRole.UNKNOWN
+
+
+# Set the team state and role a player has before its opening bid
+def resetOpener(player):
+    # Points left at -1 were not set by the handler
+    teamState = player.teamState
+    teamState.myMinPoints = -1
+    teamState.myMaxPoints = -1
+    teamState.convention = Conv.NATURAL
+    teamState.force = Force.NONE
+    player.playerRole = PlayerRole.UNKNOWN
+
+
+# Return the decision of an opening bid handler, as stored in the table
+def getDecision(player, bidNotif):
+    return (bidNotif.bid[0], bidNotif.bid[1], bidNotif.convention,
+            player.teamState.myMinPoints, player.teamState.myMaxPoints,
+            player.playerRole == PlayerRole.OPENER)
+
+
+# Run calcOpenBid on a stand-in hand and return its decision
+def runOpenBid(registry, player, profile):
+    player.hand.profile = profile
+    resetOpener(player)
+    try:
+        bidNotif = registry.calcOpenBid(player.table, player)
+    except Exception:
+        return None
+    return getDecision(player, bidNotif)
+
+
+# The modules whose code decides the contents of the table
+OPEN_BID_TABLE_SOURCES = [openBid, bidUtils, handProfile, handBits, sys.modules[__name__]]
+
+def getOpenBidSourceHash():
+    sha = hashlib.sha256()
+    for module in OPEN_BID_TABLE_SOURCES:
+        fh = open(module.__file__, 'rb')
+        sha.update(fh.read())
+        fh.close()
+    return sha.hexdigest()
+
+
+class OpenBidTable:
+
+    def __init__(self):
+        self.sourceHash = None
+        # Decision 0 means run calcOpenBid
+        self.decisions = [None]
+        self.cells = None
+        # Cleared when the table is found to disagree with calcOpenBid
+        self.isEnabled = True
+        # Set by checkOpenBidTable. lookupOpenBid only uses a checked table.
+        self.isChecked = False
+        self.numMismatches = 0
+
+    # Run calcOpenBid for every cell of the table
+    def build(self):
+        self.sourceHash = getOpenBidSourceHash()
+        self.decisions = [None]
+        decisionNums = {}
+        self.cells = array('B', bytes(len(SHAPES) * NUM_HCP * NUM_CLASS_COMBOS * NUM_STOPPER_STATES))
+        registry = openBid.OpenerRegistry()
+        player = StandInPlayer()
+        # The handler logs every call, so keep it out of the info log
+        saveLogLevel = Log.level
+        Log.setLevel(OFF)
+        try:
+            for shapeIndex, shape in enumerate(SHAPES):
+                profile = StandInProfile(shape)
+                for hcp in range(0, NUM_HCP):
+                    for classCombo in range(0, NUM_CLASS_COMBOS):
+                        for stoppers in range(0, NUM_STOPPER_STATES):
+                            index = makeTableIndex(shapeIndex, hcp, classCombo, stoppers)
+                            if stoppers > 0 and not profile.isStoppersRead:
+                                self.cells[index] = self.cells[index - 1]
+                                continue
+                            profile.setCell(hcp, classCombo, stoppers)
+                            decision = runOpenBid(registry, player, profile)
+                            if decision is None:
+                                continue
+                            if decision not in decisionNums:
+                                decisionNums[decision] = len(self.decisions)
+                                self.decisions.append(decision)
+                            self.cells[index] = decisionNums[decision]
+        finally:
+            Log.setLevel(saveLogLevel)
+        if len(self.decisions) > 255:
+            raise ValueError("calcOpenBid makes %d decisions, the table holds 255" % len(self.decisions))
+
+    def load(self, path):
+        fh = open(path, 'rb')
+        artifact = pickle.loads(fh.read())
+        fh.close()
+        if artifact["version"] != OPEN_BID_TABLE_VERSION:
+            return False
+        self.sourceHash = artifact["sourceHash"]
+        self.decisions = artifact["decisions"]
+        self.cells = artifact["cells"]
+        return True
+
+    def save(self, path):
+        artifact = {"version": OPEN_BID_TABLE_VERSION,
+                    "sourceHash": self.sourceHash,
+                    "decisions": self.decisions,
+                    "cells": self.cells}
+        # Worker processes may race to save the table, so write a
+        # temporary file and move it into place
+        tmpPath = "%s.%d" % (path, os.getpid())
+        try:
+            fh = open(tmpPath, 'wb')
+            fh.write(pickle.dumps(artifact, pickle.HIGHEST_PROTOCOL))
+            fh.close()
+            os.replace(tmpPath, path)
+        except OSError as e:
+            print("OpenBidTable: could not save %s: %s" % (path, e))
+
+    # Decision for a hand, or None if calcOpenBid must be run
+    def lookup(self, profile):
+        if not self.isEnabled:
+            return None
+        return self.decisions[self.cells[getOpenBidIndex(profile)]]
+
+
+# Return the opening bid table, loading or building it on first use
+def getOpenBidTable(path=OPEN_BID_TABLE_PATH):
+    global openBidTable
+    if openBidTable is not None:
+        return openBidTable
+    table = OpenBidTable()
+    sourceHash = getOpenBidSourceHash()
+    isLoaded = False
+    if os.path.exists(path):
+        try:
+            isLoaded = table.load(path)
+        except Exception as e:
+            print("OpenBidTable: rebuilding unreadable table: %s" % e)
+    if not isLoaded or table.sourceHash != sourceHash:
+        print("OpenBidTable: building the opening bid table")
+        table.build()
+        table.save(path)
+    openBidTable = table
+    return openBidTable
+
+
+'''
+Make the opening bid of a player from the table, once the table has
+been checked by checkOpenBidTable, and with calcOpenBid until then.
+Same result as OpenerRegistry.calcOpenBid.
+'''
+def lookupOpenBid(registry, table, player):
+    bidTable = openBidTable
+    if bidTable is None or not bidTable.isChecked:
+        return registry.calcOpenBid(table, player)
+    return makeTableOpenBid(registry, table, player, bidTable)
+
+
+# Make the opening bid of a player from a given table
+def makeTableOpenBid(registry, table, player, bidTable):
+    decision = bidTable.lookup(player.hand.getProfile())
+    if decision is None:
+        return registry.calcOpenBid(table, player)
+    Log.debug("lookupOpenBid: %s\n", player.pos.name)
+    (bidLevel, bidSuit, convention, minPoints, maxPoints, isOpener) = decision
+    if minPoints >= 0:
+        player.teamState.myMinPoints = minPoints
+        player.teamState.myMaxPoints = maxPoints
+    if isOpener:
+        player.playerRole = PlayerRole.OPENER
+    return BidNotif(player, bidLevel, bidSuit, convention)
+
+
+# Run an opening bid handler for a player and return its decision, or
+# the name of the exception it raised
+def runOpenBidHandler(handler, player):
+    resetOpener(player)
+    try:
+        bidNotif = handler(player.table, player)
+    except Exception as e:
+        return type(e).__name__
+    return getDecision(player, bidNotif)
+
+
+'''
+Check lookupOpenBid against calcOpenBid on the hands of random deals.
+Returns the number of hands which got a different decision.
+'''
+def verifyOpenBidTable(numDeals, rng=None):
+    if rng is None:
+        rng = random.Random()
+    registry = openBid.OpenerRegistry()
+    bidTable = getOpenBidTable()
+    player = StandInPlayer()
+    seats = [seat for seat in range(0, 4) for card in range(0, NUM_CARDS_IN_HAND)]
+    numMismatches = 0
+
+    def tableOpenBid(table, player):
+        return makeTableOpenBid(registry, table, player, bidTable)
+
+    # Deal numbering lives above the bidding code, so import it here
+    from dealNumber import getHandsFromSeats
+    saveLogLevel = Log.level
+    Log.setLevel(OFF)
+    try:
+        for dealIdx in range(0, numDeals):
+            rng.shuffle(seats)
+            for hand in getHandsFromSeats(seats).values():
+                player.hand = hand
+                actual = runOpenBidHandler(tableOpenBid, player)
+                expected = runOpenBidHandler(registry.calcOpenBid, player)
+                if actual != expected:
+                    numMismatches += 1
+                    profile = hand.getProfile()
+                    print("verifyOpenBidTable: shape %s, %d HCP: lookupOpenBid %s, calcOpenBid %s" %
+                          (profile.suitLengths, profile.highCardPoints, actual, expected))
+    finally:
+        Log.setLevel(saveLogLevel)
+    return numMismatches
+
+
+'''
+Load or build the table and check it on a sample of random deals. If
+any hand gets a different opening bid from the table, the table is not
+used and every opening bid is made by calcOpenBid. The check is made
+once per process. Call this before starting worker processes, so they
+share the loaded and checked table.
+Returns:
+    the number of hands which got a different decision
+'''
+def checkOpenBidTable(numDeals=OPEN_BID_CHECK_DEALS):
+    table = getOpenBidTable()
+    if table.isChecked:
+        return table.numMismatches
+    table.numMismatches = verifyOpenBidTable(numDeals)
+    if table.numMismatches > 0:
+        print("OpenBidTable: %d of %d hands disagree with calcOpenBid, not using the table" %
+              (table.numMismatches, 4 * numDeals))
+        table.isEnabled = False
+    table.isChecked = True
+    return table.numMismatches
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Build and check the opening bid table')
+    parser.add_argument('-b', '--build', action='store_true', help='Rebuild the table even if it is up to date', required=False)
+    parser.add_argument('-v', '--verify', type=int, default=0, help='Number of random deals to check against calcOpenBid. Default=0', required=False)
+    parser.add_argument('-s', '--seed', type=int, help='Random seed. Default=unseeded', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    if args['build'] and os.path.exists(OPEN_BID_TABLE_PATH):
+        os.remove(OPEN_BID_TABLE_PATH)
+    table = getOpenBidTable()
+    print("Opening bid table: %d cells, %d decisions" % (len(table.cells), len(table.decisions) - 1))
+    if args['verify'] > 0:
+        numMismatches = verifyOpenBidTable(args['verify'], random.Random(args['seed']))
+        print("Checked %d deals, %d mismatches" % (args['verify'], numMismatches))
+        if numMismatches > 0:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -26,17 +26,18 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_undefined")
     def openRebid_undefined(self, table, player):
-        Log.write("openRebid_undefined by %s\n" % player.pos.name)
+        Log.debug("openRebid_undefined by %s\n", player.pos.name)
         print("openRebid found an undefined bidding sequence: {}".format(player.teamState.bidSeq))
         return (0, Suit.ALL)
 
     # FIX ME: dead code?
     @OpenerFunctions.register(command="openRebid")
     def openRebid(table, hand, bidsList):
-        Log.write("openRebid: bidsList={}\n".format(bidsList))
+        if Log.debugOn:
+            Log.debug("openRebid: bidsList=%s\n", list(bidsList))
         # Extract responding bid from partner
         (rspLevel, rspSuit) = bidsList[-2]
-        Log.write("responderBid: rspLevel=%d rspSuit=%s\n" % (rspLevel, rspSuit))
+        Log.debug("responderBid: rspLevel=%d rspSuit=%s\n", rspLevel, rspSuit)
         if rspLevel == 1:
             if rspSuit == Suit.CLUB or rspSuit == Suit.DIAMOND:
                 (bidLevel, bidSuit) = rsp1MinorRsp(table, hand, rspSuit)
@@ -69,7 +70,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_Pass_Pass")
     def openRebid_Pass_Pass(self, table, player):
-        Log.write("openRebid_Pass_Pass by %s\n" % player.pos.name)
+        Log.debug("openRebid_Pass_Pass by %s\n", player.pos.name)
         bidLevel = 0
         bidSuit = Suit.ALL
         
@@ -80,7 +81,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1_Pass")
     def openRebid_1_Pass(self, table, player):
-        Log.write("openRebid_1_Pass by %s\n" % player.pos.name)
+        Log.debug("openRebid_1_Pass by %s\n", player.pos.name)
         ts = player.teamState
         # How many points do I have?
         openingSuit = getOpeningBid(ts.bidSeq)[1]
@@ -174,7 +175,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1C_1D")
     def openRebid_1C_1D(self, table, player):
-        Log.write("openRebid_1C_1D by %s\n" % player.pos.name)
+        Log.debug("openRebid_1C_1D by %s\n", player.pos.name)
         ts = player.teamState        
         # How many points do I have?
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
@@ -248,7 +249,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1Mi_1Ma")
     def openRebid_1Mi_1Ma(self, table, player):
-        Log.write("openRebid_1Mi_1Ma by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Mi_1Ma by %s\n", player.pos.name)
         ts = player.teamState        
         # How many points do I have?
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
@@ -357,7 +358,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1H_1S")
     def openRebid_1H_1S(self, table, player):
-        Log.write("openRebid_1H_1S by %s\n" % player.pos.name)
+        Log.debug("openRebid_1H_1S by %s\n", player.pos.name)
         ts = player.teamState     
 
         # How many points do I have?
@@ -441,7 +442,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1Mi_1NT")
     def openRebid_1Mi_1NT(self, table, player):
-        Log.write("openRebid_1Mi_1NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Mi_1NT by %s\n", player.pos.name)
         ts = player.teamState        
         ts.convention = Conv.NATURAL
         
@@ -503,7 +504,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1Mi_nMi")
     def openRebid_1Mi_nMi(self, table, player):
-        Log.write("openRebid_1Mi_nMi by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Mi_nMi by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What level did my partner bid?
@@ -564,7 +565,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1Ma_nMa")
     def openRebid_1Ma_nMa(self, table, player):
-        Log.write("openRebid_1Ma_nMa by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Ma_nMa by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What level did my partner bid?
@@ -624,7 +625,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1Ma_1NT")
     def openRebid_1Ma_1NT(self, table, player):
-        Log.write("openRebid_1Ma_1NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Ma_1NT by %s\n", player.pos.name)
         ts = player.teamState        
         ts.convention = Conv.NATURAL
 
@@ -675,7 +676,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1Ma_4W")
     def openRebid_1Ma_4W(self, table, player):
-        Log.write("openRebid_1Ma_4W by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Ma_4W by %s\n", player.pos.name)
         ts = player.teamState        
         # Splinter
         # How many points do I have?
@@ -706,7 +707,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_1Mi_nNT")
     def openRebid_1Mi_nNT(self, table, player):
-        Log.write("openRebid_1Mi_nNT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Mi_nNT by %s\n", player.pos.name)
         ts = player.teamState
 
         # What level did my partner bid?
@@ -764,7 +765,7 @@ class OpenerRebidRegistry:
     # Jacoby 2NT    
     @OpenerFunctions.register(command="openRebid_1Ma_2NT")
     def openRebid_1Ma_2NT(self, table, player):
-        Log.write("openRebid_1Ma_2NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Ma_2NT by %s\n", player.pos.name)
         ts = player.teamState        
 
         # Do I have a singleton or void?
@@ -814,7 +815,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1Ma_3NT")
     def openRebid_1Ma_3NT(self, table, player):
-        Log.write("openRebid_1Ma_3NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1Ma_3NT by %s\n", player.pos.name)
         ts = player.teamState        
 
         # How many points do I have?
@@ -842,7 +843,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_2_over_1")
     def openRebid_2_over_1(self, table, player):
-        Log.write("openRebid_2_over_1 by %s\n" % player.pos.name)
+        Log.debug("openRebid_2_over_1 by %s\n", player.pos.name)
         ts = player.teamState
         # Clear the convention
         ts.convention = Conv.NATURAL
@@ -952,7 +953,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_1NT_Pass")
     def openRebid_1NT_Pass(self, table, player):
-        Log.write("openRebid_1NT_Pass by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_Pass by %s\n", player.pos.name)
         ts = player.teamState
         ts.candidateSuit = Suit.ALL
         bidNotif = BidNotif(player, 0, Suit.ALL)
@@ -960,7 +961,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1NT_2C")
     def openRebid_1NT_2C(self, table, player):
-        Log.write("openRebid_1NT_2C by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_2C by %s\n", player.pos.name)
         ts = player.teamState        
         # Stayman
         numHearts = player.hand.getNumCardsInSuit(Suit.HEART)
@@ -990,7 +991,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_1NT_2W")
     def openRebid_1NT_2W(self, table, player):
-        Log.write("openRebid_1NT_2W by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_2W by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What suit did my partner bid?
@@ -1044,7 +1045,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1NT_nNT")
     def openRebid_1NT_nNT(self, table, player):
-        Log.write("openRebid_1NT_nNT by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_nNT by %s\n", player.pos.name)
         ts = player.teamState        
 
         # How many points do I have?
@@ -1096,7 +1097,7 @@ class OpenerRebidRegistry:
            
     @OpenerFunctions.register(command="openRebid_1NT_3Mi")
     def openRebid_1NT_3Mi(self, table, player):
-        Log.write("openRebid_1NT_3Mi by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_3Mi by %s\n", player.pos.name)
         ts = player.teamState
         
         # What suit did my partner bid? Partner promises 5 cards.
@@ -1135,7 +1136,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_1NT_3Ma")
     def openRebid_1NT_3Ma(self, table, player):
-        Log.write("openRebid_1NT_3Ma by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_3Ma by %s\n", player.pos.name)
         ts = player.teamState        
         
         # What suit did my partner bid? Partner promises 5 cards.
@@ -1164,7 +1165,7 @@ class OpenerRebidRegistry:
                     
     @OpenerFunctions.register(command="openRebid_1NT_4Ma")
     def openRebid_1NT_4Ma(self, table, player):
-        Log.write("openRebid_1NT_4Ma by %s\n" % player.pos.name)
+        Log.debug("openRebid_1NT_4Ma by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What suit did my partner bid? Partner promises 6 cards.
@@ -1183,7 +1184,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2C_2D")
     def openRebid_2C_2D(self, table, player):
-        Log.write("openRebid_2C_2D by %s\n" % player.pos.name)
+        Log.debug("openRebid_2C_2D by %s\n", player.pos.name)
         ts = player.teamState        
 
         (suitA, numCardsA, suitB, numCardsB) = player.hand.numCardsInTwoLongestSuits()
@@ -1212,7 +1213,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2C_2Ma")
     def openRebid_2C_2Ma(self, table, player):
-        Log.write("openRebid_2C_2Ma by %s\n" % player.pos.name)
+        Log.debug("openRebid_2C_2Ma by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What suit did my partner bid? Partner promises 5 cards.
@@ -1253,7 +1254,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_2C_2NT")
     def openRebid_2C_2NT(self, table, player):
-        Log.write("openRebid_2C_2NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_2C_2NT by %s\n", player.pos.name)
         ts = player.teamState        
 
         (suitA, numCardsA, suitB, numCardsB) = player.hand.numCardsInTwoLongestSuits()
@@ -1281,7 +1282,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2C_3Mi")
     def openRebid_2C_3Mi(self, table, player):
-        Log.write("openRebid_2C_3Mi by %s\n" % player.pos.name)
+        Log.debug("openRebid_2C_3Mi by %s\n", player.pos.name)
         ts = player.teamState        
 
         # What suit did my partner bid? Partner promised 5 cards.
@@ -1345,7 +1346,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_weak_Pass")
     def openRebid_weak_Pass(self, table, player):
-        Log.write("openRebid_weak_Pass by %s\n" % player.pos.name)
+        Log.debug("openRebid_weak_Pass by %s\n", player.pos.name)
         ts = player.teamState
         ts.force = Force.PASS
         ts.candidateSuit = Suit.ALL
@@ -1354,7 +1355,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_2weak_2W")
     def openRebid_2weak_2W(self, table, player):
-        Log.write("openRebid_2weak_2W by %s\n" % player.pos.name)
+        Log.debug("openRebid_2weak_2W by %s\n", player.pos.name)
         ts = player.teamState        
         openingSuit = getOpeningBid(ts.bidSeq)[1]
 
@@ -1384,7 +1385,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2weak_2NT")
     def openRebid_2weak_2NT(self, table, player):
-        Log.write("openRebid_2weak_2NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_2weak_2NT by %s\n", player.pos.name)
         ts = player.teamState        
         openingSuit = getOpeningBid(ts.bidSeq)[1]
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
@@ -1402,7 +1403,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_2weak_3")
     def openRebid_2weak_3(self, table, player):
-        Log.write("openRebid_2weak_3 by %s\n" % player.pos.name)
+        Log.debug("openRebid_2weak_3 by %s\n", player.pos.name)
         ts = player.teamState        
         ts.candidateSuit = Suit.ALL
         bidNotif = BidNotif(player, 0, Suit.ALL)
@@ -1411,7 +1412,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_2weak_3NT")
     def openRebid_weak_3NT(self, table, player):
-        Log.write("openRebid_2weak_3NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_2weak_3NT by %s\n", player.pos.name)
         ts.candidateSuit = Suit.ALL
         bidNotif = BidNotif(player, 0, Suit.ALL)
         return bidNotif
@@ -1419,7 +1420,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2NT_3C")
     def openRebid_2NT_3C(self, table, player):
-        Log.write("openRebid_2NT_3C by %s\n" % player.pos.name)
+        Log.debug("openRebid_2NT_3C by %s\n", player.pos.name)
         ts = player.teamState        
         # Stayman
         numHearts = player.hand.getNumCardsInSuit(Suit.HEART)
@@ -1449,7 +1450,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_2NT_3W")
     def openRebid_2NT_3W(self, table, player):
-        Log.write("openRebid_2NT_3W by %s\n" % player.pos.name)
+        Log.debug("openRebid_2NT_3W by %s\n", player.pos.name)
         ts = player.teamState        
         
         # What suit did my partner bid?
@@ -1484,7 +1485,7 @@ class OpenerRebidRegistry:
     
     @OpenerFunctions.register(command="openRebid_2NT_3NT")
     def openRebid_2NT_3NT(self, table, player):
-        Log.write("openRebid_2NT_3NT by %s\n" % player.pos.name)
+        Log.debug("openRebid_2NT_3NT by %s\n", player.pos.name)
         ts = player.teamState
         ts.candidateSuit = Suit.ALL
         bidNotif = BidNotif(player, 0, Suit.ALL, Conv.NATURAL, Force.PASS)
@@ -1492,7 +1493,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_2NT_nNT")
     def openRebid_2NT_nNT(self, table, player):
-        Log.write("openRebid_2NT_nNT by %s\n" % player.pos.name)
+        Log.debug("openRebid_2NT_nNT by %s\n", player.pos.name)
         ts = player.teamState        
         ts.fitSuit = Suit.NOTRUMP
         
@@ -1511,7 +1512,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_3weak_3W")
     def openRebid_3weak_3W(self, table, player):
-        Log.write("openRebid_3weak_3W by %s\n" % player.pos.name)
+        Log.debug("openRebid_3weak_3W by %s\n", player.pos.name)
         ts = player.teamState        
         openingSuit = getOpeningBid(ts.bidSeq)[1]
 
@@ -1535,7 +1536,7 @@ class OpenerRebidRegistry:
 
     @OpenerFunctions.register(command="openRebid_3_4")
     def openRebid_3_4(self, table, player):
-        Log.write("openRebid_3_4 by %s\n" % player.pos.name)
+        Log.debug("openRebid_3_4 by %s\n", player.pos.name)
         ts = player.teamState
         ts.force = Force.PASS
         bidNotif = BidNotif(player, 0, Suit.ALL)
@@ -1543,7 +1544,7 @@ class OpenerRebidRegistry:
         
     @OpenerFunctions.register(command="openRebid_3NT_nNT")
     def openRebid_3NT_nNT(self, table, player):
-        Log.write("openRebid_3NT_nNT by %s\n" % player.pos.name)
+        Log.debug("openRebid_3NT_nNT by %s\n", player.pos.name)
         ts = player.teamState
 
         # What level did my partner bid?
@@ -25,7 +25,7 @@ class ResponderRegistry:
     # Define functions
     @ResponderFunctions.register(command="rsp_Pass")
     def openPassRsp(self, table, player):
-        Log.write("responderBid: openPassRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: openPassRsp by %s\n", player.pos.name)
         hand = player.hand
         ts = player.teamState
         (hcPts, lenPts) = hand.evalHand(DistMethod.HCP_LONG)
@@ -103,7 +103,7 @@ class ResponderRegistry:
     
     @ResponderFunctions.register(command="rsp_1Mi")
     def open1MinorRsp(self, table, player):
-        Log.write("responderBid: open1MinorRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open1MinorRsp by %s\n", player.pos.name)
         ts = player.teamState
         suit = player.teamState.bidSeq[-1][1]
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
@@ -200,7 +200,7 @@ class ResponderRegistry:
                 bidNotif = BidNotif(player, 2, Suit.CLUB, Conv.TWO_OVER_ONE, Force.ONE_ROUND)
                 return bidNotif
             if hasMajor:
-                Log.write("open1MinorRsp: 13+ hasMajor\n")
+                Log.debug("open1MinorRsp: 13+ hasMajor\n")
                 bidNotif = BidNotif(player, 1, Suit.NOTRUMP, Conv.TWO_OVER_ONE, Force.ONE_ROUND)
                 bidNotif.show()
                 return bidNotif
@@ -219,7 +219,7 @@ class ResponderRegistry:
                 
     @ResponderFunctions.register(command="rsp_1Ma")
     def open1MajorRsp(self, table, player):
-        Log.write("responderBid: open1MajorRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open1MajorRsp by %s\n", player.pos.name)
         ts = player.teamState
         suit = player.teamState.bidSeq[-1][1]
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
@@ -346,7 +346,7 @@ class ResponderRegistry:
 
     @ResponderFunctions.register(command="rsp_1NT")    
     def open1NoTrumpRsp(self, table, player):
-        Log.write("responderBid: open1NoTrumpRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open1NoTrumpRsp by %s\n", player.pos.name)
         ts = player.teamState
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
         totalPts = hcPts + distPts
@@ -468,7 +468,7 @@ class ResponderRegistry:
 
     @ResponderFunctions.register(command="rsp_2C")
     def open2ClubRsp(self, table, player):
-        Log.write("responderBid: open2ClubRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open2ClubRsp by %s\n", player.pos.name)
         ts = player.teamState
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
         totalPts = hcPts + distPts
@@ -500,7 +500,7 @@ class ResponderRegistry:
 
     @ResponderFunctions.register(command="rsp_2Weak") 
     def openWeakRsp(self, table, player):
-        Log.write("responderBid: openWeakRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: openWeakRsp by %s\n", player.pos.name)
         ts = player.teamState
         # Get the bid from my partner
         level = player.teamState.bidSeq[-1][0]
@@ -598,7 +598,7 @@ class ResponderRegistry:
 
     @ResponderFunctions.register(command="rsp_2NT")    
     def open2NoTrumpRsp(self, table, player):
-        Log.write("responderBid: open2NoTrumpRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open2NoTrumpRsp by %s\n", player.pos.name)
         ts = player.teamState
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
         totalPts = hcPts + distPts
@@ -672,7 +672,7 @@ class ResponderRegistry:
 
     @ResponderFunctions.register(command="rsp_3NT")    
     def open3NoTrumpRsp(self, table, player):
-        Log.write("responderBid: open3NoTrumpRsp by %s\n" % player.pos.name)
+        Log.debug("responderBid: open3NoTrumpRsp by %s\n", player.pos.name)
         ts = player.teamState
         (hcPts, distPts) = player.hand.evalHand(DistMethod.HCP_SHORT)
         if hcPts == 7:
@@ -0,0 +1,215 @@
+#!/home/richawil/Applications/anaconda3/bin/python
+'''
+Simulation Runner
+
+Bids large numbers of random deals with the headless auction engine.
+Deals are fanned out in chunks across a multiprocessing pool. Every
+worker process owns its own AuctionEngine, and therefore its own card
+table, opener/responder/rebid registries and log file handle.
+Finished auctions are streamed back to the parent one chunk at a time
+and written out as JSON lines.
+'''
+
+import os
+import sys
+import json
+import random
+import argparse
+import multiprocessing
+
+from infoLog import Log, LOG_LEVELS
+from enums import TablePosition
+from utils import *
+from bridgeHand import BridgeHand
+from bidNode import BidTree
+from auctionEngine import AuctionEngine
+from dealNumber import getDealNumberFromHands, getHandsFromSeats
+from dealCorpus import readDeals, getNumDeals
+from dealImport import readBoards
+from constrainedDealer import ConstrainedDealer, parseConstraintSpecs
+from openBidTable import checkOpenBidTable
+from auctionTrace import TraceWriter, AuctionTrace
+
+DEAL_POSITIONS = [TablePosition.NORTH, TablePosition.EAST, TablePosition.SOUTH, TablePosition.WEST]
+
+# The auction engine owned by this worker process
+workerEngine = None
+# The cards of the worker's deck in their original order
+fullDeck = None
+# Dictionary of TablePosition to SeatConstraint. Deals are random if empty.
+workerConstraints = {}
+# Deal corpus to bid instead of random deals
+workerCorpus = None
+# TraceWriter of the worker's auction trace, if tracing
+workerTraceWriter = None
+
+def initWorker(logDir, treeDir, constraintSpecs=None, corpusPath=None, decisionCacheSize=0, logLevel="DEBUG", traceDir=None):
+    global workerEngine, fullDeck, workerConstraints, workerCorpus, workerTraceWriter
+    if logDir is None:
+        logPath = os.devnull
+        # Nothing would be kept, so skip building the records
+        logLevel = "OFF"
+    else:
+        logPath = os.path.join(logDir, "info.%d.log" % os.getpid())
+    Log.open(logPath, logLevel)
+    # Debug prints from the bidding code would corrupt the output stream
+    sys.stdout = Log
+    bidTree = None
+    if treeDir is not None:
+        bidTree = BidTree(treeDir)
+    trace = None
+    if traceDir is not None:
+        # Each worker has its own trace file, so they never wait on each other
+        workerTraceWriter = TraceWriter(os.path.join(traceDir, "trace.%d.jsonl" % os.getpid()))
+        trace = AuctionTrace(workerTraceWriter, os.getpid())
+    workerEngine = AuctionEngine(logPath, bidTree, decisionCacheSize, logLevel, trace)
+    fullDeck = workerEngine.table.deck.cards.copy()
+    workerConstraints = parseConstraintSpecs(constraintSpecs)
+    workerCorpus = corpusPath
+
+
+# Deal 4 random hands from the deck of the worker's table
+def dealRandomHands(deck, rng):
+    deal = {}
+    for pos, cards in zip(DEAL_POSITIONS, deck.dealHands(rng)):
+        hand = BridgeHand(pos)
+        hand.cards = cards
+        hand.sort()
+        deal[pos] = hand
+    return deal
+
+
+# Bid one chunk of deals. Each chunk has its own random stream seeded from
+# its index, so a run is reproducible regardless of how chunks land on the
+# workers.
+def runChunk(args):
+    (seed, chunkIdx, firstDeal, numDeals) = args
+    rng = random.Random(seed * 1000003 + chunkIdx)
+    deck = workerEngine.table.deck
+    constrainedDealer = None
+    if workerConstraints:
+        constrainedDealer = ConstrainedDealer(workerConstraints, rng)
+    if workerCorpus is not None:
+        corpusDeals = readDeals(workerCorpus, firstDeal, numDeals)
+    records = []
+    for dealNum in range(firstDeal, firstDeal + numDeals):
+        if workerCorpus is not None:
+            deal = getHandsFromSeats(next(corpusDeals))
+        elif constrainedDealer is not None:
+            deal = constrainedDealer.dealHands()
+        else:
+            # The shuffle starts from the current deck order, so reset it first
+            deck.cards = fullDeck.copy()
+            deal = dealRandomHands(deck, rng)
+        dealer = DEAL_POSITIONS[dealNum % 4]
+        result = workerEngine.run(deal, dealer, dealNum)
+        hands = {}
+        for pos in DEAL_POSITIONS:
+            hands[pos.name] = getHandStr(deal[pos])
+        records.append({"deal": dealNum,
+                        "dealNumber": getDealNumberFromHands(deal),
+                        "dealer": dealer.name,
+                        "hands": hands,
+                        "auction": result.getAuctionStr(),
+                        "error": result.error})
+    # Pool workers exit without closing the log, so write it out per chunk
+    Log.flush()
+    if workerTraceWriter is not None:
+        workerTraceWriter.flush()
+    return records
+
+
+# Bid one chunk of imported boards, each a tuple of
+# (deal index, board name, dealer name, seats, human auction)
+def runImportedChunk(boards):
+    records = []
+    for (dealNum, board, dealerName, seats, humanAuction) in boards:
+        deal = getHandsFromSeats(seats)
+        dealer = TablePosition[dealerName]
+        result = workerEngine.run(deal, dealer, dealNum)
+        hands = {}
+        for pos in DEAL_POSITIONS:
+            hands[pos.name] = getHandStr(deal[pos])
+        records.append({"deal": dealNum,
+                        "board": board,
+                        "dealer": dealer.name,
+                        "hands": hands,
+                        "auction": result.getAuctionStr(),
+                        "humanAuction": humanAuction,
+                        "error": result.error})
+    Log.flush()
+    if workerTraceWriter is not None:
+        workerTraceWriter.flush()
+    return records
+
+
+# Group the boards of a PBN or LIN file into chunks for the workers
+def readImportChunks(importPath, numDeals, chunkSize):
+    chunk = []
+    for dealNum, board in enumerate(readBoards(importPath)):
+        if dealNum >= numDeals:
+            break
+        chunk.append((dealNum, board.board, board.dealer.name, board.seats, board.getHumanAuctionStr()))
+        if len(chunk) == chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def simulate(numDeals, numWorkers, chunkSize, seed, outFp, logDir=None, treeDir=None, constraintSpecs=None, corpusPath=None, importPath=None, decisionCacheSize=0, logLevel="DEBUG", traceDir=None):
+    if corpusPath is not None:
+        numDeals = min(numDeals, getNumDeals(corpusPath))
+    chunks = []
+    for chunkIdx, firstDeal in enumerate(range(0, numDeals, chunkSize)):
+        chunks.append((seed, chunkIdx, firstDeal, min(chunkSize, numDeals - firstDeal)))
+
+    # Make sure the opening bid table is up to date and agrees with
+    # calcOpenBid before the workers start, so they do not all rebuild it at once
+    checkOpenBidTable()
+
+    numRecords = 0
+    numErrors = 0
+    with multiprocessing.Pool(numWorkers, initializer=initWorker, initargs=(logDir, treeDir, constraintSpecs, corpusPath, decisionCacheSize, logLevel, traceDir)) as pool:
+        if importPath is not None:
+            # Imported boards are streamed to the workers as they are read
+            chunkResults = pool.imap_unordered(runImportedChunk, readImportChunks(importPath, numDeals, chunkSize))
+        else:
+            chunkResults = pool.imap_unordered(runChunk, chunks)
+        for records in chunkResults:
+            for record in records:
+                numRecords += 1
+                if record["error"] is not None:
+                    numErrors += 1
+                outFp.write(json.dumps(record) + "\n")
+    return (numRecords, numErrors)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Bid random deals in parallel')
+    parser.add_argument('-n', '--deals', type=int, default=1000, help='Number of deals. Default=1000', required=False)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of worker processes. Default=CPU count', required=False)
+    parser.add_argument('-c', '--chunk', type=int, default=500, help='Deals per chunk. Default=500', required=False)
+    parser.add_argument('-s', '--seed', type=int, default=1, help='Random seed. Default=1', required=False)
+    parser.add_argument('-o', '--output', help='Output file of JSON lines. Default=stdout', required=False)
+    parser.add_argument('-l', '--logdir', help='Directory for per-worker info logs. Default=no logging', required=False)
+    parser.add_argument('-t', '--tree', help='Bidding tree directory. Default=bidding_trees', required=False)
+    parser.add_argument('-i', '--input', help='Deal corpus to bid instead of random deals', required=False)
+    parser.add_argument('-p', '--import', dest='importPath', help='PBN or LIN file to bid instead of random deals', required=False)
+    parser.add_argument('-C', '--constrain', action='append', help='Seat constraint, e.g. N=1NT or S=hcp:8-9,H:4-. May be repeated', required=False)
+    parser.add_argument('-m', '--memo', type=int, default=0, help='Size of the per-worker bid decision cache. Default=0, no cache', required=False)
+    parser.add_argument('-L', '--loglevel', default='DEBUG', choices=list(LOG_LEVELS.keys()), help='Level of the per-worker info logs. Default=DEBUG', required=False)
+    parser.add_argument('-T', '--tracedir', help='Directory for per-worker auction traces in JSON lines. Default=no tracing', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    if args['output']:
+        outFp = open(args['output'], 'w')
+    else:
+        outFp = sys.stdout
+    (numDeals, numErrors) = simulate(args['deals'], args['jobs'], args['chunk'], args['seed'], outFp, args['logdir'], args['tree'], args['constrain'], args['input'], args['importPath'], args['memo'], args['loglevel'], args['tracedir'])
+    if outFp is not sys.stdout:
+        outFp.close()
+    print("Simulated %d deals, %d auctions stopped on errors" % (numDeals, numErrors), file=sys.stderr)
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,277 @@
+'''
+Table Scheduler Class
+
+Bids thousands of auctions at once on one thread, one call at a time
+in turn. An auction in progress is kept as a compact AuctionRecord
+rather than a CardTable with its own Deck, Cards and BridgePlayers:
+ - the hands, as four 52 bit HandBits masks
+ - the calls made so far, a byte per call
+ - the state of the table and of the four players, packed into bytes
+A record takes a few hundred bytes.
+
+A single executor table does the bidding. To make the next call of
+an auction the scheduler unpacks its record into the executor, lets
+the player due to bid make the call, and packs the result back into
+the record. Each hand's profile is only worked out if the bidding
+code asks for it. The cards do not change during an auction, so the
+profiles are kept by the scheduler in a cache of bounded size, keyed by
+the hand's mask, and reused for later calls. An auction's profiles are
+dropped from the cache when it is done. The records hold no profiles.
+'''
+
+import os
+import struct
+from collections import deque
+
+from infoLog import Log
+from enums import Suit, TablePosition, PlayerRole
+from utils import *
+from handBits import HandBits
+from handProfile import HandProfile
+from bridgeHand import BridgeHand
+from teamState import getEnumCode, getEnumMember, packBid, unpackBid
+from auctionEngine import EngineTable, AuctionResult, MAX_AUCTION_BIDS
+from dealNumber import DEAL_POSITIONS, NUM_CARDS_IN_DECK, getDealNumber
+from openBidTable import checkOpenBidTable
+
+HANDS_FORMAT = "<4Q"
+# Number of hand profiles kept by the scheduler, enough for 1024 auctions
+PROFILE_CACHE_SIZE = 4096
+# Lead position, current position, round number, has opener, highest bid
+TABLE_STATE_FORMAT = "<BBBBB"
+TABLE_STATE_SIZE = struct.calcsize(TABLE_STATE_FORMAT)
+# Player role and role of each player
+PLAYER_STATE_FORMAT = "<BB"
+PLAYER_STATE_SIZE = struct.calcsize(PLAYER_STATE_FORMAT)
+
+
+# Return the 4 HandBits masks of a list of 52 seat indexes
+def getSeatMasks(seats):
+    masks = [0, 0, 0, 0]
+    for index in range(0, NUM_CARDS_IN_DECK):
+        masks[seats[index]] |= 1 << index
+    return masks
+
+
+# Return the list of 52 seat indexes of 4 HandBits masks
+def getSeatsFromMasks(masks):
+    seats = [0] * NUM_CARDS_IN_DECK
+    for seat, mask in enumerate(masks):
+        for index in range(0, NUM_CARDS_IN_DECK):
+            if mask & (1 << index):
+                seats[index] = seat
+    return seats
+
+
+class AuctionRecord:
+    '''
+    One auction in progress, or finished, at the scheduler
+    '''
+    __slots__ = ('hands', 'dealer', 'calls', 'state', 'error', 'done', 'tag')
+
+    def __init__(self, seats, dealer, tag=None):
+        # Packed HandBits masks, indexed by seat
+        self.hands = struct.pack(HANDS_FORMAT, *getSeatMasks(seats))
+        self.dealer = dealer
+        # Packed bids, as made by teamState.packBid
+        self.calls = bytearray()
+        # Packed table and player state, or None before the first call
+        self.state = None
+        # Description of the exception which stopped the auction, if any
+        self.error = None
+        self.done = False
+        # Caller's data, e.g. a deal number
+        self.tag = tag
+
+    def getBidsList(self):
+        return [unpackBid(code) for code in self.calls]
+
+    def getAuctionStr(self):
+        return '-'.join(getBidStr(bid[0], bid[1]) for bid in self.getBidsList())
+
+    # Hand a finished auction back as an AuctionResult
+    def getResult(self):
+        result = AuctionResult(self.dealer)
+        result.bidsList = self.getBidsList()
+        result.error = self.error
+        return result
+
+
+class RecordHand(BridgeHand):
+    '''
+    A hand known only by its HandBits mask. No Card objects are made,
+    and the profile is built the first time it is asked for, unless the
+    scheduler already holds it.
+    '''
+
+    def __init__(self, pos):
+        super(RecordHand, self).__init__(pos)
+        self.bits = 0
+
+    def setBits(self, bits, profile=None):
+        self.bits = bits
+        self.profile = profile
+
+    def getProfile(self):
+        if self.profile is None:
+            self.profile = HandProfile(HandBits(self.bits))
+        return self.profile
+
+
+class TableScheduler:
+
+    def __init__(self, logPath=os.devnull, bidTree=None, maxCalls=MAX_AUCTION_BIDS, logLevel=None, trace=None, profileCacheSize=PROFILE_CACHE_SIZE):
+        self.table = EngineTable(bidTree)
+        # HandProfile of each hand mask, oldest first
+        self.profiles = {}
+        self.profileCacheSize = profileCacheSize
+        # Optional AuctionTrace. Auctions are identified by their tags.
+        self.table.trace = trace
+        self.maxCalls = maxCalls
+        for pos in DEAL_POSITIONS:
+            self.table.players[pos].hand = RecordHand(pos)
+        # Records still bidding, in the order they take their turns
+        self.active = deque()
+        # The bidding code logs unconditionally, so make sure a log is open
+        if Log.log_fp is None or Log.log_fp.closed:
+            Log.open(logPath)
+        if logLevel is not None:
+            Log.setLevel(logLevel)
+        # Load, build or check the opening bid table now rather than in
+        # the first auction
+        checkOpenBidTable()
+
+    '''
+    Add an auction to the scheduler.
+    Inputs:
+        seats - list of 52 seat indexes, as used by the dealNumber module
+        dealer - position of the first bidder
+        tag - any value to keep with the record
+    Returns:
+        the AuctionRecord, which is filled in as the auction is bid
+    '''
+    def add(self, seats, dealer=TablePosition.NORTH, tag=None):
+        record = AuctionRecord(seats, dealer, tag)
+        self.active.append(record)
+        return record
+
+    def getNumActive(self):
+        return len(self.active)
+
+    '''
+    Make one call of the next auction in turn.
+    Returns:
+        the record if its auction has finished, or None
+    '''
+    def step(self):
+        if not self.active:
+            return None
+        record = self.active.popleft()
+        table = self.table
+        table.result = AuctionResult(record.dealer)
+        if table.trace is not None:
+            if record.state is None:
+                masks = struct.unpack(HANDS_FORMAT, record.hands)
+                table.trace.startAuction(record.tag, record.dealer, getDealNumber(getSeatsFromMasks(masks)))
+            table.trace.auctionId = record.tag
+        self.loadRecord(record)
+        try:
+            if len(record.calls) >= self.maxCalls:
+                raise RuntimeError("auction did not complete in %d bids" % self.maxCalls)
+            player = table.players[table.currentPos]
+            player.computerBidRequest(table, table.hasOpener, player.teamState.competition, table.roundNum, table.bidsList, False, player.hand)
+        except Exception as e:
+            # The bidding code is still under development. Record the
+            # failure so the other auctions can carry on.
+            record.error = "%s: %s" % (type(e).__name__, e)
+            Log.warning("TableScheduler: auction stopped by %s\n", record.error)
+            table.processHandDone()
+        if table.handDone:
+            record.calls = bytearray(packBid(bid) for bid in table.result.bidsList)
+            record.state = None
+            record.done = True
+            self.dropProfiles(record)
+            if table.trace is not None:
+                table.trace.endAuction(table.result.bidsList, record.error)
+            return record
+        self.saveRecord(record)
+        self.active.append(record)
+        return None
+
+    # Step the auctions until they are all done, yielding each finished record
+    def run(self):
+        while self.active:
+            record = self.step()
+            if record is not None:
+                yield record
+
+    # Set up the executor table with the state of a record
+    def loadRecord(self, record):
+        table = self.table
+        table.handDone = False
+        table.outstandingBidReq = False
+        table.bidsList = record.getBidsList()
+        masks = struct.unpack(HANDS_FORMAT, record.hands)
+        for seat, pos in enumerate(DEAL_POSITIONS):
+            table.players[pos].hand.setBits(masks[seat], self.profiles.get(masks[seat]))
+
+        if record.state is None:
+            # First call of the auction
+            table.leadPos = record.dealer
+            table.currentPos = record.dealer
+            table.roundNum = 1
+            table.hasOpener = False
+            table.highestBid = (0, Suit.ALL)
+            for pos in DEAL_POSITIONS:
+                table.players[pos].startHand(record.dealer)
+            return
+
+        state = record.state
+        (leadCode, currentCode, table.roundNum, hasOpener, highestBid) = struct.unpack_from(TABLE_STATE_FORMAT, state, 0)
+        table.leadPos = getEnumMember(TablePosition, leadCode)
+        table.currentPos = getEnumMember(TablePosition, currentCode)
+        table.hasOpener = bool(hasOpener)
+        table.highestBid = unpackBid(highestBid)
+        offset = TABLE_STATE_SIZE
+        for pos in DEAL_POSITIONS:
+            player = table.players[pos]
+            (roleCode, otherRoleCode) = struct.unpack_from(PLAYER_STATE_FORMAT, state, offset)
+            player.playerRole = getEnumMember(PlayerRole, roleCode)
+            otherRole = getEnumMember(PlayerRole, otherRoleCode)
+            if otherRole is None:
+                if hasattr(player, 'role'):
+                    del player.role
+            else:
+                player.role = otherRole
+            offset = player.teamState.unpack(state, offset + PLAYER_STATE_SIZE)
+            # The seat only depends on the dealer
+            if player.pos.value >= table.leadPos.value:
+                player.seat = player.pos.value - table.leadPos.value + 1
+            else:
+                player.seat = 4 + player.pos.value - table.leadPos.value + 1
+
+    # Pack the state of the executor table into a record
+    def saveRecord(self, record):
+        table = self.table
+        record.calls.append(packBid(table.bidsList[-1]))
+        parts = [struct.pack(TABLE_STATE_FORMAT, getEnumCode(table.leadPos), getEnumCode(table.currentPos),
+                             table.roundNum, int(table.hasOpener), packBid(table.highestBid))]
+        for pos in DEAL_POSITIONS:
+            player = table.players[pos]
+            parts.append(struct.pack(PLAYER_STATE_FORMAT, getEnumCode(player.playerRole),
+                                     getEnumCode(getattr(player, 'role', None))))
+            parts.append(player.teamState.pack())
+        record.state = b''.join(parts)
+        # Keep any profiles built during the call for the next one
+        for pos in DEAL_POSITIONS:
+            hand = table.players[pos].hand
+            if hand.profile is None or hand.bits in self.profiles or self.profileCacheSize == 0:
+                continue
+            if len(self.profiles) >= self.profileCacheSize:
+                del self.profiles[next(iter(self.profiles))]
+            self.profiles[hand.bits] = hand.profile
+
+    # Drop the profiles of a finished auction from the cache
+    def dropProfiles(self, record):
+        for mask in struct.unpack(HANDS_FORMAT, record.hands):
+            self.profiles.pop(mask, None)
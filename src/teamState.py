@@ -6,10 +6,51 @@ that player's view.
 '''
 
 import json
+import struct
 from infoLog import Log
 from enums import *
 from openBid import *
 
+# A packed team state holds each enum as its position in the enum class,
+# with NO_ENUM_CODE for None, and each count as a signed byte
+PACKED_ENUM_FIELDS = (('fitSuit', Suit), ('candidateSuit', Suit), ('convention', Conv),
+                      ('force', Force), ('gameState', GameState))
+PACKED_INT_FIELDS = ('competition', 'myMinPoints', 'myMaxPoints', 'partnerMinPoints', 'partnerMaxPoints',
+                     'partnerNumAces', 'partnerNumKings', 'teamMinPoints', 'teamMaxPoints',
+                     'minTeamPts', 'maxTeamPts')
+SUIT_STATE_SUITS = (Suit.NOTRUMP, Suit.SPADE, Suit.HEART, Suit.DIAMOND, Suit.CLUB)
+# Enum fields, suit states and the length of the bid sequence, then the counts
+PACKED_FORMAT = "<%dB%dBB%db" % (len(PACKED_ENUM_FIELDS), len(SUIT_STATE_SUITS), len(PACKED_INT_FIELDS))
+PACKED_SIZE = struct.calcsize(PACKED_FORMAT)
+NO_ENUM_CODE = 255
+ENUM_CODES = {}
+ENUM_MEMBERS = {}
+for enumClass in (Suit, Conv, Force, GameState, FitState, PlayerRole, TablePosition):
+    ENUM_MEMBERS[enumClass] = list(enumClass)
+    for code, member in enumerate(enumClass):
+        ENUM_CODES[member] = code
+
+
+def getEnumCode(member):
+    if member is None:
+        return NO_ENUM_CODE
+    return ENUM_CODES[member]
+
+
+def getEnumMember(enumClass, code):
+    if code == NO_ENUM_CODE:
+        return None
+    return ENUM_MEMBERS[enumClass][code]
+
+
+# A bid packed in one byte: the level times 8 plus the suit code
+def packBid(bid):
+    return bid[0] * 8 + ENUM_CODES[bid[1]]
+
+
+def unpackBid(code):
+    return (code >> 3, ENUM_MEMBERS[Suit][code & 7])
+
 
 class TeamState:
 
@@ -33,27 +74,80 @@ class TeamState:
         self.teamMaxPoints = 0         # updated by notification handler
 
     def show(self):
+        if not Log.debugOn:
+            return
         bidSeqStr = ''        
         for bid in self.bidSeq:
             bidStr = getBidStr(bid[0], bid[1])
             bidSeqStr += bidStr + "-"
-        Log.write("Team state for bid sequence %s\n" % bidSeqStr)
-        Log.write("\tFit suit:\t\t%s\n" % self.fitSuit.name)
-        Log.write("\tCandidate suit:\t%s\n" % self.candidateSuit.name)
+        Log.debug("Team state for bid sequence %s\n", bidSeqStr)
+        Log.debug("\tFit suit:\t\t%s\n", self.fitSuit.name)
+        Log.debug("\tCandidate suit:\t%s\n", self.candidateSuit.name)
         for suit, fit in self.suitState.items():
-            Log.write("\t\t%s:\t%s\n" % (suit.name, fit.name))
+            Log.debug("\t\t%s:\t%s\n", suit.name, fit.name)
             
-        Log.write("\tConvention: %s\n" % self.convention.name)
-        Log.write("\tForce type: %s\n" % self.force.name)
-        Log.write("\tPartner number of Aces = %d\n" % self.partnerNumAces)
+        Log.debug("\tConvention: %s\n", self.convention.name)
+        Log.debug("\tForce type: %s\n", self.force.name)
+        Log.debug("\tPartner number of Aces = %d\n", self.partnerNumAces)
         
-        Log.write("\tMy min points = %d\n" % self.myMinPoints)
-        Log.write("\tMy max points = %d\n" % self.myMaxPoints)
-        Log.write("\tPartner min points = %d\n" % self.partnerMinPoints)
-        Log.write("\tPartner max points = %d\n" % self.partnerMaxPoints)
-        Log.write("\tTeam min points = %d\n" % self.teamMinPoints)
-        Log.write("\tTeam max points = %d\n" % self.teamMaxPoints)
-        Log.write("\tGame state: %s\n" % self.gameState.name)
+        Log.debug("\tMy min points = %d\n", self.myMinPoints)
+        Log.debug("\tMy max points = %d\n", self.myMaxPoints)
+        Log.debug("\tPartner min points = %d\n", self.partnerMinPoints)
+        Log.debug("\tPartner max points = %d\n", self.partnerMaxPoints)
+        Log.debug("\tTeam min points = %d\n", self.teamMinPoints)
+        Log.debug("\tTeam max points = %d\n", self.teamMaxPoints)
+        Log.debug("\tGame state: %s\n", self.gameState.name)
+
+    # Hashable snapshot of every field, used to key the decision cache
+    def getStateKey(self):
+        return (self.fitSuit, self.candidateSuit, self.myMinPoints, self.myMaxPoints,
+                self.convention, self.force, self.competition, tuple(self.bidSeq),
+                tuple(self.suitState.values()), self.gameState,
+                self.partnerMinPoints, self.partnerMaxPoints, self.partnerNumAces,
+                self.partnerNumKings, self.teamMinPoints, self.teamMaxPoints)
+
+    # Copy of every field, for restoring the team state later
+    def saveState(self):
+        state = self.__dict__.copy()
+        state['bidSeq'] = self.bidSeq.copy()
+        state['suitState'] = self.suitState.copy()
+        return state
+
+    def restoreState(self, state):
+        self.__dict__.update(state)
+        self.bidSeq = state['bidSeq'].copy()
+        self.suitState = state['suitState'].copy()
+
+    # Pack every field into a few dozen bytes
+    def pack(self):
+        values = [getEnumCode(getattr(self, name)) for (name, enumClass) in PACKED_ENUM_FIELDS]
+        if len(self.suitState) != len(SUIT_STATE_SUITS):
+            raise ValueError("TeamState: cannot pack suit state %s" % self.suitState)
+        values.extend(ENUM_CODES[self.suitState[suit]] for suit in SUIT_STATE_SUITS)
+        values.append(len(self.bidSeq))
+        values.extend(int(getattr(self, name, 0)) for name in PACKED_INT_FIELDS)
+        return struct.pack(PACKED_FORMAT, *values) + bytes(packBid(bid) for bid in self.bidSeq)
+
+    # Restore the fields from packed bytes. Returns the offset after them.
+    def unpack(self, data, offset=0):
+        values = struct.unpack_from(PACKED_FORMAT, data, offset)
+        index = 0
+        for (name, enumClass) in PACKED_ENUM_FIELDS:
+            setattr(self, name, getEnumMember(enumClass, values[index]))
+            index += 1
+        self.suitState = {}
+        for suit in SUIT_STATE_SUITS:
+            self.suitState[suit] = ENUM_MEMBERS[FitState][values[index]]
+            index += 1
+        numBids = values[index]
+        index += 1
+        for name in PACKED_INT_FIELDS:
+            setattr(self, name, values[index])
+            index += 1
+        self.competition = bool(self.competition)
+        offset += PACKED_SIZE
+        self.bidSeq = [unpackBid(code) for code in data[offset:offset + numBids]]
+        return offset + numBids
 
     # Merge the information from a bidding tree node into the team state
     def mergeTreeNode(self, player, bidTreeNode, playerRole):
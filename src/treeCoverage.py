@@ -0,0 +1,274 @@
+#!/home/richawil/Applications/anaconda3/bin/python
+'''
+Bidding Tree Coverage
+
+Bids a large set of deals and counts which parts of the bidding tree
+and which bid handlers the auctions reach. It reports:
+ - how often each bid node (bidNode.json) is fetched, and the nodes
+   which are never fetched
+ - bid nodes whose bidNode.json could not be parsed
+ - bid sequences which fall off the tree, where no node exists
+ - how often each handler is called
+ - handler names given by a bidNode.json but not defined by the
+   registry of the player who bids at that node, and registered
+   handlers which no bid node names
+ - the tree paths which fall through to nonNodeBidHandler, counted by
+   the last bid node on the path
+
+Counting adds one dictionary update per fetch or handler call, so the
+runs can be as long as those of the simulate module. The deals are
+dealt by the simulate module's workers, so a coverage run with the same
+seed, corpus or constraints bids the same deals as a simulation. Each
+worker keeps its own counts, and they are added up as the chunks come in.
+'''
+
+import os
+import sys
+import argparse
+import multiprocessing
+from collections import Counter
+
+from utils import *
+import bidNode
+from bidNode import PASS_BID_KEY
+import simulate
+from dealCorpus import getNumDeals
+from openBidTable import checkOpenBidTable
+
+ROOT_PATH = "(root)"
+NON_NODE_HANDLER = "nonNodeBidHandler"
+
+
+# Return the path string of a list of bid strings, e.g. "1C/1H"
+def getPathStr(bidStrs):
+    if not bidStrs:
+        return ROOT_PATH
+    return '/'.join(bidStrs)
+
+
+def getBidKeyStr(bidKey):
+    if bidKey == PASS_BID_KEY:
+        return "Pass"
+    return getBidStr(bidKey[0], bidKey[1])
+
+
+# Return the number of bids in a path string
+def getPathDepth(path):
+    if path == ROOT_PATH:
+        return 0
+    return path.count('/') + 1
+
+
+# Return a list of (path string, BidTreeEntry) for every entry of a tree
+def getTreeEntries(tree):
+    treeEntries = []
+    entries = [(tree.root, [])]
+    while entries:
+        (entry, bidStrs) = entries.pop()
+        treeEntries.append((getPathStr(bidStrs), entry))
+        for bidKey, child in entry.children.items():
+            entries.append((child, bidStrs + [getBidKeyStr(bidKey)]))
+    return sorted(treeEntries, key=lambda item: item[0])
+
+
+# Return the names of every handler defined by the registries
+def getRegisteredHandlers():
+    handlerNames = set()
+    for registry in bidNode.getHandlerRegistries():
+        handlerNames.update(registry.jump_table.keys())
+    return handlerNames
+
+
+class TreeCoverage:
+    '''
+    Counts of the bid nodes fetched and the handlers called at a table
+    '''
+
+    def __init__(self, tree):
+        self.tree = tree
+        # Bid node object id to path string
+        self.nodePaths = {}
+        for (path, entry) in getTreeEntries(tree):
+            if entry.bidNode is not None:
+                self.nodePaths[id(entry.bidNode)] = path
+        self.clear()
+
+    def clear(self):
+        # Path string to number of fetches
+        self.nodeCounts = Counter()
+        # Path string to number of fetches which found no node there
+        self.missingCounts = Counter()
+        # Handler name to number of calls
+        self.handlerCounts = Counter()
+        # Path of the last bid node to number of nonNodeBidHandler calls
+        self.fallThroughCounts = Counter()
+
+    # Count the fetches and handler calls at a table
+    def attach(self, table):
+        table.coverage = self
+        table.bidTree.coverage = self
+
+    def detach(self, table):
+        table.coverage = None
+        table.bidTree.coverage = None
+
+    # Called by the bid tree for every node fetched
+    def nodeReached(self, node):
+        self.nodeCounts[self.nodePaths.get(id(node), "(unknown)")] += 1
+
+    # Called by the bid tree when a bid sequence has no node
+    def pathMissing(self, bidStrs):
+        self.missingCounts[getPathStr(bidStrs)] += 1
+
+    # Called by the player for every handler call
+    def handlerCall(self, handlerName, node):
+        self.handlerCounts[handlerName] += 1
+        if handlerName == NON_NODE_HANDLER:
+            self.fallThroughCounts[self.nodePaths.get(id(node), "(none)")] += 1
+
+    # Return the counts as plain dictionaries, so they can be sent between processes
+    def getCounts(self):
+        return {"nodes": dict(self.nodeCounts),
+                "missing": dict(self.missingCounts),
+                "handlers": dict(self.handlerCounts),
+                "fallThrough": dict(self.fallThroughCounts)}
+
+    # Add counts returned by getCounts of another TreeCoverage
+    def addCounts(self, counts):
+        self.nodeCounts.update(counts["nodes"])
+        self.missingCounts.update(counts["missing"])
+        self.handlerCounts.update(counts["handlers"])
+        self.fallThroughCounts.update(counts["fallThrough"])
+
+    '''
+    Return the coverage report as text.
+    Inputs:
+        numAuctions - number of auctions counted
+        numTop - number of entries to list for the most frequent counts
+    '''
+    def getReport(self, numAuctions, numTop=20):
+        lines = []
+        treeEntries = getTreeEntries(self.tree)
+        nodePaths = [path for (path, entry) in treeEntries if entry.bidNode is not None]
+        unreached = [path for path in nodePaths if self.nodeCounts[path] == 0]
+        lines.append("Coverage of %d auctions" % numAuctions)
+        lines.append("%d of %d bid nodes reached, %d fetches" %
+                     (len(nodePaths) - len(unreached), len(nodePaths), sum(self.nodeCounts.values())))
+
+        lines.append("Most fetched bid nodes:")
+        for path, count in self.nodeCounts.most_common(numTop):
+            lines.append("    %-30s %10d" % (path, count))
+        lines.append("Bid nodes never reached (%d):" % len(unreached))
+        for path in unreached:
+            lines.append("    %s" % path)
+
+        broken = [(path, entry.error) for (path, entry) in treeEntries if entry.error is not None]
+        lines.append("Bid nodes which could not be loaded (%d):" % len(broken))
+        for (path, error) in broken:
+            lines.append("    %-30s %s" % (path, error))
+
+        lines.append("Bid sequences with no bid node (%d sequences, %d fetches):" %
+                     (len(self.missingCounts), sum(self.missingCounts.values())))
+        for path, count in self.missingCounts.most_common(numTop):
+            lines.append("    %-30s %10d" % (path, count))
+
+        # Handler names given by the tree, with the nodes which give them,
+        # and those not defined by the registry of the player bidding there
+        nodeHandlers = {}
+        unresolved = {}
+        registries = bidNode.getHandlerRegistries()
+        for (path, entry) in treeEntries:
+            if entry.bidNode is not None:
+                name = entry.bidNode.handler
+                nodeHandlers.setdefault(name, []).append(path)
+                if name not in bidNode.getNodeRegistry(registries, getPathDepth(path)).jump_table:
+                    unresolved.setdefault(name, []).append(path)
+        registered = getRegisteredHandlers()
+        lines.append("Handler calls:")
+        for name, count in self.handlerCounts.most_common():
+            lines.append("    %-30s %10d" % (name, count))
+        missing = sorted(unresolved)
+        lines.append("Handlers named by bid nodes but not registered for the bidder (%d):" % len(missing))
+        for name in missing:
+            lines.append("    %-30s %s" % (name or '""', ', '.join(unresolved[name])))
+        unnamed = sorted(name for name in registered if name not in nodeHandlers)
+        lines.append("Registered handlers named by no bid node (%d):" % len(unnamed))
+        for name in unnamed:
+            lines.append("    %s" % name)
+        uncalled = sorted(name for name in registered if name in nodeHandlers and self.handlerCounts[name] == 0)
+        lines.append("Registered handlers never called (%d):" % len(uncalled))
+        for name in uncalled:
+            lines.append("    %s" % name)
+
+        lines.append("Paths falling through to %s (%d calls), by last bid node:" %
+                     (NON_NODE_HANDLER, sum(self.fallThroughCounts.values())))
+        for path, count in self.fallThroughCounts.most_common(numTop):
+            lines.append("    %-30s %10d" % (path, count))
+        return '\n'.join(lines)
+
+    def show(self, numAuctions, numTop=20):
+        print(self.getReport(numAuctions, numTop))
+
+
+# The coverage of the worker process's table
+workerCoverage = None
+
+def initWorker(treeDir, constraintSpecs, corpusPath):
+    global workerCoverage
+    simulate.initWorker(None, treeDir, constraintSpecs, corpusPath)
+    table = simulate.workerEngine.table
+    workerCoverage = TreeCoverage(table.bidTree)
+    workerCoverage.attach(table)
+
+
+# Bid a chunk of deals and return the counts of the chunk
+def runChunk(args):
+    workerCoverage.clear()
+    records = simulate.runChunk(args)
+    return (len(records), workerCoverage.getCounts())
+
+
+'''
+Bid deals in parallel and count the coverage of the tree.
+Inputs are as for simulate.simulate.
+Returns:
+    tuple of the number of auctions and the TreeCoverage holding the counts
+'''
+def measureCoverage(numDeals, numWorkers, chunkSize, seed, treeDir=None, constraintSpecs=None, corpusPath=None):
+    if corpusPath is not None:
+        numDeals = min(numDeals, getNumDeals(corpusPath))
+    chunks = []
+    for chunkIdx, firstDeal in enumerate(range(0, numDeals, chunkSize)):
+        chunks.append((seed, chunkIdx, firstDeal, min(chunkSize, numDeals - firstDeal)))
+
+    checkOpenBidTable()
+    if treeDir is not None:
+        tree = bidNode.BidTree(treeDir)
+    else:
+        tree = bidNode.getBidTree()
+    coverage = TreeCoverage(tree)
+    numAuctions = 0
+    with multiprocessing.Pool(numWorkers, initializer=initWorker, initargs=(treeDir, constraintSpecs, corpusPath)) as pool:
+        for (numChunkAuctions, counts) in pool.imap_unordered(runChunk, chunks):
+            numAuctions += numChunkAuctions
+            coverage.addCounts(counts)
+    return (numAuctions, coverage)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Count the bid nodes and handlers reached by simulated auctions')
+    parser.add_argument('-n', '--deals', type=int, default=10000, help='Number of deals. Default=10000', required=False)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='Number of worker processes. Default=CPU count', required=False)
+    parser.add_argument('-c', '--chunk', type=int, default=500, help='Deals per chunk. Default=500', required=False)
+    parser.add_argument('-s', '--seed', type=int, default=1, help='Random seed. Default=1', required=False)
+    parser.add_argument('-t', '--tree', help='Bidding tree directory. Default=bidding_trees', required=False)
+    parser.add_argument('-i', '--input', help='Deal corpus to bid instead of random deals', required=False)
+    parser.add_argument('-C', '--constrain', action='append', help='Seat constraint, e.g. N=1NT or S=hcp:8-9,H:4-. May be repeated', required=False)
+    parser.add_argument('-N', '--top', type=int, default=20, help='Entries listed for the most frequent counts. Default=20', required=False)
+    args = vars(parser.parse_args(argv[1:]))
+
+    (numAuctions, coverage) = measureCoverage(args['deals'], args['jobs'], args['chunk'], args['seed'], args['tree'], args['constrain'], args['input'])
+    coverage.show(numAuctions, args['top'])
+
+if __name__ == '__main__':
+    main(sys.argv)